@@ -1,61 +1,98 @@
+import time
+# Instante en que empieza la importación (referencia de --profile-startup)
+STARTUP_START = time.perf_counter()
 import pygame
+import numpy as np
 import random
 import math
 import os
+import sys
 import json
+import bisect
+import sqlite3
+import struct
+import argparse
+import atexit
+import queue
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pygame.locals import *
 
 # Obtener el directorio raíz del proyecto (un nivel arriba del script)
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
-pygame.init()
-pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
-
-# Cargar efectos de sonido (con manejo de errores si no existen)
-try:
-    shoot_sound = pygame.mixer.Sound(os.path.join(BASE_DIR, "sounds", "alienshoot1.wav"))
-except:
-    shoot_sound = None
-
-try:
-    start_sound = pygame.mixer.Sound(os.path.join(BASE_DIR, "sounds", "start.ogg"))
-except:
-    start_sound = None
-
-# Efectos de sonido adicionales (opcionales)
-try:
-    explosion_sound = pygame.mixer.Sound(os.path.join(BASE_DIR, "sounds", "explosion.wav"))
-except:
-    explosion_sound = None
-
-try:
-    powerup_sound = pygame.mixer.Sound(os.path.join(BASE_DIR, "sounds", "powerup.wav"))
-except:
-    powerup_sound = None
-
-try:
-    shield_sound = pygame.mixer.Sound(os.path.join(BASE_DIR, "sounds", "shield_activate.wav"))
-except:
-    shield_sound = None
-
-try:
-    missile_sound = pygame.mixer.Sound(os.path.join(BASE_DIR, "sounds", "missile_launch.wav"))
-except:
-    missile_sound = None
-
-try:
-    wave_complete_sound = pygame.mixer.Sound(os.path.join(BASE_DIR, "sounds", "wave_complete.wav"))
-except:
-    wave_complete_sound = None
+# Efectos de sonido (opcionales). Se cargan en segundo plano con el resto
+# de recursos (ver AssetLoader); mientras no estén listos, o si el archivo no
+# existe, no suenan
+SOUND_FILES = {
+    "shoot": "alienshoot1.wav",
+    "start": "start.ogg",
+    "explosion": "explosion.wav",
+    "powerup": "powerup.wav",
+    "shield": "shield_activate.wav",
+    "missile": "missile_launch.wav",
+    "wave_complete": "wave_complete.wav"
+}
+
+# Categorías de sonido: cada una tiene sus propios canales del mezclador,
+# tantos como voces simultáneas admite (si están todos ocupados el sonido se
+# descarta). Volumen de cada efecto (se fija una vez, al cargarlo) y efecto
+# que suena en su lugar si el archivo no existe
+SOUND_CHANNELS = {
+    "shots": 3,
+    "explosions": 4,
+    "ui": 2
+}
+SOUND_CATEGORIES = {
+    "shoot": "shots",
+    "missile": "shots",
+    "explosion": "explosions",
+    "powerup": "ui",
+    "shield": "ui",
+    "wave_complete": "ui",
+    "start": "ui"
+}
+SOUND_VOLUMES = {
+    "explosion": 0.3
+}
+SOUND_FALLBACKS = {
+    "missile": "shoot",
+    "shield": "powerup"
+}
 
 # Música de fondo (opcional)
 menu_music_path = os.path.join(BASE_DIR, "sounds", "menu_music.ogg")
 game_music_path = os.path.join(BASE_DIR, "sounds", "game_music.ogg")
 
+# Imágenes del juego
+PLAYER_IMAGE_PATH = os.path.join(BASE_DIR, "images", "DurrrSpaceShip.png")
+ENEMY_IMAGE_PATH = os.path.join(BASE_DIR, "images", "Asteroid Brown.png")
+BACKGROUND_IMAGE_PATH = os.path.join(BASE_DIR, "images", "astrominer.png")
+
+# Registros de partidas: base de datos SQLite y antiguo archivo JSON, que se
+# importa una sola vez al crear la base de datos
+RECORDS_DB_PATH = os.path.join(BASE_DIR, "Juego Space Shooters", "game_records.db")
+RECORDS_JSON_PATH = os.path.join(BASE_DIR, "Juego Space Shooters", "game_records.json")
+# Registros aceptados pero aún no guardados en la base de datos (se repasan al
+# arrancar) y máximo de registros esperando al hilo de escritura
+RECORDS_JOURNAL_PATH = os.path.join(BASE_DIR, "Juego Space Shooters", "game_records.journal")
+RECORDS_QUEUE_SIZE = 64
+# Ancho (en puntos) de los grupos de puntuación del índice de posiciones
+RANK_BUCKET_WIDTH = 100
+# Partidas que se piden a la base de datos de cada vez en la pantalla de
+# registro y filas de texto ya renderizadas que se guardan
+RECORDS_PAGE_SIZE = 50
+RECORDS_CACHED_ROWS = 256
+# Niveles en los que se cuantiza el color pulsante del texto de los botones
+# (cada nivel se renderiza una sola vez)
+BUTTON_PULSE_LEVELS = 16
+
 WIDTH, HEIGHT = 800, 600
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Space Shooter")
+# La ventana se abre en init_game()
+screen = None
 
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
@@ -70,25 +107,419 @@ PURPLE = (255, 0, 255)
 clock = pygame.time.Clock()
 FPS = 60
 
-font = pygame.font.SysFont("Arial", 36)
-small_font = pygame.font.SysFont("Arial", 24)
-tiny_font = pygame.font.SysFont("Arial", 16)
+# Textos del HUD: máximo de superficies cacheadas y atlas de glifos para números
+HUD_TEXT_CACHE_SIZE = 128
+HUD_GLYPH_ATLAS = True
+
+# Dibujado por rectángulos sucios en la partida (opcional). Si el área sucia
+# supera esta fracción de la pantalla se hace un flip completo
+DIRTY_RECT_RENDERING = False
+DIRTY_RECT_MAX_AREA = 0.4
+
+# Broadphase de colisiones con rejilla espacial (False = fuerza bruta). La
+# rejilla hay que rehacerla en cada paso y con los pocos sprites de la partida
+# cuesta más que las comparaciones que ahorra, así que viene desactivada; si se
+# activa solo se construye cuando hay al menos SPATIAL_HASH_MIN_QUERIES misiles
+# en vuelo (las únicas consultas que pueden ser muchas a la vez)
+USE_SPATIAL_HASH = False
+SPATIAL_CELL_SIZE = 64
+SPATIAL_HASH_MIN_QUERIES = 48
+
+# Scanlines retro también durante la partida (cubren toda la pantalla, así
+# que con rectángulos sucios cada frame acaba siendo un flip completo)
+GAMEPLAY_SCANLINES = False
+
+# Semilla de las partidas (None = aleatoria) y fichero donde se graba la
+# repetición de la última partida (None = no grabar). Ver --seed y --record
+GAME_SEED = None
+REPLAY_RECORD_PATH = None
+
+# Simulación a paso fijo: la lógica avanza SIM_HZ pasos por segundo sea cual
+# sea la velocidad de dibujado (limitada a GAME_RENDER_FPS), con un máximo
+# de MAX_SUBSTEPS pasos por frame para no entrar en espiral si va lento
+SIM_HZ = 60
+SIM_STEP_MS = 1000 / SIM_HZ
+MAX_SUBSTEPS = 5
+GAME_RENDER_FPS = 120
+
+# Hilos que decodifican imágenes y sonidos durante la pantalla de carga, y
+# tiempo mínimo que se muestran las pantallas de carga aunque todo esté listo
+ASSET_LOADER_WORKERS = 4
+SPLASH_MIN_MS = 1500
+LOADING_MIN_MS = 500
+
+# Arranque: objetivo de tiempo de importación del módulo (sin ventana, audio
+# ni fuentes, que se crean en init_game) y si se muestra el informe de
+# tiempos hasta el primer frame. Ver --profile-startup
+IMPORT_TIME_TARGET_MS = 300
+PROFILE_STARTUP = False
+
+# Fuentes (se crean en init_game)
+font = None
+small_font = None
+tiny_font = None
+arcade_font_large = None
+arcade_font_medium = None
+
+# Fin de cada fase del arranque (nombre -> instante), en orden
+startup_marks = {}
+
+def mark_startup(step):
+    """Apunta el final de una fase del arranque (solo la primera vez)"""
+    if step not in startup_marks:
+        startup_marks[step] = time.perf_counter()
+
+def startup_report():
+    """Líneas con la duración de cada fase del arranque y el tiempo acumulado"""
+    lines = ["Arranque (fase, duración, acumulado):"]
+    previous = STARTUP_START
+    for step, moment in startup_marks.items():
+        lines.append(f"  {step:<20}{(moment - previous) * 1000:8.1f} ms{(moment - STARTUP_START) * 1000:10.1f} ms")
+        previous = moment
+    if "importación" in startup_marks:
+        import_ms = (startup_marks["importación"] - STARTUP_START) * 1000
+        verdict = "OK" if import_ms <= IMPORT_TIME_TARGET_MS else "SUPERADO"
+        lines.append(f"  Importación: {import_ms:.1f} ms (objetivo {IMPORT_TIME_TARGET_MS} ms) {verdict}")
+    return lines
+
+def init_game(display=True, audio=True):
+    """Inicializa pygame, la ventana, el audio y las fuentes. Importar el
+    módulo no abre nada, para que las herramientas que solo usan los
+    registros o las clases del juego no paguen el arranque; hay que llamarla
+    antes de mostrar cualquier pantalla. Llamarla otra vez no hace nada."""
+    global screen, font, small_font, tiny_font, arcade_font_large, arcade_font_medium
+    if display and screen is None:
+        pygame.display.init()
+        screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        pygame.display.set_caption("Space Shooter")
+        mark_startup("ventana")
+    if audio and pygame.mixer.get_init() is None:
+        try:
+            pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
+        except pygame.error:
+            pass  # Sin dispositivo de audio se juega sin sonido
+        mark_startup("audio")
+    if font is None:
+        pygame.font.init()
+        font = pygame.font.SysFont("Arial", 36)
+        small_font = pygame.font.SysFont("Arial", 24)
+        tiny_font = pygame.font.SysFont("Arial", 16)
+        
+        # Fuente grande para título arcade
+        try:
+            arcade_font_large = pygame.font.Font(None, 72)
+            arcade_font_medium = pygame.font.Font(None, 48)
+        except:
+            arcade_font_large = pygame.font.SysFont("Arial", 72)
+            arcade_font_medium = pygame.font.SysFont("Arial", 48)
+        mark_startup("fuentes")
+    # Resto de módulos (reloj, eventos...); los ya iniciados no se repiten.
+    # pygame.init() también abriría la ventana y el audio con sus valores por
+    # defecto, así que solo se llama cuando se han pedido los dos
+    if display and audio:
+        pygame.init()
+
+class AssetCache:
+    """Caché compartida de imágenes. Cada combinación de ruta, tamaño y modo de
+    conversión se decodifica y escala una sola vez; el resto de llamadas
+    devuelven la misma superficie, que no debe modificarse."""
+    def __init__(self):
+        self._images = {}
+        # Decodificaciones en segundo plano pendientes o terminadas (ruta -> Future)
+        self._decoding = {}
+        self.hits = 0
+        self.misses = 0
+    
+    def preload(self, executor, path):
+        """Empieza a decodificar 'path' en 'executor'; get_image usará el
+        resultado en vez de volver a leer el archivo"""
+        future = self._decoding.get(path)
+        if future is None:
+            future = executor.submit(pygame.image.load, path)
+            self._decoding[path] = future
+        return future
+    
+    def is_ready(self, path):
+        """True si get_image(path) no tiene que esperar a una decodificación"""
+        future = self._decoding.get(path)
+        return future is None or future.done()
+    
+    def get_image(self, path, size=None, mode="alpha"):
+        """Devuelve la imagen de 'path' escalada a 'size'.
+        mode: "alpha" (convert_alpha), "opaque" (convert) o "raw" (sin convertir)"""
+        key = (path, size, mode)
+        image = self._images.get(key)
+        if image is not None:
+            self.hits += 1
+            return image
+        
+        self.misses += 1
+        future = self._decoding.get(path)
+        image = future.result() if future is not None else pygame.image.load(path)
+        if pygame.display.get_surface() is None:
+            # Sin ventana (simulación sin pantalla) no se puede convertir
+            mode = "raw"
+        if mode == "alpha":
+            image = image.convert_alpha()
+        elif mode == "opaque":
+            image = image.convert()
+        if size is not None:
+            image = pygame.transform.scale(image, size)
+        self._images[key] = image
+        return image
+    
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "images": len(self._images)}
+
+assets = AssetCache()
+
+class SoundManager:
+    """Reproduce los efectos de sonido por categorías (ver SOUND_CHANNELS).
+    Cada categoría usa solo sus canales reservados, así que una ráfaga de
+    explosiones no deja sin voz a los disparos; el mismo efecto pedido varias
+    veces en un frame suena una sola vez."""
+    def __init__(self):
+        self.sounds = {}
+        self.channels = None
+        self.played_this_frame = set()
+        self.played = 0
+        self.coalesced = 0
+        self.dropped = 0
+    
+    def add(self, name, sound):
+        sound.set_volume(SOUND_VOLUMES.get(name, 1.0))
+        self.sounds[name] = sound
+    
+    def _setup_channels(self):
+        """Reserva los primeros canales del mezclador y los reparte por categoría"""
+        total = sum(SOUND_CHANNELS.values())
+        if pygame.mixer.get_num_channels() < total:
+            pygame.mixer.set_num_channels(total)
+        pygame.mixer.set_reserved(total)
+        self.channels = {}
+        first = 0
+        for category, count in SOUND_CHANNELS.items():
+            self.channels[category] = [pygame.mixer.Channel(i) for i in range(first, first + count)]
+            first += count
+    
+    def play(self, name):
+        sound = self.sounds.get(name)
+        if sound is None:
+            name = SOUND_FALLBACKS.get(name)
+            sound = self.sounds.get(name)
+            if sound is None:
+                return
+        if name in self.played_this_frame:
+            self.coalesced += 1
+            return
+        self.played_this_frame.add(name)
+        if self.channels is None:
+            if pygame.mixer.get_init() is None:
+                return
+            self._setup_channels()
+        for channel in self.channels[SOUND_CATEGORIES[name]]:
+            if not channel.get_busy():
+                channel.play(sound)
+                self.played += 1
+                return
+        self.dropped += 1
+    
+    def end_frame(self):
+        """Llamar una vez por frame dibujado"""
+        self.played_this_frame.clear()
+    
+    def stats(self):
+        return {"played": self.played, "coalesced": self.coalesced, "dropped": self.dropped}
+
+sound_manager = SoundManager()
+
+def load_sound(name, path):
+    try:
+        sound_manager.add(name, pygame.mixer.Sound(path))
+    except:
+        pass
+
+class AssetLoader:
+    """Carga los recursos del juego en un pool de hilos mientras se anima la
+    pantalla de carga. Los hilos solo decodifican (imágenes y sonidos); la
+    conversión al formato de la pantalla se hace en update(), desde el hilo
+    principal, porque convert() necesita la ventana."""
+    def __init__(self, workers=ASSET_LOADER_WORKERS):
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.futures = []
+        self.images = []
+        self.converted = 0
+    
+    def load_image(self, path, size=None, mode="alpha"):
+        future = assets.preload(self.executor, path)
+        if future not in self.futures:
+            self.futures.append(future)
+        self.images.append((path, size, mode))
+    
+    def load_sound(self, name, path):
+        self.futures.append(self.executor.submit(load_sound, name, path))
+    
+    def update(self):
+        """Convierte (en orden) las imágenes que ya están decodificadas"""
+        while self.converted < len(self.images):
+            path, size, mode = self.images[self.converted]
+            if not assets.is_ready(path):
+                break
+            try:
+                assets.get_image(path, size, mode)
+            except:
+                pass  # Si no existe, cada clase usa su dibujo de respaldo
+            self.converted += 1
+    
+    def progress(self):
+        """Fracción de trabajos terminados (decodificaciones y conversiones)"""
+        total = len(self.futures) + len(self.images)
+        if total == 0:
+            return 1.0
+        finished = sum(1 for future in self.futures if future.done()) + self.converted
+        return finished / total
+    
+    def done(self):
+        return self.converted == len(self.images) and all(future.done() for future in self.futures)
+    
+    def shutdown(self):
+        self.executor.shutdown(wait=False)
+
+def start_asset_loading():
+    """Lanza la carga en segundo plano de las imágenes y sonidos del juego"""
+    loader = AssetLoader()
+    # El fondo primero, porque lo usa la propia pantalla de carga
+    loader.load_image(BACKGROUND_IMAGE_PATH, (WIDTH, HEIGHT), "opaque")
+    loader.load_image(PLAYER_IMAGE_PATH, (50, 40))
+    loader.load_image(ENEMY_IMAGE_PATH, (50, 40))
+    for name, filename in SOUND_FILES.items():
+        loader.load_sound(name, os.path.join(BASE_DIR, "sounds", filename))
+    return loader
+
+# Capacidad máxima de objetos libres que guarda cada pool
+POOL_SIZES = {
+    "missile": 16,
+    "enemy": 64,
+    "powerup": 8
+}
+
+# Pasos de giro de la animación de los power-ups (giran 5 grados por frame)
+POWERUP_ROTATION_STEPS = 72
+# Fases prerenderizadas del pulso del escudo del jugador
+SHIELD_PHASES = 32
+# Niveles de zoom prerenderizados del fondo de las pantallas de carga
+BACKGROUND_ZOOM_FRAMES = 12
 
-# Fuente grande para título arcade
-try:
-    arcade_font_large = pygame.font.Font(None, 72)
-    arcade_font_medium = pygame.font.Font(None, 48)
-except:
-    arcade_font_large = pygame.font.SysFont("Arial", 72)
-    arcade_font_medium = pygame.font.SysFont("Arial", 48)
+class ObjectPool:
+    """Pool de objetos reutilizables. En lugar de construir un objeto nuevo se
+    recicla uno liberado llamando a su método reset() con los mismos
+    argumentos que el constructor."""
+    def __init__(self, factory, max_size=64):
+        self.factory = factory
+        self.max_size = max_size
+        self._free = []
+        # Los objetos liberados no se reutilizan hasta el siguiente frame
+        # (flush) para no pisar sprites que aún se están procesando
+        self._pending = []
+        self.created = 0
+        self.reused = 0
+        self.discarded = 0
+        self.live = 0
+        self.peak_live = 0
+    
+    def acquire(self, *args, **kwargs):
+        if self._free:
+            obj = self._free.pop()
+            obj.reset(*args, **kwargs)
+            self.reused += 1
+        else:
+            obj = self.factory(*args, **kwargs)
+            obj.pool = self
+            self.created += 1
+        self.live += 1
+        self.peak_live = max(self.peak_live, self.live)
+        return obj
+    
+    def release(self, obj):
+        self.live -= 1
+        if len(self._free) + len(self._pending) < self.max_size:
+            self._pending.append(obj)
+        else:
+            self.discarded += 1
+    
+    def flush(self):
+        """Hace disponibles los objetos liberados durante el frame"""
+        if self._pending:
+            self._free.extend(self._pending)
+            self._pending.clear()
+    
+    def reuse_rate(self):
+        total = self.created + self.reused
+        return self.reused / total if total else 0.0
+    
+    def stats(self):
+        return {
+            "created": self.created,
+            "reused": self.reused,
+            "reuse_rate": self.reuse_rate(),
+            "discarded": self.discarded,
+            "live": self.live,
+            "peak_live": self.peak_live,
+            "free": len(self._free) + len(self._pending)
+        }
+
+class MovingSprite(pygame.sprite.Sprite):
+    """Sprite con posición en coma flotante. x/y (esquina superior izquierda)
+    son la posición real y se integran sin redondear; rect se deriva de ellas
+    con sync_rect y solo se usa para colisiones y para dibujar."""
+    def set_position(self, x, y):
+        """Coloca el sprite sin interpolar desde la posición anterior"""
+        self.x = self.prev_x = float(x)
+        self.y = self.prev_y = float(y)
+        self.sync_rect()
+    
+    def save_position(self):
+        """Guarda la posición del paso anterior para interpolar al dibujar"""
+        self.prev_x = self.x
+        self.prev_y = self.y
+    
+    def sync_rect(self):
+        self.rect.x = round(self.x)
+        self.rect.y = round(self.y)
+    
+    def interpolated_rect(self, interp):
+        """Rect entre la posición del paso anterior (interp=0) y la actual (interp=1)"""
+        rect = self.rect
+        if interp >= 1.0:
+            return rect
+        x = self.prev_x + (self.x - self.prev_x) * interp
+        y = self.prev_y + (self.y - self.prev_y) * interp
+        return rect.move(round(x) - rect.x, round(y) - rect.y)
 
-class Player(pygame.sprite.Sprite):
+class PooledSprite(MovingSprite):
+    """Sprite que vuelve a su pool al llamar a kill()"""
+    pool = None
+    
+    def kill(self):
+        was_alive = self.alive()
+        super().kill()
+        if was_alive and self.pool is not None:
+            self.pool.release(self)
+
+class Player(MovingSprite):
+    # Fotogramas prerenderizados de los efectos: imagen atenuada y resplandor
+    # por nivel de alpha (redondeado a múltiplos de 16) y escudo por fase del
+    # pulso, para no crear superficies al dibujar
+    _faded_cache = {}
+    _glow_cache = {}
+    _shield_cache = {}
+    
     def __init__(self):
         super().__init__()
-        self.image = pygame.image.load(os.path.join(BASE_DIR, "images", "DurrrSpaceShip.png"))
-        self.image = pygame.transform.scale(self.image, (50, 40))
+        self.image = assets.get_image(PLAYER_IMAGE_PATH, (50, 40))
         self.rect = self.image.get_rect()
         self.rect.center = (WIDTH // 2, HEIGHT - 50)
+        self.set_position(self.rect.x, self.rect.y)
         self.base_speed = 3
         self.speed = self.base_speed
         self.lives = 3
@@ -110,7 +541,7 @@ class Player(pygame.sprite.Sprite):
         self.invincible = False
         self.invincibility_time = 0
 
-    def update(self, score):
+    def update(self, score, command):
         # Progresión de velocidad más gradual (cada 300 puntos en lugar de 150)
         speed_bonus = (score // 300) * 0.5
         base_speed = self.base_speed + speed_bonus
@@ -149,15 +580,16 @@ class Player(pygame.sprite.Sprite):
             if self.invincibility_time <= 0:
                 self.invincible = False
         
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_a] and self.rect.left > 0:
-            self.rect.x -= self.speed
-        if keys[pygame.K_d] and self.rect.right < WIDTH:
-            self.rect.x += self.speed
-        if keys[pygame.K_w] and self.rect.top > 0:
-            self.rect.y -= self.speed
-        if keys[pygame.K_s] and self.rect.bottom < HEIGHT:
-            self.rect.y += self.speed
+        self.save_position()
+        if command.left and self.x > 0:
+            self.x -= self.speed
+        if command.right and self.x + self.rect.width < WIDTH:
+            self.x += self.speed
+        if command.up and self.y > 0:
+            self.y -= self.speed
+        if command.down and self.y + self.rect.height < HEIGHT:
+            self.y += self.speed
+        self.sync_rect()
     
     def activate_shield(self, duration=600):
         self.shield_active = True
@@ -180,8 +612,10 @@ class Player(pygame.sprite.Sprite):
         self.invincible = True
         self.invincibility_time = duration
     
-    def draw(self, surface):
-        """Dibuja el jugador con efecto de transparencia si está invencible"""
+    def draw(self, surface, interp=1.0):
+        """Dibuja el jugador con efecto de transparencia si está invencible.
+        Devuelve el área modificada"""
+        rect = self.interpolated_rect(interp)
         if self.invincible:
             # Efecto de parpadeo durante invencibilidad
             # Parpadeo más rápido y visible
@@ -189,604 +623,1941 @@ class Player(pygame.sprite.Sprite):
             flash_alpha = int(100 + 155 * math.sin(self.invincibility_time / flash_rate))
             flash_alpha = max(60, min(255, flash_alpha))  # Limitar entre 60 y 255 para mejor visibilidad
             
+            flash_alpha &= ~15
+            
             # Efecto de resplandor durante invencibilidad
             if int(self.invincibility_time / flash_rate) % 2 == 0:
                 # Dibujar resplandor exterior
                 glow_size = 5
-                glow_surface = pygame.Surface((self.rect.width + glow_size * 2, 
-                                             self.rect.height + glow_size * 2), pygame.SRCALPHA)
-                glow_alpha = int(100 * (flash_alpha / 255))
-                pygame.draw.ellipse(glow_surface, (255, 255, 255, glow_alpha),
-                                   (0, 0, self.rect.width + glow_size * 2, 
-                                    self.rect.height + glow_size * 2))
-                surface.blit(glow_surface, (self.rect.x - glow_size, self.rect.y - glow_size))
+                glow_rect = surface.blit(self._glow_frame(flash_alpha, glow_size),
+                                         (rect.x - glow_size, rect.y - glow_size))
+                return glow_rect.union(surface.blit(self._faded_frame(flash_alpha), rect))
             
-            # Crear superficie con transparencia
-            player_surface = pygame.Surface(self.image.get_size(), pygame.SRCALPHA)
-            player_surface.set_alpha(flash_alpha)
-            player_surface.blit(self.image, (0, 0))
-            surface.blit(player_surface, self.rect)
+            return surface.blit(self._faded_frame(flash_alpha), rect)
         else:
             # Dibujar normalmente
-            surface.blit(self.image, self.rect)
+            return surface.blit(self.image, rect)
     
-    def draw_shield(self, surface):
-        if self.shield_active:
-            time = pygame.time.get_ticks() / 100
+    def _faded_frame(self, alpha):
+        key = (self.image.get_size(), alpha)
+        image = Player._faded_cache.get(key)
+        if image is None:
+            # Crear superficie con transparencia
+            image = pygame.Surface(self.image.get_size(), pygame.SRCALPHA)
+            image.set_alpha(alpha)
+            image.blit(self.image, (0, 0))
+            Player._faded_cache[key] = image
+        return image
+    
+    def _glow_frame(self, flash_alpha, glow_size):
+        width = self.rect.width + glow_size * 2
+        height = self.rect.height + glow_size * 2
+        key = (width, height, flash_alpha)
+        image = Player._glow_cache.get(key)
+        if image is None:
+            image = pygame.Surface((width, height), pygame.SRCALPHA)
+            glow_alpha = int(100 * (flash_alpha / 255))
+            pygame.draw.ellipse(image, (255, 255, 255, glow_alpha), (0, 0, width, height))
+            Player._glow_cache[key] = image
+        return image
+    
+    def _shield_frame(self, shield_radius, phase):
+        key = (shield_radius, phase)
+        image = Player._shield_cache.get(key)
+        if image is None:
+            time = phase * 2 * math.pi / SHIELD_PHASES
             shield_alpha = int(128 + 127 * math.sin(time))
-            shield_radius = max(self.rect.width, self.rect.height) // 2 + 10
-            shield_surface = pygame.Surface((shield_radius * 2 + 20, shield_radius * 2 + 20), pygame.SRCALPHA)
+            image = pygame.Surface((shield_radius * 2 + 20, shield_radius * 2 + 20), pygame.SRCALPHA)
             center = (shield_radius + 10, shield_radius + 10)
             
             # Círculo exterior pulsante
             for i in range(3):
                 alpha = int(shield_alpha * (1 - i * 0.3))
                 radius = shield_radius + i * 3 + int(5 * math.sin(time + i))
-                pygame.draw.circle(shield_surface, (0, 200, 255, alpha), center, radius, 2)
-            
-            surface.blit(shield_surface, (self.rect.centerx - shield_radius - 10, 
-                                        self.rect.centery - shield_radius - 10))
+                pygame.draw.circle(image, (0, 200, 255, alpha), center, radius, 2)
+            Player._shield_cache[key] = image
+        return image
+    
+    def draw_shield(self, surface, interp=1.0):
+        if self.shield_active:
+            rect = self.interpolated_rect(interp)
+            time = pygame.time.get_ticks() / 100
+            phase = int(time * SHIELD_PHASES / (2 * math.pi)) % SHIELD_PHASES
+            shield_radius = max(self.rect.width, self.rect.height) // 2 + 10
+            return surface.blit(self._shield_frame(shield_radius, phase),
+                                (rect.centerx - shield_radius - 10, rect.centery - shield_radius - 10))
+        return None
 
-class Bullet(pygame.sprite.Sprite):
-    def __init__(self, x, y, speed, color=RED, size=(5, 10), angle=0):
-        super().__init__()
-        self.image = pygame.Surface(size)
-        self.image.fill(color)
-        self.rect = self.image.get_rect()
-        self.rect.center = (x, y)
-        self.speed = speed
-        self.angle = angle
-        self.speed_x = speed * math.sin(math.radians(angle))
-        self.speed_y = speed * math.cos(math.radians(angle))
+# Tipos de bala (color, tamaño); el índice es el id de arma que guarda BulletArray
+BULLET_KINDS = [
+    (RED, (5, 10)),     # normal y rápida
+    (YELLOW, (6, 12)),  # dispersión
+    (RED, (8, 20))      # láser
+]
+BULLET_NORMAL, BULLET_SPREAD, BULLET_LASER = range(len(BULLET_KINDS))
 
+class BulletArray:
+    """Balas del jugador guardadas como filas de arrays de NumPy (x, y, vx,
+    vy, tipo). Se mueven, se descartan al salir de pantalla y se comprueban
+    contra los enemigos de golpe, y se dibujan con una superficie compartida
+    por tipo en un único Surface.blits. Las vivas ocupan las primeras 'count'
+    filas en orden de disparo."""
+    _images = None
+    
+    def __init__(self, capacity=256):
+        self.capacity = capacity
+        self.count = 0
+        self.pos = np.zeros((capacity, 2), dtype=np.float64)
+        self.prev = np.zeros((capacity, 2), dtype=np.float64)
+        self.vel = np.zeros((capacity, 2), dtype=np.float64)
+        self.kind = np.zeros(capacity, dtype=np.int8)
+        self.sizes = np.array([size for color, size in BULLET_KINDS], dtype=np.int64)
+    
+    @classmethod
+    def images(cls):
+        if cls._images is None:
+            cls._images = []
+            for color, size in BULLET_KINDS:
+                image = pygame.Surface(size)
+                image.fill(color)
+                cls._images.append(image)
+        return cls._images
+    
+    def __len__(self):
+        return self.count
+    
+    def _reserve(self, extra):
+        needed = self.count + extra
+        if needed <= self.capacity:
+            return
+        new_capacity = max(needed, self.capacity * 2)
+        for name in ("pos", "prev", "vel", "kind"):
+            old = getattr(self, name)
+            new = np.zeros((new_capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+        self.capacity = new_capacity
+    
+    def spawn(self, x, y, speed, kind=BULLET_NORMAL, angle=0):
+        """Dispara una bala centrada en (x, y); angle en grados respecto a la vertical"""
+        self._reserve(1)
+        width, height = BULLET_KINDS[kind][1]
+        i = self.count
+        self.pos[i] = (x - width / 2, y - height / 2)
+        self.prev[i] = self.pos[i]
+        self.vel[i] = (speed * math.sin(math.radians(angle)), speed * math.cos(math.radians(angle)))
+        self.kind[i] = kind
+        self.count += 1
+    
+    def _keep(self, mask):
+        # Compacta conservando el orden de disparo
+        keep = np.flatnonzero(mask)
+        k = len(keep)
+        for array in (self.pos, self.prev, self.vel, self.kind):
+            array[:k] = array[keep]
+        self.count = k
+    
+    def rects(self):
+        """Rects enteros (left, top, right, bottom) de las balas vivas"""
+        n = self.count
+        topleft = np.rint(self.pos[:n]).astype(np.int64)
+        size = self.sizes[self.kind[:n]]
+        return topleft[:, 0], topleft[:, 1], topleft[:, 0] + size[:, 0], topleft[:, 1] + size[:, 1]
+    
     def update(self):
-        if self.angle == 0:
-            self.rect.y += self.speed
-        else:
-            self.rect.x += self.speed_x
-            self.rect.y += self.speed_y
-        if self.rect.bottom < 0 or self.rect.top > HEIGHT or self.rect.left < 0 or self.rect.right > WIDTH:
-            self.kill()
+        n = self.count
+        if n == 0:
+            return
+        self.prev[:n] = self.pos[:n]
+        self.pos[:n] += self.vel[:n]
+        left, top, right, bottom = self.rects()
+        self._keep((bottom >= 0) & (top <= HEIGHT) & (left >= 0) & (right <= WIDTH))
+    
+    def collide(self, group):
+        """Elimina las balas que tocan sprites de 'group' y devuelve esos
+        sprites en el orden del grupo. Igual que groupcollide(group, balas,
+        True, True): cada bala la consume el primer sprite que toca."""
+        sprites = group.sprites()
+        if self.count == 0 or not sprites:
+            return []
+        left, top, right, bottom = self.rects()
+        targets = np.array([tuple(sprite.rect) for sprite in sprites], dtype=np.int64)
+        t_left = targets[:, 0:1]
+        t_top = targets[:, 1:2]
+        t_right = t_left + targets[:, 2:3]
+        t_bottom = t_top + targets[:, 3:4]
+        overlap = ((t_left < right) & (t_right > left) & (t_top < bottom) & (t_bottom > top))
+        hit_bullets = overlap.any(axis=0)
+        if not hit_bullets.any():
+            return []
+        first_target = overlap.argmax(axis=0)[hit_bullets]
+        hit_targets = np.zeros(len(sprites), dtype=bool)
+        hit_targets[first_target] = True
+        self._keep(~hit_bullets)
+        return [sprite for sprite, hit in zip(sprites, hit_targets.tolist()) if hit]
+    
+    def draw(self, surface, interp=1.0):
+        """Dibuja todas las balas y devuelve los rects modificados"""
+        n = self.count
+        if n == 0:
+            return []
+        pos = self.prev[:n] + (self.pos[:n] - self.prev[:n]) * interp
+        xs, ys = np.rint(pos).astype(np.int64).T.tolist()
+        images = self.images()
+        return surface.blits([(images[kind], (x, y)) for kind, x, y in zip(self.kind[:n].tolist(), xs, ys)])
 
-class Missile(pygame.sprite.Sprite):
+class Missile(PooledSprite):
+    _shared_image = None
+    
     def __init__(self, x, y):
         super().__init__()
-        self.image = pygame.Surface((8, 15))
-        self.image.fill(ORANGE)
-        pygame.draw.polygon(self.image, YELLOW, [(4, 0), (0, 15), (8, 15)])
+        # Todos los misiles comparten la misma superficie
+        if Missile._shared_image is None:
+            Missile._shared_image = pygame.Surface((8, 15))
+            Missile._shared_image.fill(ORANGE)
+            pygame.draw.polygon(Missile._shared_image, YELLOW, [(4, 0), (0, 15), (8, 15)])
+        self.image = Missile._shared_image
         self.rect = self.image.get_rect()
-        self.rect.center = (x, y)
+        self.reset(x, y)
+    
+    def reset(self, x, y):
+        self.set_position(x - self.rect.width / 2, y - self.rect.height / 2)
         self.speed = -8
         self.explosion_radius = 60
 
     def update(self):
-        self.rect.y += self.speed
+        self.save_position()
+        self.y += self.speed
+        self.sync_rect()
         if self.rect.bottom < 0:
             self.kill()
     
     def explode(self):
         return self.explosion_radius
 
-class Enemy(pygame.sprite.Sprite):
-    def __init__(self):
+class Enemy(PooledSprite):
+    def __init__(self, rng=random):
         super().__init__()
-        self.image = pygame.image.load(os.path.join(BASE_DIR, "images", "Asteroid Brown.png"))
-        self.image = pygame.transform.scale(self.image, (50, 40))
+        self.image = assets.get_image(ENEMY_IMAGE_PATH, (50, 40))
         self.rect = self.image.get_rect()
-        self.rect.x = random.randint(0, WIDTH - self.rect.width)
-        self.rect.y = random.randint(-100, -40)
-        self.speed = random.randint(2, 5)
+        self.reset(rng)
+    
+    def reset(self, rng=random):
+        # rng: generador de la partida (random.Random) para poder repetirla
+        self.rng = rng
+        x = rng.randint(0, WIDTH - self.rect.width)
+        y = rng.randint(-100, -40)
+        self.set_position(x, y)
+        self.speed = rng.randint(2, 5)
 
     def update(self):
-        self.rect.y += self.speed
+        self.save_position()
+        self.y += self.speed
+        self.sync_rect()
         if self.rect.top > HEIGHT:
-            self.rect.y = random.randint(-100, -40)
-            self.rect.x = random.randint(0, WIDTH - self.rect.width)
+            # Reaparece arriba (sin interpolar desde abajo)
+            y = self.rng.randint(-100, -40)
+            x = self.rng.randint(0, WIDTH - self.rect.width)
+            self.set_position(x, y)
 
-class PowerUp(pygame.sprite.Sprite):
-    def __init__(self, power_type):
+class PowerUp(PooledSprite):
+    # Imagen base de cada tipo y fotogramas de la animación (tipo, tamaño,
+    # paso de giro), compartidos por todos los power-ups y creados la primera
+    # vez que se necesitan. El pulso (±10 %) solo da 7 tamaños enteros, de 27
+    # a 33 px, así que la caché tiene como mucho 6 x 7 x POWERUP_ROTATION_STEPS
+    # superficies (unos 3 MB por tipo)
+    _base_images = {}
+    _frames = {}
+    
+    def __init__(self, power_type, rng=random):
         super().__init__()
+        self.reset(power_type, rng)
+    
+    @classmethod
+    def base_image_for(cls, power_type):
+        image = cls._base_images.get(power_type)
+        if image is None:
+            colors = {
+                "shield": CYAN,
+                "speed": GREEN,
+                "rapid": YELLOW,
+                "spread": PURPLE,
+                "laser": RED,
+                "missile": ORANGE
+            }
+            
+            color = colors.get(power_type, WHITE)
+            image = pygame.Surface((30, 30), pygame.SRCALPHA)
+            pygame.draw.circle(image, color, (15, 15), 14)
+            pygame.draw.circle(image, WHITE, (15, 15), 12, 2)
+            pygame.draw.circle(image, color, (15, 15), 8)
+            cls._base_images[power_type] = image
+        return image
+    
+    @classmethod
+    def frame(cls, power_type, size, step):
+        key = (power_type, size, step)
+        image = cls._frames.get(key)
+        if image is None:
+            scaled_image = pygame.transform.scale(cls.base_image_for(power_type), (size, size))
+            image = pygame.transform.rotate(scaled_image, step * 360 / POWERUP_ROTATION_STEPS)
+            cls._frames[key] = image
+        return image
+    
+    def reset(self, power_type, rng=random):
         self.power_type = power_type  # shield, speed, rapid, spread, laser, missile
-        self.base_image = pygame.Surface((30, 30), pygame.SRCALPHA)
-        
-        colors = {
-            "shield": CYAN,
-            "speed": GREEN,
-            "rapid": YELLOW,
-            "spread": PURPLE,
-            "laser": RED,
-            "missile": ORANGE
-        }
-        
-        color = colors.get(power_type, WHITE)
-        pygame.draw.circle(self.base_image, color, (15, 15), 14)
-        pygame.draw.circle(self.base_image, WHITE, (15, 15), 12, 2)
-        pygame.draw.circle(self.base_image, color, (15, 15), 8)
-        
-        self.image = self.base_image.copy()
+        self.image = self.base_image_for(power_type)
         self.rect = self.image.get_rect()
-        self.rect.x = random.randint(0, WIDTH - self.rect.width)
-        self.rect.y = random.randint(-100, -40)
+        x = rng.randint(0, WIDTH - self.rect.width)
+        y = rng.randint(-100, -40)
+        self.set_position(x, y)
         self.speed = 3
         self.rotation = 0
         self.pulse = 0
 
     def update(self):
-        self.rect.y += self.speed
+        self.save_position()
+        self.y += self.speed
+        self.sync_rect()
         self.rotation += 5
         self.pulse += 0.2
         if self.rect.top > HEIGHT:
             self.kill()
     
-    def draw(self, surface):
-        # Efecto de pulso
+    def draw(self, surface, interp=1.0):
+        # Efecto de pulso y giro, tomados de la caché de fotogramas
         pulse_size = 1 + 0.1 * math.sin(self.pulse)
-        scaled_image = pygame.transform.scale(self.base_image, 
-                                             (int(30 * pulse_size), int(30 * pulse_size)))
-        rotated_image = pygame.transform.rotate(scaled_image, self.rotation)
-        new_rect = rotated_image.get_rect(center=self.rect.center)
-        surface.blit(rotated_image, new_rect)
+        step = int(self.rotation * POWERUP_ROTATION_STEPS / 360) % POWERUP_ROTATION_STEPS
+        rotated_image = self.frame(self.power_type, int(30 * pulse_size), step)
+        new_rect = rotated_image.get_rect(center=self.interpolated_rect(interp).center)
+        return surface.blit(rotated_image, new_rect)
 
 class Explosion:
-    def __init__(self, x, y, radius):
+    def __init__(self, x, y, radius, particles):
         self.x = x
         self.y = y
         self.radius = radius
         self.max_radius = radius
         self.life = 20
-        self.particles = []
-        for _ in range(15):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(2, 5)
-            self.particles.append({
-                'x': x,
-                'y': y,
-                'vx': speed * math.cos(angle),
-                'vy': speed * math.sin(angle),
-                'life': random.randint(10, 20),
-                'color': random.choice([RED, ORANGE, YELLOW])
-            })
+        # Las chispas de la explosión van al sistema de partículas compartido
+        particles.emit_burst(x, y, 15, [RED, ORANGE, YELLOW], speed_range=(2, 5),
+                             life_range=(10, 20), size_range=(3, 3), shrink=True)
     
     def update(self):
         self.life -= 1
         self.radius = int(self.max_radius * (self.life / 20))
-        for particle in self.particles:
-            particle['x'] += particle['vx']
-            particle['y'] += particle['vy']
-            particle['life'] -= 1
-        self.particles = [p for p in self.particles if p['life'] > 0]
         return self.life > 0
     
     def draw(self, surface):
         if self.radius > 0:
+            area = None
             for i in range(3):
                 alpha = int(255 * (self.life / 20))
                 color = (255, min(100 + i * 50, 255), 0, alpha)
-                pygame.draw.circle(surface, color[:3], (int(self.x), int(self.y)), 
-                                 self.radius - i * 5)
-        for particle in self.particles:
-            if particle['life'] > 0:
-                alpha = int(255 * (particle['life'] / 20))
-                size = max(1, int(3 * (particle['life'] / 20)))
-                pygame.draw.circle(surface, particle['color'], 
-                                 (int(particle['x']), int(particle['y'])), size)
-
-class Particle:
-    def __init__(self, x, y, color):
-        self.x = x
-        self.y = y
-        self.vx = random.uniform(-3, 3)
-        self.vy = random.uniform(-3, 3)
-        self.life = random.randint(10, 20)
-        self.color = color
-        self.size = random.randint(2, 4)
+                rect = pygame.draw.circle(surface, color[:3], (int(self.x), int(self.y)), 
+                                          self.radius - i * 5)
+                if area is None:
+                    area = rect
+            return area
+        return None
+
+def pack_color(color):
+    return (color[0] << 16) | (color[1] << 8) | color[2]
+
+def unpack_color(packed):
+    return ((packed >> 16) & 255, (packed >> 8) & 255, packed & 255)
+
+class ParticleSystem:
+    """Sistema de partículas guardado como estructura de arrays de NumPy.
+    Las partículas vivas ocupan siempre las primeras 'count' filas: se
+    integran de golpe con operaciones vectorizadas y las muertas se compactan
+    intercambiándolas por las últimas vivas."""
+    # Sprites de puntos y brillos compartidos por todos los sistemas
+    _dot_cache = {}
+    _glow_cache = {}
     
-    def update(self):
-        self.x += self.vx
-        self.y += self.vy
-        self.life -= 1
-        return self.life > 0
+    def __init__(self, capacity=1024, seed=None):
+        self.capacity = capacity
+        self.count = 0
+        self.rng = np.random.default_rng(seed)
+        self.pos = np.zeros((capacity, 2), dtype=np.float32)
+        self.vel = np.zeros((capacity, 2), dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.float32)
+        self.color = np.zeros(capacity, dtype=np.uint32)
+        self.size = np.zeros(capacity, dtype=np.float32)
+        self.glow = np.zeros(capacity, dtype=np.float32)
+        self.shrink = np.zeros(capacity, dtype=bool)
     
-    def draw(self, surface):
-        if self.life > 0:
-            alpha = int(255 * (self.life / 20))
-            pygame.draw.circle(surface, self.color, (int(self.x), int(self.y)), self.size)
+    def _arrays(self):
+        return (self.pos, self.vel, self.life, self.color, self.size, self.glow, self.shrink)
+    
+    def _reserve(self, extra):
+        needed = self.count + extra
+        if needed <= self.capacity:
+            return
+        new_capacity = max(needed, self.capacity * 2)
+        for name in ("pos", "vel", "life", "color", "size", "glow", "shrink"):
+            old = getattr(self, name)
+            new = np.zeros((new_capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+        self.capacity = new_capacity
+    
+    def emit(self, x, y, vx, vy, life, color, size, shrink=False, glow=0.0):
+        """Añade partículas; cada argumento puede ser un escalar o un array"""
+        k = len(vx)
+        self._reserve(k)
+        new = slice(self.count, self.count + k)
+        self.pos[new, 0] = x
+        self.pos[new, 1] = y
+        self.vel[new, 0] = vx
+        self.vel[new, 1] = vy
+        self.life[new] = life
+        self.color[new] = color
+        self.size[new] = size
+        self.glow[new] = glow
+        self.shrink[new] = shrink
+        self.count += k
+    
+    def _random_colors(self, colors, count):
+        palette = np.array([pack_color(c) for c in colors], dtype=np.uint32)
+        return palette[self.rng.integers(0, len(palette), count)]
+    
+    def emit_burst(self, x, y, count, colors, velocity_range=(-3, 3), speed_range=None,
+                   life_range=(10, 20), size_range=(2, 4), shrink=False):
+        """Estallido de partículas desde un punto. Con speed_range la dirección
+        es un ángulo aleatorio; si no, cada componente sale de velocity_range"""
+        rng = self.rng
+        if speed_range is not None:
+            angle = rng.uniform(0, 2 * math.pi, count)
+            speed = rng.uniform(speed_range[0], speed_range[1], count)
+            vx = speed * np.cos(angle)
+            vy = speed * np.sin(angle)
+        else:
+            vx = rng.uniform(velocity_range[0], velocity_range[1], count)
+            vy = rng.uniform(velocity_range[0], velocity_range[1], count)
+        self.emit(x, y, vx, vy,
+                  rng.integers(life_range[0], life_range[1] + 1, count),
+                  self._random_colors(colors, count),
+                  rng.integers(size_range[0], size_range[1] + 1, count),
+                  shrink)
+    
+    def spawn_ambient(self, count, colors, velocity_range, size_range, life_range, glow_range=(0, 2 * math.pi)):
+        """Partículas decorativas repartidas por toda la pantalla (menús)"""
+        rng = self.rng
+        self.emit(rng.integers(0, WIDTH + 1, count),
+                  rng.integers(0, HEIGHT + 1, count),
+                  rng.uniform(velocity_range[0], velocity_range[1], count),
+                  rng.uniform(velocity_range[0], velocity_range[1], count),
+                  rng.integers(life_range[0], life_range[1] + 1, count),
+                  self._random_colors(colors, count),
+                  rng.integers(size_range[0], size_range[1] + 1, count),
+                  False,
+                  rng.uniform(glow_range[0], glow_range[1], count))
+    
+    def update(self, life_decay=1.0, glow_step=0.0, bounce=False, respawn=None):
+        """Integra todas las partículas vivas.
+        respawn=(life_range, velocity_range) recoloca las muertas en un punto
+        aleatorio de la pantalla en lugar de eliminarlas (velocity_range=None
+        conserva su velocidad)"""
+        n = self.count
+        if n == 0:
+            return
+        pos = self.pos[:n]
+        vel = self.vel[:n]
+        pos += vel
+        self.life[:n] -= life_decay
+        if glow_step:
+            self.glow[:n] += glow_step
+        if bounce:
+            # Rebotar en los bordes
+            vel[(pos[:, 0] < 0) | (pos[:, 0] > WIDTH), 0] *= -1
+            vel[(pos[:, 1] < 0) | (pos[:, 1] > HEIGHT), 1] *= -1
+        
+        dead = self.life[:n] <= 0
+        if not dead.any():
+            return
+        if respawn is not None:
+            self._respawn(np.flatnonzero(dead), *respawn)
+        else:
+            self._compact(dead)
+    
+    def _respawn(self, idx, life_range, velocity_range):
+        rng = self.rng
+        k = len(idx)
+        self.pos[idx, 0] = rng.integers(0, WIDTH + 1, k)
+        self.pos[idx, 1] = rng.integers(0, HEIGHT + 1, k)
+        self.life[idx] = rng.integers(life_range[0], life_range[1] + 1, k)
+        if velocity_range is not None:
+            self.vel[idx] = rng.uniform(velocity_range[0], velocity_range[1], (k, 2))
+    
+    def _compact(self, dead):
+        """Swap-remove vectorizado: los huecos de las muertas que quedan por
+        delante del nuevo final se rellenan con las vivas del final"""
+        n = self.count
+        alive_count = n - int(np.count_nonzero(dead))
+        holes = np.flatnonzero(dead[:alive_count])
+        tail = np.flatnonzero(~dead[alive_count:]) + alive_count
+        if len(holes):
+            for array in self._arrays():
+                array[holes] = array[tail]
+        self.count = alive_count
+    
+    def clear(self):
+        self.count = 0
+    
+    def _radii(self, pulse, fade_life):
+        n = self.count
+        life = self.life[:n]
+        size = self.size[:n]
+        pulsing = size * (1 + pulse * np.sin(self.glow[:n])) if pulse else size
+        fading = np.maximum(1, size * life / fade_life)
+        return np.where(self.shrink[:n], fading, pulsing).astype(np.int32)
+    
+    @classmethod
+    def _dot_sprite(cls, color, radius):
+        key = (color, radius)
+        sprite = cls._dot_cache.get(key)
+        if sprite is None:
+            sprite = pygame.Surface((radius * 2 + 1, radius * 2 + 1), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, unpack_color(color), (radius, radius), radius)
+            cls._dot_cache[key] = sprite
+        return sprite
+    
+    @classmethod
+    def _glow_sprite(cls, color, radius, alpha):
+        key = (color, radius, alpha)
+        sprite = cls._glow_cache.get(key)
+        if sprite is None:
+            sprite = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, (*unpack_color(color), alpha), (radius, radius), radius)
+            cls._glow_cache[key] = sprite
+        return sprite
+    
+    def draw(self, surface, pulse=0.0, fade_life=20):
+        """Dibuja todas las partículas con un único Surface.blits y devuelve
+        los rects modificados"""
+        if self.count == 0:
+            return []
+        n = self.count
+        radii = self._radii(pulse, fade_life)
+        xs = self.pos[:n, 0].astype(np.int32) - radii
+        ys = self.pos[:n, 1].astype(np.int32) - radii
+        sprite = self._dot_sprite
+        return surface.blits([(sprite(c, r), (x, y))
+                              for x, y, r, c in zip(xs.tolist(), ys.tolist(), radii.tolist(), self.color[:n].tolist())
+                              if r > 0])
+    
+    def draw_glow(self, surface, pad, max_alpha, life_norm, pulse=0.0):
+        """Halo translúcido alrededor de cada partícula; el alfa depende de la
+        vida restante y se redondea a 16 niveles para reutilizar sprites"""
+        if self.count == 0:
+            return
+        n = self.count
+        radii = self._radii(pulse, 20) + pad
+        alphas = np.clip(max_alpha * self.life[:n] / life_norm, 0, 255).astype(np.int32) & ~15
+        xs = self.pos[:n, 0].astype(np.int32) - radii
+        ys = self.pos[:n, 1].astype(np.int32) - radii
+        sprite = self._glow_sprite
+        surface.blits([(sprite(c, r, a), (x, y))
+                       for x, y, r, a, c in zip(xs.tolist(), ys.tolist(), radii.tolist(),
+                                                alphas.tolist(), self.color[:n].tolist())
+                       if r > 0], False)
 
-class Star:
-    def __init__(self):
-        self.x = random.randint(0, WIDTH)
-        self.y = random.randint(0, HEIGHT)
-        self.speed = random.uniform(0.5, 2)
-        self.size = random.randint(1, 2)
-        self.brightness = random.randint(150, 255)
+class SpatialHash:
+    """Rejilla uniforme para la fase amplia de colisiones. Cada sprite se
+    registra en todas las celdas que toca su rect, así que una consulta solo
+    compara con los sprites de las celdas cercanas."""
+    def __init__(self, cell_size=SPATIAL_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}
+    
+    def rebuild(self, sprites):
+        self.cells.clear()
+        for sprite in sprites:
+            self.insert(sprite)
+    
+    def insert(self, sprite):
+        rect = sprite.rect
+        cs = self.cell_size
+        cells = self.cells
+        for cx in range(rect.left // cs, (rect.right - 1) // cs + 1):
+            for cy in range(rect.top // cs, (rect.bottom - 1) // cs + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    cells[(cx, cy)] = [sprite]
+                else:
+                    bucket.append(sprite)
+    
+    def _candidates(self, left, top, right, bottom):
+        # Sprites vivos de las celdas del área, sin repetir
+        cs = self.cell_size
+        cells = self.cells
+        found = {}
+        for cx in range(left // cs, (right - 1) // cs + 1):
+            for cy in range(top // cs, (bottom - 1) // cs + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    for sprite in bucket:
+                        if sprite not in found and sprite.alive():
+                            found[sprite] = None
+        return found
+    
+    def query_rect(self, rect):
+        """Sprites cuyo rect se solapa con 'rect'"""
+        candidates = self._candidates(rect.left, rect.top, rect.right, rect.bottom)
+        return [sprite for sprite in candidates if sprite.rect.colliderect(rect)]
+
+def grid_spritecollide(sprite, group, dokill, grid=None):
+    """Igual que pygame.sprite.spritecollide, opcionalmente con rejilla"""
+    if grid is None:
+        return pygame.sprite.spritecollide(sprite, group, dokill)
+    hits = grid.query_rect(sprite.rect)
+    if dokill:
+        for other in hits:
+            other.kill()
+    return hits
+
+def sprites_in_blasts(group, blasts):
+    """Sprites de 'group' cuyo centro cae dentro de alguna explosión.
+    blasts es una lista de (x, y, radio) con todas las detonaciones del frame;
+    se evalúan las distancias al cuadrado de todos los pares en una sola
+    operación de NumPy. Devuelve los sprites en el orden del grupo."""
+    sprites = group.sprites()
+    if not blasts or not sprites:
+        return []
+    centers = np.array([sprite.rect.center for sprite in sprites], dtype=np.int64)
+    blast_array = np.array(blasts, dtype=np.int64)
+    dx = centers[np.newaxis, :, 0] - blast_array[:, np.newaxis, 0]
+    dy = centers[np.newaxis, :, 1] - blast_array[:, np.newaxis, 1]
+    radius_sq = blast_array[:, 2:3] ** 2
+    inside = (dx * dx + dy * dy <= radius_sq).any(axis=0)
+    return [sprite for sprite, hit in zip(sprites, inside.tolist()) if hit]
+
+class Starfield:
+    """Campo de estrellas guardado en arrays. Cada estrella cae a su propia
+    velocidad (capas de parallax) y se dibuja con un sprite prerenderizado
+    según su tamaño y brillo, todas en un único Surface.blits."""
+    _sprite_cache = {}
+    
+    def __init__(self, count, seed=None):
+        self.rng = np.random.default_rng(seed)
+        rng = self.rng
+        self.x = rng.integers(0, WIDTH + 1, count).astype(np.float32)
+        self.y = rng.integers(0, HEIGHT + 1, count).astype(np.float32)
+        self.speed = rng.uniform(0.5, 2, count).astype(np.float32)
+        self.size = rng.integers(1, 3, count)
+        self.brightness = rng.integers(150, 256, count)
+        self.sprites = [self._star_sprite(size, brightness)
+                        for size, brightness in zip(self.size.tolist(), self.brightness.tolist())]
+    
+    @classmethod
+    def _star_sprite(cls, size, brightness):
+        key = (size, brightness)
+        sprite = cls._sprite_cache.get(key)
+        if sprite is None:
+            sprite = pygame.Surface((size * 2 + 1, size * 2 + 1), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, (brightness, brightness, brightness), (size, size), size)
+            cls._sprite_cache[key] = sprite
+        return sprite
     
     def update(self, player_speed):
         self.y += self.speed + player_speed * 0.1
-        if self.y > HEIGHT:
-            self.y = 0
-            self.x = random.randint(0, WIDTH)
+        wrapped = self.y > HEIGHT
+        count = int(np.count_nonzero(wrapped))
+        if count:
+            self.y[wrapped] = 0
+            self.x[wrapped] = self.rng.integers(0, WIDTH + 1, count)
     
     def draw(self, surface):
-        color = (self.brightness, self.brightness, self.brightness)
-        pygame.draw.circle(surface, color, (int(self.x), int(self.y)), self.size)
+        """Dibuja todas las estrellas y devuelve los rects modificados"""
+        xs = (self.x.astype(np.int32) - self.size).tolist()
+        ys = (self.y.astype(np.int32) - self.size).tolist()
+        return surface.blits(list(zip(self.sprites, zip(xs, ys))))
 
-def show_splash_screen():
-    """Pantalla de carga arcade ultra mejorada con efectos visuales épicos"""
-    clock_splash = pygame.time.Clock()
-    splash_duration = 4000  # 4 segundos para disfrutar los efectos
-    start_time = pygame.time.get_ticks()
+class TextCache:
+    """Caché LRU de textos renderizados. Un texto solo se vuelve a rasterizar
+    cuando cambia su cadena (o su fuente/color)."""
+    def __init__(self, max_entries=HUD_TEXT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
     
-    # Crear estrellas para el fondo (más estrellas)
-    splash_stars = [Star() for _ in range(200)]
-    
-    # Partículas arcade mejoradas
-    splash_particles = []
-    for _ in range(50):
-        splash_particles.append({
-            'x': random.randint(0, WIDTH),
-            'y': random.randint(0, HEIGHT),
-            'vx': random.uniform(-3, 3),
-            'vy': random.uniform(-3, 3),
-            'size': random.randint(3, 8),
-            'color': random.choice([CYAN, YELLOW, GREEN, PURPLE, ORANGE, RED]),
-            'life': random.randint(40, 80),
-            'glow': random.uniform(0.5, 1.5)
-        })
-    
-    # Partículas de energía que orbitan
-    energy_particles = []
-    for _ in range(20):
-        angle = random.uniform(0, 2 * math.pi)
-        energy_particles.append({
-            'angle': angle,
-            'radius': random.uniform(100, 200),
-            'speed': random.uniform(0.02, 0.05),
-            'size': random.randint(2, 4),
-            'color': random.choice([CYAN, YELLOW])
-        })
-    
-    # Efectos de scanlines (líneas de escaneo retro)
-    scanline_offset = 0
+    def render(self, font, text, color):
+        key = (font, text, color)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = font.render(text, True, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+        return surface
+
+class GlyphAtlas:
+    """Glifos prerenderizados para campos numéricos que cambian casi cada
+    frame (puntuación, progreso de la onda): el texto se compone con blits"""
+    def __init__(self, font, color, chars="0123456789"):
+        self.glyphs = {char: font.render(char, True, color) for char in chars}
     
-    # Intentar cargar imagen de fondo
-    background_image = None
-    try:
-        bg_path = os.path.join(BASE_DIR, "images", "astrominer.png")
-        if os.path.exists(bg_path):
-            bg_img = pygame.image.load(bg_path)
-            background_image = pygame.transform.scale(bg_img, (WIDTH, HEIGHT))
-    except:
-        pass
+    def width(self, text):
+        return sum(self.glyphs[char].get_width() for char in text)
     
-    running = True
-    while running:
-        current_time = pygame.time.get_ticks()
-        elapsed = current_time - start_time
-        
-        if elapsed >= splash_duration:
-            running = False
-            break
-        
-        clock_splash.tick(60)
+    def draw(self, surface, text, pos):
+        x, y = pos
+        blits = []
+        for char in text:
+            glyph = self.glyphs[char]
+            blits.append((glyph, (x, y)))
+            x += glyph.get_width()
+        return surface.blits(blits)
+
+class Hud:
+    """HUD de la partida. Las etiquetas se sacan de una caché de textos y la
+    puntuación y el progreso de la onda se componen con atlas de glifos."""
+    WEAPON_NAMES = {"rapid": "RAPIDO", "spread": "DISPERSION", "laser": "LASER"}
+    
+    def __init__(self, use_glyph_atlas=HUD_GLYPH_ATLAS):
+        self.text_cache = TextCache()
+        self.use_glyph_atlas = use_glyph_atlas
+        if use_glyph_atlas:
+            self.score_atlas = GlyphAtlas(font, WHITE)
+            self.progress_atlas = GlyphAtlas(tiny_font, WHITE, "0123456789/")
+    
+    def text(self, text_font, text, color):
+        return self.text_cache.render(text_font, text, color)
+    
+    def draw(self, surface, player, score, wave, enemies_killed_this_wave, enemies_per_wave,
+             combo, wave_message_timer=0, show_controls=False):
+        """Dibuja el HUD y devuelve la lista de rects modificados"""
+        text = self.text
+        rects = []
         
-        for event in pygame.event.get():
-            if event.type == QUIT:
-                pygame.quit()
-                exit()
-            if event.type == KEYDOWN or event.type == MOUSEBUTTONDOWN:
-                running = False
-                break
+        # UI
+        rects.append(surface.blit(text(font, f"Vidas: {player.lives}", WHITE), (10, 50)))
+        if self.use_glyph_atlas:
+            score_label = text(font, "Puntuacion: ", WHITE)
+            rects.append(surface.blit(score_label, (10, 10)))
+            rects.extend(self.score_atlas.draw(surface, str(score), (10 + score_label.get_width(), 10)))
+        else:
+            rects.append(surface.blit(text(font, f"Puntuacion: {score}", WHITE), (10, 10)))
         
-        # Actualizar estrellas (más rápido)
-        for star in splash_stars:
-            star.update(3)
-        
-        # Actualizar partículas arcade
-        for particle in splash_particles[:]:
-            particle['x'] += particle['vx']
-            particle['y'] += particle['vy']
-            particle['life'] -= 1
-            particle['glow'] += 0.1
-            if particle['life'] <= 0:
-                particle['x'] = random.randint(0, WIDTH)
-                particle['y'] = random.randint(0, HEIGHT)
-                particle['life'] = random.randint(40, 80)
-                particle['vx'] = random.uniform(-3, 3)
-                particle['vy'] = random.uniform(-3, 3)
-        
-        # Actualizar partículas de energía orbitales
-        center_x, center_y = WIDTH // 2, HEIGHT // 2
-        for particle in energy_particles:
-            particle['angle'] += particle['speed']
-            particle['radius'] += math.sin(elapsed / 500) * 0.5
+        # Wave indicator
+        wave_text = text(small_font, f"ONDA {wave}", CYAN)
+        rects.append(surface.blit(wave_text, (WIDTH - wave_text.get_width() - 10, 10)))
+        progress = f"{enemies_killed_this_wave}/{enemies_per_wave}"
+        if self.use_glyph_atlas:
+            rects.extend(self.progress_atlas.draw(surface, progress, (WIDTH - self.progress_atlas.width(progress) - 10, 40)))
+        else:
+            progress_text = text(tiny_font, progress, WHITE)
+            rects.append(surface.blit(progress_text, (WIDTH - progress_text.get_width() - 10, 40)))
         
-        # Actualizar scanlines
-        scanline_offset = (scanline_offset + 2) % 4
+        # Wave complete message
+        if wave_message_timer > 0:
+            wave_complete_text = text(font, f"ONDA {wave - 1} COMPLETADA!", YELLOW)
+            text_rect = wave_complete_text.get_rect(center=(WIDTH // 2, HEIGHT // 2))
+            rects.append(surface.blit(wave_complete_text, text_rect))
         
-        # Dibujar fondo
-        screen.fill(BLACK)
+        # Combo indicator
+        if combo > 1:
+            combo_text = text(small_font, f"COMBO x{combo}!", YELLOW)
+            rects.append(surface.blit(combo_text, (WIDTH // 2 - combo_text.get_width() // 2, 50)))
         
-        # Dibujar imagen de fondo si existe (con efecto de pulso)
-        if background_image:
-            pulse = 0.3 + 0.2 * math.sin(elapsed / 300)
-            alpha = int(40 * pulse)
-            bg_surface = background_image.copy()
-            bg_surface.set_alpha(alpha)
-            # Efecto de zoom sutil
-            zoom = 1.0 + 0.05 * math.sin(elapsed / 400)
-            zoomed = pygame.transform.scale(bg_surface, 
-                                          (int(WIDTH * zoom), int(HEIGHT * zoom)))
-            offset_x = (zoomed.get_width() - WIDTH) // 2
-            offset_y = (zoomed.get_height() - HEIGHT) // 2
-            screen.blit(zoomed, (-offset_x, -offset_y))
-        
-        # Dibujar estrellas con efecto de movimiento
-        for star in splash_stars:
-            star.draw(screen)
-        
-        # Dibujar partículas arcade con efecto de brillo
-        for particle in splash_particles:
-            if particle['life'] > 0:
-                size = int(particle['size'] * (1 + 0.3 * math.sin(particle['glow'])))
-                glow_size = size + 2
-                # Brillo exterior
-                glow_surface = pygame.Surface((glow_size * 2, glow_size * 2), pygame.SRCALPHA)
-                glow_alpha = int(100 * (particle['life'] / 80))
-                glow_color = (*particle['color'], glow_alpha)
-                pygame.draw.circle(glow_surface, glow_color, (glow_size, glow_size), glow_size)
-                screen.blit(glow_surface, (int(particle['x']) - glow_size, int(particle['y']) - glow_size))
-                # Partícula principal
-                pygame.draw.circle(screen, particle['color'], 
-                                 (int(particle['x']), int(particle['y'])), size)
-        
-        # Dibujar partículas de energía orbitales
-        for particle in energy_particles:
-            x = center_x + particle['radius'] * math.cos(particle['angle'])
-            y = center_y + particle['radius'] * math.sin(particle['angle'])
-            size = particle['size'] + int(2 * math.sin(elapsed / 200 + particle['angle']))
-            # Brillo
-            glow_surface = pygame.Surface((size * 3, size * 3), pygame.SRCALPHA)
-            pygame.draw.circle(glow_surface, (*particle['color'], 100), 
-                             (size * 1.5, size * 1.5), size * 1.5)
-            screen.blit(glow_surface, (int(x) - size * 1.5, int(y) - size * 1.5))
-            pygame.draw.circle(screen, particle['color'], (int(x), int(y)), size)
+        # Indicadores de power-ups
+        y_offset = 100
+        if player.shield_active:
+            rects.append(surface.blit(text(tiny_font, f"ESCUDO: {player.shield_time // 60}s", CYAN), (10, y_offset)))
+            y_offset += 20
         
-        # Efecto de parpadeo arcade mejorado
-        blink = int(255 * (0.8 + 0.2 * math.sin(elapsed / 100)))
-        blink_fast = int(255 * (0.7 + 0.3 * math.sin(elapsed / 50)))
+        if player.speed_boost_active:
+            rects.append(surface.blit(text(tiny_font, f"VELOCIDAD: {player.speed_boost_time // 60}s", GREEN), (10, y_offset)))
+            y_offset += 20
         
-        # Título principal "SPACE SHOOTERS" con efectos épicos
-        title_text = "SPACE SHOOTERS"
-        title_y = HEIGHT // 3
+        if player.weapon_type != "normal":
+            weapon_name = self.WEAPON_NAMES[player.weapon_type]
+            rects.append(surface.blit(text(tiny_font, f"ARMA: {weapon_name} ({player.weapon_time // 60}s)", YELLOW), (10, y_offset)))
+            y_offset += 20
         
-        # Efecto de distorsión/ondulación en el texto
-        wave_offset = int(5 * math.sin(elapsed / 200))
+        if player.missiles_available > 0:
+            rects.append(surface.blit(text(tiny_font, f"MISILES: {player.missiles_available} (M)", ORANGE), (10, y_offset)))
         
-        # Múltiples capas de sombra para profundidad
-        for layer in range(5, 0, -1):
-            shadow_alpha = 50 + layer * 10
-            shadow_color = (0, 0, 0, shadow_alpha)
+        # Instrucciones
+        if show_controls:
+            controls_text = text(tiny_font, "ESPACIO: Disparar | M: Misil", WHITE)
+            rects.append(surface.blit(controls_text, (WIDTH - controls_text.get_width() - 10, HEIGHT - 40)))
+        return rects
+
+class ScanlineOverlay:
+    """Post-proceso retro: scanlines (una línea de cada cuatro, con cuatro
+    fases para animarlas) y viñeta opcional en los bordes. Cada fase se
+    construye una sola vez con NumPy como una única superficie con el alpha
+    de ambos efectos combinado, compartida por todas las pantallas que usan
+    los mismos parámetros; aplicarla es un solo blit."""
+    PHASES = 4
+    _cache = {}
+    
+    def __init__(self, line_alpha=30, vignette_alpha=0, size=(WIDTH, HEIGHT)):
+        self.line_alpha = line_alpha
+        self.vignette_alpha = vignette_alpha
+        self.size = size
+    
+    def _vignette(self):
+        # Oscurecimiento proporcional a la distancia al centro, en bloques de 2x2
+        width, height = self.size
+        center_x, center_y = width // 2, height // 2
+        max_dist = math.sqrt(center_x ** 2 + center_y ** 2)
+        xs = (np.arange(width) & ~1) - center_x
+        ys = (np.arange(height) & ~1) - center_y
+        dist = np.sqrt(xs[:, np.newaxis] ** 2 + ys[np.newaxis, :] ** 2)
+        return (self.vignette_alpha * (dist / max_dist)).astype(np.int32)
+    
+    def frame(self, phase):
+        phase %= self.PHASES
+        key = (self.line_alpha, self.vignette_alpha, self.size, phase)
+        overlay = self._cache.get(key)
+        if overlay is None:
+            width, height = self.size
+            alpha = np.zeros((width, height), dtype=np.int32)
+            alpha[:, phase::self.PHASES] = self.line_alpha
+            if self.vignette_alpha:
+                vignette = self._vignette()
+                # Dos capas negras superpuestas: 1 - (1 - a) * (1 - b)
+                alpha = 255 - ((255 - alpha) * (255 - vignette) + 127) // 255
+            overlay = pygame.Surface(self.size, pygame.SRCALPHA)
+            overlay.fill((0, 0, 0, 0))
+            pixels = pygame.surfarray.pixels_alpha(overlay)
+            pixels[:] = alpha
+            del pixels
+            self._cache[key] = overlay
+        return overlay
+    
+    def apply(self, surface, phase=0):
+        """Dibuja la capa sobre 'surface' y devuelve el área modificada"""
+        return surface.blit(self.frame(phase), (0, 0))
+
+class ArcadeTitle:
+    """Título arcade: sombra en capas, brillo exterior, texto de color y
+    brillo interior blanco. La sombra (cientos de blits de texto) se compone
+    una sola vez y se comparte; el texto se renderiza una vez en blanco y los
+    colores de cada frame se obtienen tiñendo esa superficie."""
+    _shadow_cache = {}
+    
+    def __init__(self, font, text, shadow_layers, shadow_alpha, shadow_alpha_step):
+        self.white = font.render(text, True, WHITE)
+        self.inner = self.white.copy()
+        self.x = WIDTH // 2 - self.white.get_width() // 2
+        self.layers = shadow_layers
+        key = (font, text, shadow_layers, shadow_alpha, shadow_alpha_step)
+        self.shadow = self._shadow_cache.get(key)
+        if self.shadow is None:
+            self.shadow = self._build_shadow(font, text, shadow_layers, shadow_alpha, shadow_alpha_step)
+            self._shadow_cache[key] = self.shadow
+        self._tinted = OrderedDict()
+    
+    @staticmethod
+    def _build_shadow(font, text, layers, alpha, alpha_step):
+        shadow_text = font.render(text, True, BLACK)
+        width, height = shadow_text.get_size()
+        shadow = pygame.Surface((width + layers * 2, height + layers * 2), pygame.SRCALPHA)
+        shadow.fill((0, 0, 0, 0))
+        for layer in range(layers, 0, -1):
+            shadow_text.set_alpha(alpha + layer * alpha_step)
             for offset_x in range(-layer, layer + 1):
                 for offset_y in range(-layer, layer + 1):
                     if offset_x != 0 or offset_y != 0:
-                        shadow = arcade_font_large.render(title_text, True, (0, 0, 0))
-                        shadow_surface = pygame.Surface(shadow.get_size(), pygame.SRCALPHA)
-                        shadow_surface.set_alpha(shadow_alpha)
-                        shadow_surface.blit(shadow, (0, 0))
-                        screen.blit(shadow_surface, 
-                                  (WIDTH // 2 - shadow.get_width() // 2 + offset_x, 
-                                   title_y + offset_y + wave_offset))
-        
-        # Capa exterior con múltiples colores neón
-        colors = [
-            (blink, 0, 255),      # Magenta
-            (0, blink, 255),      # Cyan
-            (blink, blink, 255),   # Azul brillante
-        ]
-        color_index = int((elapsed / 200) % len(colors))
-        outer_color = colors[color_index]
-        
-        # Brillo exterior pulsante
-        for i in range(3):
-            glow_alpha = int((100 - i * 30) * (0.5 + 0.5 * math.sin(elapsed / 150)))
-            outer_glow = arcade_font_large.render(title_text, True, outer_color)
-            glow_surface = pygame.Surface(outer_glow.get_size(), pygame.SRCALPHA)
-            glow_surface.set_alpha(glow_alpha)
-            glow_surface.blit(outer_glow, (0, 0))
-            offset = i * 2
-            screen.blit(glow_surface, 
-                      (WIDTH // 2 - outer_glow.get_width() // 2 - offset, 
-                       title_y - offset + wave_offset))
-        
-        # Capa principal con efecto de arcoíris
-        hue = (elapsed / 50) % 360
-        r = int(255 * (0.5 + 0.5 * math.sin(math.radians(hue))))
-        g = int(255 * (0.5 + 0.5 * math.sin(math.radians(hue + 120))))
-        b = int(255 * (0.5 + 0.5 * math.sin(math.radians(hue + 240))))
-        neon_color = (r, g, b)
-        
-        main_text = arcade_font_large.render(title_text, True, neon_color)
-        screen.blit(main_text, (WIDTH // 2 - main_text.get_width() // 2, 
-                               title_y + wave_offset))
-        
-        # Capa interior con brillo intenso
-        inner_glow = arcade_font_large.render(title_text, True, (255, 255, 255))
-        inner_surface = pygame.Surface(inner_glow.get_size(), pygame.SRCALPHA)
-        inner_alpha = int(blink_fast * 0.6)
-        inner_surface.set_alpha(inner_alpha)
-        inner_surface.blit(inner_glow, (0, 0))
-        screen.blit(inner_surface, (WIDTH // 2 - main_text.get_width() // 2, 
-                                   title_y + wave_offset))
-        
-        # Efecto de "carga" animado mejorado
-        loading_text = "CARGANDO"
-        dots = "." * (int(elapsed / 250) % 4)
-        loading_full = loading_text + dots
-        
-        # Sombra múltiple para texto de carga
-        for i in range(3):
-            shadow_alpha = 100 - i * 30
-            loading_shadow = small_font.render(loading_full, True, (0, 0, 0))
-            shadow_surf = pygame.Surface(loading_shadow.get_size(), pygame.SRCALPHA)
-            shadow_surf.set_alpha(shadow_alpha)
-            shadow_surf.blit(loading_shadow, (0, 0))
-            screen.blit(shadow_surf, 
-                      (WIDTH // 2 - loading_shadow.get_width() // 2 + i, 
-                       HEIGHT // 2 + 100 + i))
-        
-        # Texto de carga con efecto neón
-        loading_alpha = int(150 + 105 * math.sin(elapsed / 150))
-        loading_alpha = max(0, min(255, loading_alpha))  # Asegurar que esté entre 0 y 255
-        loading_color = (0, loading_alpha, 255)
-        loading_surface = small_font.render(loading_full, True, loading_color)
-        screen.blit(loading_surface, (WIDTH // 2 - loading_surface.get_width() // 2, 
-                                     HEIGHT // 2 + 100))
-        
-        # Barra de carga mejorada con efectos
-        bar_width = 400
-        bar_height = 30
-        bar_x = WIDTH // 2 - bar_width // 2
-        bar_y = HEIGHT // 2 + 150
-        
+                        shadow.blit(shadow_text, (layers + offset_x, layers + offset_y))
+        return shadow
+    
+    def tinted(self, color):
+        """Texto en 'color' (se guardan los últimos colores usados)"""
+        surface = self._tinted.get(color)
+        if surface is None:
+            surface = self.white.copy()
+            surface.fill(color, special_flags=pygame.BLEND_RGB_MULT)
+            self._tinted[color] = surface
+            if len(self._tinted) > 8:
+                self._tinted.popitem(last=False)
+        else:
+            self._tinted.move_to_end(color)
+        return surface
+    
+    def draw_shadow(self, surface, y):
+        surface.blit(self.shadow, (self.x - self.layers, y - self.layers))
+    
+    def draw_glow(self, surface, y, color, alphas):
+        """Una capa de brillo por alpha, desplazadas 2 px hacia arriba a la izquierda"""
+        glow = self.tinted(color)
+        for i, alpha in enumerate(alphas):
+            glow.set_alpha(alpha)
+            surface.blit(glow, (self.x - i * 2, y - i * 2))
+        glow.set_alpha(255)
+    
+    def draw_text(self, surface, y, color, inner_alpha):
+        surface.blit(self.tinted(color), (self.x, y))
+        self.inner.set_alpha(inner_alpha)
+        surface.blit(self.inner, (self.x, y))
+
+class OrbitParticles:
+    """Partículas de energía que orbitan alrededor de un punto, guardadas en
+    arrays; el brillo y el núcleo de cada tamaño y color se prerenderizan"""
+    _sprite_cache = {}
+    
+    def __init__(self, count, radius_range, speed_range, colors=(CYAN, YELLOW), glow_alpha=100):
+        rng = np.random.default_rng()
+        self.angle = rng.uniform(0, 2 * math.pi, count)
+        self.radius = rng.uniform(radius_range[0], radius_range[1], count)
+        self.speed = rng.uniform(speed_range[0], speed_range[1], count)
+        self.size = rng.integers(2, 5, count)
+        self.colors = list(colors)
+        self.color = rng.integers(0, len(self.colors), count)
+        self.glow_alpha = glow_alpha
+    
+    def update(self, phase, amount, by_angle=False):
+        """Avanza las órbitas; el radio oscila con sin(phase) (más el ángulo de
+        cada partícula si by_angle) multiplicado por amount"""
+        self.angle += self.speed
+        if by_angle:
+            self.radius += np.sin(phase + self.angle) * amount
+        else:
+            self.radius += math.sin(phase) * amount
+    
+    def _sprites(self, size, color):
+        key = (size, color, self.glow_alpha)
+        sprites = self._sprite_cache.get(key)
+        if sprites is None:
+            glow = pygame.Surface((size * 3, size * 3), pygame.SRCALPHA)
+            pygame.draw.circle(glow, (*color, self.glow_alpha), (size * 1.5, size * 1.5), size * 1.5)
+            core = pygame.Surface((size * 2 + 1, size * 2 + 1), pygame.SRCALPHA)
+            pygame.draw.circle(core, color, (size, size), size)
+            sprites = (glow, core)
+            self._sprite_cache[key] = sprites
+        return sprites
+    
+    def draw(self, surface, center, size_phase):
+        """Dibuja las partículas; su tamaño late con sin(size_phase + ángulo)"""
+        xs = (center[0] + self.radius * np.cos(self.angle)).astype(np.int32).tolist()
+        ys = (center[1] + self.radius * np.sin(self.angle)).astype(np.int32).tolist()
+        sizes = (self.size + (2 * np.sin(size_phase + self.angle)).astype(np.int32)).tolist()
+        blits = []
+        for x, y, size, color in zip(xs, ys, sizes, self.color.tolist()):
+            if size <= 0:
+                continue
+            glow, core = self._sprites(size, self.colors[color])
+            blits.append((glow, (x - size * 1.5, y - size * 1.5)))
+            blits.append((core, (x - size, y - size)))
+        surface.blits(blits, doreturn=False)
+
+class ZoomingBackground:
+    """Imagen de fondo tenue con zoom pulsante. Cada nivel de zoom se escala
+    una sola vez (BACKGROUND_ZOOM_FRAMES niveles entre 0.95 y 1.05), recortado
+    al tamaño de la pantalla, y los niveles se comparten entre pantallas."""
+    _frames = {}
+    
+    def __init__(self, path):
+        self.path = path
+        self.image = None
+        self.missing = not os.path.exists(path)
+        self.load()
+    
+    def load(self):
+        """Toma la imagen en cuanto está decodificada (sin esperar al cargador)"""
+        if self.missing or not assets.is_ready(self.path):
+            return
+        try:
+            self.image = assets.get_image(self.path, (WIDTH, HEIGHT), "opaque")
+        except:
+            self.missing = True
+    
+    def frame(self, level):
+        key = (self.path, level)
+        frame = self._frames.get(key)
+        if frame is None:
+            zoom = 0.95 + 0.1 * level / (BACKGROUND_ZOOM_FRAMES - 1)
+            zoomed = pygame.transform.scale(self.image, (int(WIDTH * zoom), int(HEIGHT * zoom)))
+            offset_x = (zoomed.get_width() - WIDTH) // 2
+            offset_y = (zoomed.get_height() - HEIGHT) // 2
+            if offset_x > 0 and offset_y > 0:
+                # Solo se guarda la parte visible
+                zoomed = zoomed.subsurface((offset_x, offset_y, WIDTH, HEIGHT)).copy()
+                offset_x = offset_y = 0
+            frame = (zoomed, (-offset_x, -offset_y))
+            self._frames[key] = frame
+        return frame
+    
+    def draw(self, surface, elapsed):
+        if self.image is None:
+            self.load()
+            if self.image is None:
+                return
+        # Pulso de transparencia y zoom sutil
+        pulse = 0.3 + 0.2 * math.sin(elapsed / 300)
+        zoom = 1.0 + 0.05 * math.sin(elapsed / 400)
+        level = round((zoom - 0.95) / 0.1 * (BACKGROUND_ZOOM_FRAMES - 1))
+        image, position = self.frame(level)
+        image.set_alpha(int(40 * pulse))
+        surface.blit(image, position)
+
+class LoadingBar:
+    """Barra de carga con degradado arcoíris animado y un brillo deslizante.
+    El degradado es una tira precalculada de la que se copia la ventana
+    visible cada frame, y el brillo es una única superficie"""
+    def __init__(self, width=400, height=30):
+        self.width = width
+        self.height = height
+        hues = np.radians(np.arange(360 + width))
+        columns = np.stack([np.sin(hues), np.sin(hues + math.radians(120)), np.sin(hues + math.radians(240))], axis=1)
+        colors = (255 * (0.5 + 0.5 * columns)).astype(np.uint8)
+        self.gradient = pygame.surfarray.make_surface(np.repeat(colors[:, np.newaxis, :], height, axis=1))
+        self.glow_width = 40
+        self.glow = pygame.Surface((self.glow_width, height), pygame.SRCALPHA)
+        for i in range(self.glow_width):
+            alpha = int(255 * (1 - i / self.glow_width))
+            self.glow.fill((255, 255, 255, alpha), (self.glow_width - 1 - i, 0, 1, height))
+    
+    def draw(self, surface, x, y, progress, elapsed):
+        width, height = self.width, self.height
         # Fondo de la barra con borde neón
-        pygame.draw.rect(screen, (20, 20, 20), (bar_x - 2, bar_y - 2, bar_width + 4, bar_height + 4))
-        pygame.draw.rect(screen, (50, 50, 50), (bar_x, bar_y, bar_width, bar_height))
+        pygame.draw.rect(surface, (20, 20, 20), (x - 2, y - 2, width + 4, height + 4))
+        pygame.draw.rect(surface, (50, 50, 50), (x, y, width, height))
         # Borde neón pulsante
         border_glow = int(100 + 155 * math.sin(elapsed / 100))
-        border_glow = max(0, min(255, border_glow))  # Asegurar que esté entre 0 y 255
-        pygame.draw.rect(screen, (0, border_glow, 255), (bar_x, bar_y, bar_width, bar_height), 3)
-        
-        # Barra de progreso con múltiples efectos
-        progress = min(elapsed / splash_duration, 1.0)
-        progress_width = int(bar_width * progress)
+        border_glow = max(0, min(255, border_glow))
+        pygame.draw.rect(surface, (0, border_glow, 255), (x, y, width, height), 3)
         
         # Gradiente animado en la barra
-        for i in range(progress_width):
-            hue_offset = (i + elapsed / 10) % 360
-            r = int(255 * (0.5 + 0.5 * math.sin(math.radians(hue_offset))))
-            g = int(255 * (0.5 + 0.5 * math.sin(math.radians(hue_offset + 120))))
-            b = int(255 * (0.5 + 0.5 * math.sin(math.radians(hue_offset + 240))))
-            color = (r, g, b)
-            pygame.draw.line(screen, color, 
-                           (bar_x + i, bar_y), 
-                           (bar_x + i, bar_y + bar_height))
+        progress_width = int(width * progress)
+        if progress_width <= 0:
+            return
+        shift = int(elapsed / 10) % 360
+        surface.blit(self.gradient, (x, y), (shift, 0, progress_width, height))
         
         # Brillo deslizante en la barra
-        if progress_width > 0:
-            glow_pos = int(progress_width - 30 + 30 * math.sin(elapsed / 100))
-            glow_pos = max(0, min(progress_width, glow_pos))
-            glow_width = 40
-            for i in range(glow_width):
-                if glow_pos - i >= 0:
-                    alpha = int(255 * (1 - i / glow_width))
-                    glow_surface = pygame.Surface((1, bar_height), pygame.SRCALPHA)
-                    glow_surface.fill((255, 255, 255, alpha))
-                    screen.blit(glow_surface, (bar_x + glow_pos - i, bar_y))
-        
-        # Efectos de líneas arcade mejorados en los bordes
-        line_thickness = 4
-        line_length = 80
-        line_speed = elapsed / 8
-        
-        # Líneas superiores e inferiores con efecto de brillo
-        for i in range(0, WIDTH, 120):
-            x = (i + line_speed) % (WIDTH + line_length) - line_length
-            line_alpha = int(150 + 105 * math.sin((elapsed + i) / 200))
-            line_color = (0, line_alpha, 255)
-            pygame.draw.line(screen, line_color, (x, 0), (x + line_length, 0), line_thickness)
-            pygame.draw.line(screen, line_color, (x, HEIGHT - 1), (x + line_length, HEIGHT - 1), line_thickness)
+        glow_pos = int(progress_width - 30 + 30 * math.sin(elapsed / 100))
+        glow_pos = max(0, min(progress_width, glow_pos))
+        first = max(0, self.glow_width - 1 - glow_pos)
+        surface.blit(self.glow, (x + glow_pos - (self.glow_width - 1) + first, y),
+                     (first, 0, self.glow_width - first, height))
+
+class ArcadeBackground:
+    """Motor de los fondos animados de las pantallas de carga, menú y Game
+    Over: imagen con zoom (opcional), capa de estrellas compartida entre
+    pantallas, partículas ambientales en arrays y partículas orbitales
+    (opcionales; cada pantalla las dibuja con draw_orbits donde le toque).
+    Cada pantalla lo configura con un diccionario como SPLASH_BACKGROUND."""
+    _starfields = {}
+    
+    def __init__(self, stars=200, star_speed=2, particles=0, particle_colors=(), particle_velocity=(-3, 3),
+                 particle_size=(2, 5), particle_life=(40, 80), particle_glow=(0, 2 * math.pi),
+                 particle_update=None, particle_draw=None, orbits=0, orbit_radius=(100, 200),
+                 orbit_speed=(0.02, 0.05), orbit_glow_alpha=100, orbit_wobble=(500, 0.5, False),
+                 orbit_pulse=200, image=False):
+        # Las estrellas siguen moviéndose de una pantalla a otra
+        self.stars = self._starfields.get(stars)
+        if self.stars is None:
+            self.stars = Starfield(stars)
+            self._starfields[stars] = self.stars
+        self.star_speed = star_speed
+        self.particles = ParticleSystem(max(particles, 1))
+        if particles:
+            self.particles.spawn_ambient(particles, list(particle_colors), velocity_range=particle_velocity,
+                                         size_range=particle_size, life_range=particle_life,
+                                         glow_range=particle_glow)
+        self.particle_update = particle_update or {}
+        self.particle_draw = particle_draw or {"pad": 2, "max_alpha": 100, "life_norm": 80, "pulse": 0.3}
+        self.orbits = OrbitParticles(orbits, orbit_radius, orbit_speed, glow_alpha=orbit_glow_alpha) if orbits else None
+        self.orbit_wobble = orbit_wobble
+        self.orbit_pulse = orbit_pulse
+        self.background = ZoomingBackground(BACKGROUND_IMAGE_PATH) if image else None
+    
+    def update(self, time=0):
+        """Avanza un frame; time es el reloj de la pantalla (ms o frames, el
+        mismo que usan los periodos de orbit_wobble y orbit_pulse)"""
+        self.stars.update(self.star_speed)
+        self.particles.update(**self.particle_update)
+        if self.orbits is not None:
+            period, amount, by_angle = self.orbit_wobble
+            self.orbits.update(time / period, amount, by_angle)
+    
+    def draw(self, surface, elapsed=0):
+        """Fondo, estrellas y partículas ambientales (elapsed en ms, para el zoom)"""
+        surface.fill(BLACK)
+        if self.background is not None:
+            self.background.draw(surface, elapsed)
+        self.stars.draw(surface)
+        style = self.particle_draw
+        self.particles.draw_glow(surface, pad=style["pad"], max_alpha=style["max_alpha"],
+                                 life_norm=style["life_norm"], pulse=style["pulse"])
+        self.particles.draw(surface, pulse=style["pulse"])
+    
+    def draw_orbits(self, surface, center, time=0):
+        if self.orbits is not None:
+            self.orbits.draw(surface, center, time / self.orbit_pulse)
+
+# Parámetros de los fondos animados (ver ArcadeBackground)
+SPLASH_BACKGROUND = {
+    "stars": 200, "star_speed": 3,
+    "particles": 50, "particle_colors": (CYAN, YELLOW, GREEN, PURPLE, ORANGE, RED),
+    "particle_velocity": (-3, 3), "particle_size": (3, 8), "particle_life": (40, 80),
+    "particle_glow": (0.5, 1.5), "particle_update": {"glow_step": 0.1, "respawn": ((40, 80), (-3, 3))},
+    "particle_draw": {"pad": 2, "max_alpha": 100, "life_norm": 80, "pulse": 0.3},
+    "orbits": 20, "orbit_radius": (100, 200), "orbit_speed": (0.02, 0.05), "orbit_glow_alpha": 100,
+    "orbit_wobble": (500, 0.5, False), "orbit_pulse": 200,
+    "image": True
+}
+MENU_BACKGROUND = {
+    "stars": 150, "star_speed": 2,
+    "particles": 40, "particle_colors": (CYAN, YELLOW, GREEN, PURPLE, ORANGE),
+    "particle_velocity": (-1.5, 1.5), "particle_size": (2, 5), "particle_life": (50, 100),
+    # Rebotan en los bordes y reaparecen conservando su velocidad
+    "particle_update": {"life_decay": 0.5, "glow_step": 0.05, "bounce": True, "respawn": ((50, 100), None)},
+    "particle_draw": {"pad": 3, "max_alpha": 80, "life_norm": 100, "pulse": 0.2},
+    "orbits": 15, "orbit_radius": (80, 120), "orbit_speed": (0.01, 0.03), "orbit_glow_alpha": 120,
+    # El menú cuenta el tiempo en frames, no en milisegundos
+    "orbit_wobble": (100, 0.3, True), "orbit_pulse": 30
+}
+GAME_OVER_BACKGROUND = {
+    "stars": 200, "star_speed": 2,
+    "particles": 100, "particle_colors": (RED, ORANGE, YELLOW),
+    "particle_velocity": (-5, 5), "particle_size": (2, 6), "particle_life": (30, 60),
+    "particle_update": {"glow_step": 0.1, "respawn": ((30, 60), (-5, 5))},
+    "particle_draw": {"pad": 2, "max_alpha": 150, "life_norm": 60, "pulse": 0.3}
+}
+
+class DirtyRectRenderer:
+    """Presenta el frame en pantalla. En modo rectángulos sucios solo se borran
+    las zonas dibujadas en el frame anterior y solo se envían a la pantalla
+    las zonas que han cambiado; si el área sucia es grande (o se ha pedido
+    un redibujado completo) se hace un flip normal."""
+    def __init__(self, surface, background=BLACK, enabled=DIRTY_RECT_RENDERING,
+                 max_area=DIRTY_RECT_MAX_AREA):
+        self.surface = surface
+        self.background = background
+        self.enabled = enabled
+        self.max_area = max_area * surface.get_width() * surface.get_height()
+        self._previous = []
+        self._full_redraw = True
+        self.full_frames = 0
+        self.partial_frames = 0
+    
+    def invalidate(self):
+        """Fuerza un redibujado completo (p. ej. al volver de un menú)"""
+        self._full_redraw = True
+    
+    def begin_frame(self):
+        if not self.enabled or self._full_redraw:
+            self.surface.fill(self.background)
+        else:
+            for rect in self._previous:
+                self.surface.fill(self.background, rect)
+    
+    def present(self, dirty_rects):
+        if not self.enabled:
+            pygame.display.flip()
+            return
+        dirty_rects = [rect for rect in dirty_rects if rect]
+        dirty = self._previous + dirty_rects
+        area = sum(rect.width * rect.height for rect in dirty)
+        if self._full_redraw or area > self.max_area:
+            pygame.display.flip()
+            self.full_frames += 1
+        else:
+            pygame.display.update(dirty)
+            self.partial_frames += 1
+        self._previous = dirty_rects
+        self._full_redraw = False
+
+class InputCommand:
+    """Entrada del jugador para un paso de simulación. Las direcciones son
+    teclas mantenidas; fire y missile son pulsaciones ocurridas en el paso"""
+    __slots__ = ("left", "right", "up", "down", "fire", "missile")
+
+    def __init__(self, left=False, right=False, up=False, down=False, fire=False, missile=False):
+        self.left = left
+        self.right = right
+        self.up = up
+        self.down = down
+        self.fire = fire
+        self.missile = missile
+
+    @classmethod
+    def from_keys(cls, keys, fire=False, missile=False):
+        """Construye el comando a partir de pygame.key.get_pressed()"""
+        return cls(bool(keys[K_a]), bool(keys[K_d]), bool(keys[K_w]), bool(keys[K_s]), fire, missile)
+
+class GameState:
+    """Estado completo de una partida. No usa la pantalla, el teclado ni el
+    sonido: step_game lo avanza un frame y main_game solo traduce la entrada,
+    reproduce los sonidos y lo dibuja."""
+    def __init__(self, seed=None):
+        # Toda la aleatoriedad de la partida sale de self.rng: con la misma
+        # semilla y las mismas entradas se repite exactamente
+        if seed is None:
+            seed = random.getrandbits(63)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.player = Player()
+
+        # Pools para reciclar balas, misiles, enemigos y power-ups
+        self.missile_pool = ObjectPool(Missile, POOL_SIZES["missile"])
+        self.enemy_pool = ObjectPool(Enemy, POOL_SIZES["enemy"])
+        self.powerup_pool = ObjectPool(PowerUp, POOL_SIZES["powerup"])
+        self.object_pools = [self.missile_pool, self.enemy_pool, self.powerup_pool]
+
+        self.bullets = BulletArray()
+        self.missiles = pygame.sprite.Group()
+        self.enemies = pygame.sprite.Group()
+        self.powerups = pygame.sprite.Group()
+        self.explosions = []
+        self.particles = ParticleSystem(4096, seed)
+        # Rejilla espacial para las colisiones de misiles (None = fuerza bruta)
+        self.enemy_grid = SpatialHash() if USE_SPATIAL_HASH else None
+
+        self.frame = 0
+        self.score = 0
+        self.powerup_spawn_timer = 0
+        self.enemy_spawn_timer = 0
+        self.combo = 0
+        self.combo_max = 0
+        self.combo_timer = 0
+        self.wave = 1
+        self.enemies_killed_this_wave = 0
+        self.total_enemies_killed = 0
+        self.enemies_per_wave = 10
+        self.wave_complete = False
+        self.wave_message_timer = 0
+        self.game_over = False
+
+class Replay:
+    """Repetición de una partida: semilla, entradas de cada frame y resultado.
+    Cada frame se guarda como una máscara de bits de un byte y los frames
+    iguales seguidos se agrupan en rachas (máscara, número de frames), así
+    que una partida de varios minutos ocupa unos pocos KB."""
+    MAGIC = b"SSRP"
+    VERSION = 2
+    # magic, versión, semilla, frames, score, wave, total_enemies_killed
+    HEADER = struct.Struct("<4sBQIIII")
+    RUN = struct.Struct("<BH")
+    BUTTONS = ("left", "right", "up", "down", "fire", "missile")
+    PAUSE_BIT = 1 << len(BUTTONS)
+
+    def __init__(self, seed):
+        self.seed = seed
+        self.runs = []
+        self.frames = 0
+        self.result = (0, 0, 0)
+
+    def record(self, command, paused=False):
+        """Añade las entradas de un frame (paused: se abrió el menú de pausa)"""
+        mask = self.PAUSE_BIT if paused else 0
+        for bit, name in enumerate(self.BUTTONS):
+            if getattr(command, name):
+                mask |= 1 << bit
+        if self.runs and self.runs[-1][0] == mask and self.runs[-1][1] < 0xFFFF:
+            self.runs[-1][1] += 1
+        else:
+            self.runs.append([mask, 1])
+        self.frames += 1
+
+    def finish(self, state):
+        self.result = (state.score, state.wave, state.total_enemies_killed)
+
+    def commands(self):
+        """Genera (InputCommand, pausado) para cada frame grabado"""
+        for mask, count in self.runs:
+            command = InputCommand(*[bool(mask & (1 << bit)) for bit in range(len(self.BUTTONS))])
+            paused = bool(mask & self.PAUSE_BIT)
+            for _ in range(count):
+                yield command, paused
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.HEADER.pack(self.MAGIC, self.VERSION, self.seed, self.frames, *self.result))
+            for mask, count in self.runs:
+                f.write(self.RUN.pack(mask, count))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        if len(data) < cls.HEADER.size or (len(data) - cls.HEADER.size) % cls.RUN.size:
+            raise ValueError("Repetición incompleta: " + path)
+        magic, version, seed, frames, score, wave, kills = cls.HEADER.unpack_from(data)
+        if magic != cls.MAGIC or version != cls.VERSION:
+            raise ValueError("Formato de repetición no soportado: " + path)
+        replay = cls(seed)
+        replay.frames = frames
+        replay.result = (score, wave, kills)
+        replay.runs = [list(run) for run in cls.RUN.iter_unpack(data[cls.HEADER.size:])]
+        return replay
+
+class RecordsStore:
+    """Historial de partidas en SQLite, sin límite de registros. Los índices
+    por puntuación, oleada y fecha hacen que top() y recent() lean solo las
+    filas que devuelven en vez de ordenar todo el historial. Los registros
+    son diccionarios con las mismas claves que el antiguo JSON."""
+    SCHEMA_VERSION = 2
+    COLUMNS = ("score", "wave", "enemies_killed", "combo_max", "date")
+    SCHEMA = (
+        """CREATE TABLE IF NOT EXISTS records (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            score INTEGER NOT NULL,
+            wave INTEGER NOT NULL,
+            enemies_killed INTEGER NOT NULL,
+            combo_max INTEGER NOT NULL,
+            date TEXT NOT NULL,
+            entry_id TEXT
+        )""",
+        "CREATE INDEX IF NOT EXISTS records_by_score ON records (score, id)",
+        "CREATE INDEX IF NOT EXISTS records_by_wave ON records (wave, id)",
+        "CREATE INDEX IF NOT EXISTS records_by_date ON records (date, id)",
+        # Identificador de cada registro del diario, para no duplicarlo al repasarlo
+        "CREATE UNIQUE INDEX IF NOT EXISTS records_by_entry ON records (entry_id)"
+    )
+    
+    def __init__(self, path=RECORDS_DB_PATH, legacy_json=RECORDS_JSON_PATH):
+        self.connection = sqlite3.connect(path)
+        self.connection.row_factory = sqlite3.Row
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        if version < self.SCHEMA_VERSION:
+            with self.connection:
+                if version == 1:
+                    self.connection.execute("ALTER TABLE records ADD COLUMN entry_id TEXT")
+                for statement in self.SCHEMA:
+                    self.connection.execute(statement)
+                # Base de datos nueva: importar el JSON si existe
+                if version == 0 and legacy_json is not None:
+                    try:
+                        self.import_json(legacy_json)
+                    except (OSError, ValueError, sqlite3.Error) as e:
+                        # Un JSON dañado no impide usar la base de datos
+                        print(f"Error importando registros: {e}")
+                self.connection.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+    
+    def import_json(self, path):
+        """Importa los registros de un game_records.json (del más reciente al
+        más antiguo, como los guardaba el juego) y devuelve cuántos importó"""
+        if not os.path.exists(path):
+            return 0
+        with open(path, 'r', encoding='utf-8') as f:
+            records = json.load(f)
+        if not isinstance(records, list):
+            raise ValueError(f"formato no válido en {path}")
+        # Las entradas que no son registros o con valores no numéricos se saltan
+        rows = []
+        for record in reversed(records):
+            if not isinstance(record, dict):
+                continue
+            try:
+                rows.append((int(record.get("score", 0)), int(record.get("wave", 1)),
+                             int(record.get("enemies_killed", 0)), int(record.get("combo_max", 0)),
+                             str(record.get("date", ""))))
+            except (TypeError, ValueError):
+                continue
+        self.connection.executemany(
+            "INSERT INTO records (score, wave, enemies_killed, combo_max, date) VALUES (?, ?, ?, ?, ?)", rows)
+        return len(rows)
+    
+    def add(self, score, wave, enemies_killed, combo_max, date=None):
+        self.add_entries([new_record_entry(score, wave, enemies_killed, combo_max, date)])
+    
+    def add_entries(self, entries):
+        """Guarda en una transacción registros con "id" (ver new_record_entry);
+        los que ya estaban guardados se ignoran"""
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO records (score, wave, enemies_killed, combo_max, date, entry_id) "
+                "VALUES (:score, :wave, :enemies_killed, :combo_max, :date, :id)", entries)
+    
+    def _query(self, order, limit, offset=0):
+        cursor = self.connection.execute(
+            f"SELECT {', '.join(self.COLUMNS)} FROM records ORDER BY {order} LIMIT ? OFFSET ?",
+            (-1 if limit is None else limit, offset))
+        return [dict(row) for row in cursor]
+    
+    def top(self, limit, by="score"):
+        """Mejores partidas por puntuación ("score") u oleada ("wave")"""
+        if by not in ("score", "wave"):
+            raise ValueError(f"No se puede ordenar por {by!r}")
+        return self._query(f"{by} DESC, id DESC", limit)
+    
+    def recent(self, limit=None, offset=0):
+        """Últimas partidas, de la más reciente a la más antigua (todas si limit
+        es None), saltándose las 'offset' primeras"""
+        return self._query("date DESC, id DESC", limit, offset)
+    
+    def count(self):
+        return self.connection.execute("SELECT COUNT(*) FROM records").fetchone()[0]
+    
+    def scores(self):
+        """Todas las puntuaciones, de menor a mayor (las da el índice por
+        puntuación); las que no son enteras (registros antiguos dañados) se saltan"""
+        cursor = self.connection.execute(
+            "SELECT score FROM records WHERE typeof(score) = 'integer' ORDER BY score")
+        cursor.row_factory = None
+        return np.fromiter((row[0] for row in cursor), dtype=np.int64)
+    
+    def close(self):
+        self.connection.close()
+
+class ScoreRankIndex:
+    """Posición de una puntuación entre todas las partidas. Un árbol de
+    Fenwick cuenta las partidas por grupos de RANK_BUCKET_WIDTH puntos y cada
+    grupo guarda sus puntuaciones ordenadas, así que añadir una partida y
+    consultar una posición cuestan O(log n) en vez de recorrer el historial."""
+    def __init__(self, scores=(), bucket_width=RANK_BUCKET_WIDTH):
+        self.bucket_width = bucket_width
+        scores = np.sort(np.maximum(np.asarray(scores, dtype=np.int64), 0))
+        self.total = len(scores)
+        # Puntuaciones ordenadas de cada grupo no vacío
+        buckets = scores // bucket_width
+        starts = np.flatnonzero(np.diff(buckets, prepend=-1))
+        self.buckets = {int(buckets[start]): group.tolist()
+                        for start, group in zip(starts, np.split(scores, starts[1:]))}
+        self._build(1 + (int(buckets[-1]) if self.total else 0))
+    
+    def _build(self, size):
+        """Rehace el árbol con 'size' grupos a partir de los grupos guardados"""
+        self.size = size
+        tree = [0] * (size + 1)
+        for bucket, group in self.buckets.items():
+            tree[bucket + 1] = len(group)
+        for i in range(1, size + 1):
+            parent = i + (i & -i)
+            if parent <= size:
+                tree[parent] += tree[i]
+        self.tree = tree
+    
+    def add(self, score):
+        score = max(score, 0)
+        bucket = score // self.bucket_width
+        group = self.buckets.setdefault(bucket, [])
+        bisect.insort(group, score)
+        self.total += 1
+        if bucket >= self.size:
+            # Puntuación fuera del árbol: se amplía (al menos al doble)
+            self._build(max(bucket + 1, self.size * 2))
+            return
+        i = bucket + 1
+        while i <= self.size:
+            self.tree[i] += 1
+            i += i & -i
+    
+    def _count_up_to_bucket(self, bucket):
+        """Partidas en los grupos 0..bucket"""
+        i = min(bucket + 1, self.size)
+        count = 0
+        while i > 0:
+            count += self.tree[i]
+            i -= i & -i
+        return count
+    
+    def count_above(self, score):
+        """Partidas con más puntos que 'score'"""
+        bucket = max(score, 0) // self.bucket_width
+        group = self.buckets.get(bucket, ())
+        above_in_group = len(group) - bisect.bisect_right(group, score)
+        return self.total - self._count_up_to_bucket(bucket) + above_in_group
+    
+    def rank(self, score):
+        """Posición de 'score' (1 = la mejor; los empates comparten posición)"""
+        return self.count_above(score) + 1
+    
+    def top_percent(self, score):
+        """Porcentaje de partidas mejores o iguales que la posición de 'score'"""
+        if self.total == 0:
+            return 100
+        return max(1, math.ceil(100 * self.rank(score) / self.total))
+
+def new_record_entry(score, wave, enemies_killed, combo_max, date=None):
+    """Registro de partida con un identificador único"""
+    if date is None:
+        date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    return {"id": uuid.uuid4().hex, "score": score, "wave": wave,
+            "enemies_killed": enemies_killed, "combo_max": combo_max, "date": date}
+
+def read_journal(path):
+    """Registros pendientes del diario; si está dañado se descarta (lista vacía)"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            entries = json.load(f)
+    except FileNotFoundError:
+        return []
+    except (OSError, ValueError) as e:
+        print(f"Error leyendo diario de registros: {e}")
+        return []
+    if not isinstance(entries, list) or not all(isinstance(entry, dict) for entry in entries):
+        print(f"Error leyendo diario de registros: formato no válido en {path}")
+        return []
+    return entries
+
+def write_journal(path, entries):
+    """Reemplaza el diario de forma atómica: se escribe en un archivo
+    temporal, se fuerza a disco y se renombra encima del anterior, así que
+    un corte a mitad deja el diario viejo o el nuevo, nunca uno a medias"""
+    if not entries:
+        if os.path.exists(path):
+            os.remove(path)
+        return
+    temp_path = path + ".tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(entries, f, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+class RecordsWriter:
+    """Hilo que guarda los registros de partida sin frenar el juego. Cada
+    registro se apunta primero en el diario (RECORDS_JOURNAL_PATH) y se borra
+    de él cuando ya está en la base de datos; al arrancar se guardan los que
+    quedaron en el diario por un cierre inesperado o un error de escritura."""
+    STOP = object()
+    
+    def __init__(self, db_path=RECORDS_DB_PATH, journal_path=RECORDS_JOURNAL_PATH, max_pending=RECORDS_QUEUE_SIZE):
+        self.db_path = db_path
+        self.journal_path = journal_path
+        self.queue = queue.Queue(maxsize=max_pending)
+        self.errors = 0
+        # Hilo demonio: si el juego sale sin close(), atexit lo vacía antes
+        self.thread = threading.Thread(target=self._run, name="records-writer", daemon=True)
+        self.thread.start()
+    
+    def submit(self, entry):
+        """Encola un registro (solo espera si hay RECORDS_QUEUE_SIZE pendientes).
+        Devuelve False sin encolarlo si el hilo ya no está en marcha."""
+        if not self.thread.is_alive():
+            return False
+        self.queue.put(entry)
+        return True
+    
+    def flush(self):
+        """Espera a que se hayan guardado todos los registros encolados"""
+        if self.thread.is_alive():
+            self.queue.join()
+    
+    def close(self):
+        if self.thread.is_alive():
+            self.queue.put(self.STOP)
+            self.thread.join()
+    
+    def _run(self):
+        store = None
+        while True:
+            entry = self.queue.get()
+            try:
+                if entry is self.STOP:
+                    break
+                if entry is not None:
+                    # Primero al diario, por si la base de datos no se puede abrir
+                    write_journal(self.journal_path, read_journal(self.journal_path) + [entry])
+                if store is None:
+                    # La conexión se abre en este hilo (sqlite3 no la comparte)
+                    store = RecordsStore(self.db_path)
+                self._save(store)
+            except Exception as e:
+                # El registro sigue en el diario y se guardará al arrancar; el
+                # hilo sigue atendiendo la cola para que flush() no se quede esperando
+                self.errors += 1
+                print(f"Error guardando registro: {e}")
+            finally:
+                self.queue.task_done()
+        if store is not None:
+            store.close()
+    
+    def _save(self, store):
+        """Guarda lo que haya en el diario y lo vacía"""
+        pending = read_journal(self.journal_path)
+        if pending:
+            store.add_entries(pending)
+            write_journal(self.journal_path, [])
+    
+    def replay_journal(self):
+        """Guarda (en el hilo) los registros que quedaron en el diario"""
+        self.submit(None)
+
+class RecordsView:
+    """Contenido de la pantalla de registro: top 5 y el historial completo.
+    Solo se dibujan las filas visibles; el historial se pide a la base de
+    datos por páginas a medida que se llega a ellas y cada fila se renderiza
+    una vez (las últimas usadas se guardan). Todo se descarta cuando cambia
+    el número de partidas guardadas."""
+    LINE_HEIGHT = 25
+    HEADER_HEIGHT = 30
+    SECTION_SPACING = 10
+    TOP_COLORS = [(255, 215, 0), (192, 192, 192), (205, 127, 50)]  # Oro, plata y bronce
+    
+    def __init__(self, store, width, page_size=RECORDS_PAGE_SIZE, cached_rows=RECORDS_CACHED_ROWS):
+        self.store = store
+        self.width = width
+        self.page_size = page_size
+        self.cached_rows = cached_rows
+        self.total = None
+        self.refresh()
+    
+    def refresh(self):
+        """Recarga los datos si se han guardado partidas desde la última vez"""
+        total = self.store.count()
+        if total == self.total:
+            return
+        self.total = total
+        self.top = self.store.top(5)
+        self.pages = {}
+        self.rows = OrderedDict()
+        # Posiciones (en el contenido) de cada sección
+        self.top_y = self.HEADER_HEIGHT + self.SECTION_SPACING
+        self.history_header_y = self.top_y + max(1, len(self.top)) * self.LINE_HEIGHT + self.SECTION_SPACING
+        self.history_y = self.history_header_y + self.HEADER_HEIGHT + self.SECTION_SPACING
+        self.height = self.history_y + max(1, total) * self.LINE_HEIGHT
+    
+    def record(self, index):
+        """Partida 'index' del historial (0 = la más reciente)"""
+        page = index // self.page_size
+        records = self.pages.get(page)
+        if records is None:
+            records = self.store.recent(self.page_size, page * self.page_size)
+            self.pages[page] = records
+        return records[index % self.page_size]
+    
+    def _row(self, key, render):
+        surface = self.rows.get(key)
+        if surface is None:
+            surface = render()
+            self.rows[key] = surface
+            if len(self.rows) > self.cached_rows:
+                self.rows.popitem(last=False)
+        else:
+            self.rows.move_to_end(key)
+        return surface
+    
+    @staticmethod
+    def _record_text(number, record):
+        date = record.get('date', 'N/A')
+        # Formatear fecha (solo la fecha)
+        date_short = date.split()[0] if ' ' in date else date
+        return (f"{number}. Puntuacion: {record.get('score', 0):,} | Onda: {record.get('wave', 0)} | "
+                f"Enemigos: {record.get('enemies_killed', 0)} | Combo: {record.get('combo_max', 0)} | {date_short}")
+    
+    def _top_row(self, i):
+        color = self.TOP_COLORS[i] if i < len(self.TOP_COLORS) else (220, 220, 220)
+        return tiny_font.render(self._record_text(i + 1, self.top[i]), True, color)
+    
+    def _history_row(self, i):
+        return tiny_font.render(self._record_text(i + 1, self.record(i)), True, (220, 220, 220))
+    
+    def draw(self, surface, x, y, scroll, visible_height):
+        """Dibuja la parte del contenido entre 'scroll' y 'scroll + visible_height'"""
+        line = self.LINE_HEIGHT
+        blits = []
+        
+        def place(content_y, height, key, render, indent=10):
+            if content_y + height > scroll and content_y < scroll + visible_height:
+                blits.append((self._row(key, render), (x + indent, y + content_y - scroll)))
+        
+        empty = lambda: tiny_font.render("No hay partidas registradas aun", True, (150, 150, 150))
+        
+        # Top 5 mejores partidas
+        place(0, self.HEADER_HEIGHT, "top_title",
+              lambda: small_font.render("TOP 5 MEJORES PARTIDAS:", True, (255, 200, 100)), indent=0)
+        for i in range(len(self.top)):
+            place(self.top_y + i * line, line, ("top", i), lambda i=i: self._top_row(i))
+        if not self.top:
+            place(self.top_y, line, "empty_top", empty)
+        
+        # Historial completo: solo las filas visibles
+        place(self.history_header_y, self.HEADER_HEIGHT, "history_title",
+              lambda: small_font.render(f"HISTORIAL ({self.total:,} PARTIDAS):", True, (255, 200, 100)), indent=0)
+        if self.total:
+            first = max(0, int(scroll - self.history_y) // line)
+            last = min(self.total, int(scroll + visible_height - self.history_y) // line + 1)
+            for i in range(first, last):
+                place(self.history_y + i * line, line, ("history", i), lambda i=i: self._history_row(i))
+        else:
+            place(self.history_y, line, "empty_history", empty)
         
-        # Líneas laterales
-        for i in range(0, HEIGHT, 120):
-            y = (i + line_speed) % (HEIGHT + line_length) - line_length
-            line_alpha = int(150 + 105 * math.sin((elapsed + i) / 200))
-            line_color = (0, line_alpha, 255)
-            pygame.draw.line(screen, line_color, (0, y), (0, y + line_length), line_thickness)
-            pygame.draw.line(screen, line_color, (WIDTH - 1, y), (WIDTH - 1, y + line_length), line_thickness)
+        surface.blits(blits, doreturn=False)
+
+# Widgets de los menús en modo retenido: cada uno renderiza sus textos y
+# fondos al crearse y en cada frame solo dibuja lo que se anima
+
+def draw_arcade_border(surface, time, color):
+    """Marco pulsante de la pantalla; 'color' recibe el brillo (0-255)"""
+    border_thickness = 3
+    border_glow = int(80 + 100 * math.sin(time / 25))
+    border_glow = max(0, min(255, border_glow))
+    border_glow_color = color(border_glow)
+    
+    pygame.draw.rect(surface, border_glow_color, (0, 0, WIDTH, border_thickness))
+    pygame.draw.rect(surface, border_glow_color, (0, HEIGHT - border_thickness, WIDTH, border_thickness))
+    pygame.draw.rect(surface, border_glow_color, (0, 0, border_thickness, HEIGHT))
+    pygame.draw.rect(surface, border_glow_color, (WIDTH - border_thickness, 0, border_thickness, HEIGHT))
+
+def draw_scroll_arrows(surface, rect, color, up, down):
+    """Flechas de scroll arriba y abajo de una caja"""
+    if up:
+        arrow_y = rect.y + 10
+        arrow_points = [(WIDTH // 2, arrow_y), (WIDTH // 2 - 10, arrow_y + 10), (WIDTH // 2 + 10, arrow_y + 10)]
+        pygame.draw.polygon(surface, color, arrow_points)
+    
+    if down:
+        arrow_y = rect.bottom - 20
+        arrow_points = [(WIDTH // 2, arrow_y + 10), (WIDTH // 2 - 10, arrow_y), (WIDTH // 2 + 10, arrow_y)]
+        pygame.draw.polygon(surface, color, arrow_points)
+
+class MenuLabel:
+    """Texto estático con contorno negro de 'outline' píxeles, renderizado una vez"""
+    
+    def __init__(self, font, text, color, outline=0):
+        text_surface = font.render(text, True, color)
+        self.width, self.height = text_surface.get_size()
+        self.outline = outline
+        self.surface = pygame.Surface((self.width + outline * 2, self.height + outline * 2), pygame.SRCALPHA)
+        self.surface.fill((0, 0, 0, 0))
+        if outline:
+            shadow = font.render(text, True, BLACK)
+            for offset_x in range(-outline, outline + 1):
+                for offset_y in range(-outline, outline + 1):
+                    if offset_x != 0 or offset_y != 0:
+                        self.surface.blit(shadow, (outline + offset_x, outline + offset_y))
+        self.surface.blit(text_surface, (outline, outline))
+    
+    def draw(self, surface, x, y):
+        surface.blit(self.surface, (x - self.outline, y - self.outline))
+    
+    def draw_centered(self, surface, y):
+        self.draw(surface, WIDTH // 2 - self.width // 2, y)
+
+class MenuButton:
+    """Botón arcade con brillo y borde neón. El fondo y el borde en reposo,
+    la sombra del texto y el texto en cada nivel de pulso se renderizan una
+    sola vez; cada frame solo se dibujan el brillo y el borde animados del
+    botón seleccionado.
+    'border_color' y 'glow_color' reciben la intensidad del brillo (0-255);
+    'bg_colors' y los textos son (en reposo, seleccionado)."""
+    SHADOW_ALPHAS = (100, 70, 40)
+    
+    def __init__(self, text, rect, bg_colors, border_color, glow_color, text_color,
+                 idle_color=(180, 180, 180), shadow=True, pulse=True, glow_scale=None):
+        self.rect = pygame.Rect(rect)
+        self.texts = (f"  {text}  ", f"> {text} <")
+        self.bg_colors = bg_colors
+        self.border_color = border_color
+        self.glow_color = glow_color
+        self.colors = (idle_color, text_color)
+        self.pulse = pulse
+        self.glow_scale = glow_scale
+        self.shadows = [self._build_shadow(text) if shadow else None for text in self.texts]
+        self.labels = ({}, {})
+        
+        # Fondo con el borde en reposo (intensidad 50)
+        self.idle = pygame.Surface(self.rect.size).convert()
+        self.idle.fill(bg_colors[0])
+        pygame.draw.rect(self.idle, border_color(50), self.idle.get_rect(), 3)
+        
+        # Superficie del brillo, del tamaño máximo; se rellena solo la parte usada
+        self.glow = pygame.Surface((int(self.rect.width * 1.1) + 1, int(self.rect.height * 1.1) + 1), pygame.SRCALPHA)
+    
+    def _build_shadow(self, text):
+        shadow_text = small_font.render(text, True, BLACK)
+        layers = len(self.SHADOW_ALPHAS)
+        width, height = shadow_text.get_size()
+        shadow = pygame.Surface((width + layers - 1, height + layers - 1), pygame.SRCALPHA)
+        shadow.fill((0, 0, 0, 0))
+        for i, alpha in enumerate(self.SHADOW_ALPHAS):
+            shadow_text.set_alpha(alpha)
+            shadow.blit(shadow_text, (i, i))
+        return shadow
+    
+    def _label(self, selected, anim):
+        """Texto del estado 'selected' en el nivel de pulso que toca a 'anim'"""
+        level = BUTTON_PULSE_LEVELS
+        if self.pulse:
+            level = round((1 + math.sin(anim * 3)) / 2 * BUTTON_PULSE_LEVELS)
+        label = self.labels[selected].get(level)
+        if label is None:
+            factor = 0.8 + 0.2 * level / BUTTON_PULSE_LEVELS if self.pulse else 1.0
+            color = tuple(int(c * factor) for c in self.colors[selected])
+            label = small_font.render(self.texts[selected], True, color)
+            self.labels[selected][level] = label
+        return label
+    
+    def draw(self, surface, selected, anim):
+        selected = int(selected)
+        x, y, width, height = self.rect
+        if selected:
+            intensity = int(100 + 155 * math.sin(anim * 2))
+            intensity = max(0, min(255, intensity))
+            
+            # Brillo del botón
+            scale = self.glow_scale or 1.0 + 0.1 * math.sin(anim)
+            glow_size = int(width * scale), int(height * scale)
+            glow_area = pygame.Rect((0, 0), glow_size)
+            self.glow.fill(self.glow_color(intensity), glow_area)
+            surface.blit(self.glow, (x - (glow_size[0] - width) // 2, y - (glow_size[1] - height) // 2), glow_area)
+            
+            pygame.draw.rect(surface, self.bg_colors[1], self.rect)
+            pygame.draw.rect(surface, self.border_color(intensity), self.rect, 3)
+        else:
+            surface.blit(self.idle, self.rect)
+        
+        # Sombra y texto centrados en el botón
+        label = self._label(selected, anim)
+        text_x = x + (width - label.get_width()) // 2
+        text_y = y + (height - label.get_height()) // 2
+        shadow = self.shadows[selected]
+        if shadow is not None:
+            surface.blit(shadow, (text_x, text_y))
+        surface.blit(label, (text_x, text_y))
+
+class ButtonGroup:
+    """Estado de selección y animación de un grupo de botones. El botón
+    seleccionado avanza 'anim_step' por frame; los demás vuelven a 0 de golpe
+    o, con 'anim_decay', poco a poco."""
+    
+    def __init__(self, buttons, anim_step=0.1, anim_decay=None):
+        self.buttons = buttons
+        self.anim_step = anim_step
+        self.anim_decay = anim_decay
+        self.selected = 0
+        self.animations = [0.0] * len(buttons)
+    
+    def select(self, index):
+        self.selected = index
+        self.animations[index] = 0
+    
+    def move(self, delta):
+        self.select((self.selected + delta) % len(self.buttons))
+    
+    def update(self):
+        for i in range(len(self.animations)):
+            if i == self.selected:
+                self.animations[i] += self.anim_step
+            elif self.anim_decay is None:
+                self.animations[i] = 0
+            else:
+                self.animations[i] = max(0, self.animations[i] - self.anim_decay)
+    
+    def draw(self, surface):
+        for i, button in enumerate(self.buttons):
+            button.draw(surface, i == self.selected, self.animations[i])
+
+class MenuPanel:
+    """Caja de información con sombra; solo el borde neón pulsante se dibuja
+    cada frame. 'border_color' recibe el brillo (0-255)."""
+    SHADOW_OFFSET = 5
+    
+    def __init__(self, rect, border_color):
+        self.rect = pygame.Rect(rect)
+        self.border_color = border_color
+        width, height = self.rect.size
+        offset = self.SHADOW_OFFSET
+        self.surface = pygame.Surface((width + offset, height + offset), pygame.SRCALPHA)
+        self.surface.fill((0, 0, 0, 0))
+        pygame.draw.rect(self.surface, BLACK, (offset, offset, width, height))
+        pygame.draw.rect(self.surface, (15, 15, 25), (0, 0, width, height))
+        pygame.draw.rect(self.surface, (30, 30, 40), (2, 2, width - 4, height - 4), 1)
+    
+    def draw(self, surface, time):
+        surface.blit(self.surface, self.rect)
+        box_glow = int(100 + 100 * math.sin(time / 40))
+        box_glow = max(0, min(255, box_glow))
+        pygame.draw.rect(surface, self.border_color(box_glow), self.rect, 4)
+
+class ScrollList:
+    """Lista de líneas (texto, es_titulo, color) dentro de un panel. Todas
+    las líneas se renderizan una vez en una superficie y cada frame solo se
+    copia la parte visible."""
+    
+    def __init__(self, panel, lines, padding=30, line_height=28, arrow_color=(255, 200, 100)):
+        self.panel = panel
+        self.padding = padding
+        self.arrow_color = arrow_color
+        self.visible_height = panel.rect.height - padding * 2
+        self.content = pygame.Surface((panel.rect.width - padding * 2, len(lines) * line_height)).convert()
+        self.content.fill((15, 15, 25))
         
-        # Efecto de scanlines retro (líneas horizontales)
-        scanline_surface = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        for y in range(scanline_offset, HEIGHT, 4):
-            scanline_surface.fill((0, 0, 0, 30), (0, y, WIDTH, 1))
-        screen.blit(scanline_surface, (0, 0))
-        
-        # Efecto de viñeta (oscurecimiento en los bordes)
-        vignette = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        center_x_v, center_y_v = WIDTH // 2, HEIGHT // 2
-        max_dist = math.sqrt(center_x_v**2 + center_y_v**2)
-        for x in range(0, WIDTH, 2):
-            for y in range(0, HEIGHT, 2):
-                dist = math.sqrt((x - center_x_v)**2 + (y - center_y_v)**2)
-                alpha = int(50 * (dist / max_dist))
-                if alpha > 0:
-                    vignette.fill((0, 0, 0, alpha), (x, y, 2, 2))
-        screen.blit(vignette, (0, 0))
+        y_offset = 0
+        for line_text, is_title, color in lines:
+            if line_text:
+                if is_title:
+                    # Titulos en tamaño más grande con sombra
+                    shadow = small_font.render(line_text, True, BLACK)
+                    self.content.blit(shadow, (2, y_offset + 2))
+                    self.content.blit(small_font.render(line_text, True, color), (0, y_offset))
+                else:
+                    self.content.blit(tiny_font.render(line_text, True, color), (0, y_offset))
+            y_offset += line_height
         
-        pygame.display.flip()
+        self.max_scroll = max(0, self.content.get_height() - self.visible_height)
+        self.scroll = 0
     
-    # Fade out mejorado con efecto de desvanecimiento
-    fade_surface = pygame.Surface((WIDTH, HEIGHT))
-    for alpha in range(0, 255, 8):
-        fade_surface.set_alpha(alpha)
-        fade_surface.fill(BLACK)
-        screen.blit(fade_surface, (0, 0))
-        pygame.display.flip()
-        pygame.time.wait(8)
+    def scroll_by(self, amount):
+        self.scroll = max(0, min(self.max_scroll, self.scroll + amount))
+    
+    def draw(self, surface, time):
+        self.panel.draw(surface, time)
+        rect = self.panel.rect
+        visible = (0, self.scroll, self.content.get_width(), self.visible_height)
+        surface.blit(self.content, (rect.x + self.padding, rect.y + self.padding), visible)
+        draw_scroll_arrows(surface, rect, self.arrow_color, self.scroll > 0, self.scroll < self.max_scroll)
+
+def back_button():
+    """Botón 'volver al menú principal' de las pantallas de comandos y registro"""
+    return MenuButton("VOLVER AL MENU PRINCIPAL", (WIDTH // 2 - 175, HEIGHT - 90, 350, 50),
+                      ((15, 15, 25), (20, 20, 40)), lambda i: (0, i, 255), lambda i: (0, i, 255, i // 2),
+                      (255, 255, 0), idle_color=(200, 200, 200), shadow=False, pulse=False, glow_scale=1.1)
+
+def show_splash_screen(loader=None):
+    """Pantalla de carga arcade ultra mejorada con efectos visuales épicos"""
+    if loader is None:
+        show_arcade_loading("SPACE SHOOTERS", 4000)  # 4 segundos para disfrutar los efectos
+    else:
+        show_arcade_loading("SPACE SHOOTERS", SPLASH_MIN_MS, loader)
 
-def show_loading_screen():
+def show_loading_screen(loader=None):
     """Pantalla de carga antes de iniciar el juego"""
+    if loader is None:
+        show_arcade_loading("PREPARANDO PARTIDA", 3000)
+    else:
+        show_arcade_loading("PREPARANDO PARTIDA", LOADING_MIN_MS, loader)
+
+def show_arcade_loading(title_text, duration, loader=None):
+    """Pantalla de carga arcade común: fondo animado, título neón, texto
+    "CARGANDO" y barra de progreso. Sin 'loader' dura 'duration' ms; con él,
+    la barra muestra el progreso real de la carga y la pantalla termina en
+    cuanto todo está listo (y han pasado al menos 'duration' ms)"""
     clock_loading = pygame.time.Clock()
-    loading_duration = 3000  # 3 segundos
     start_time = pygame.time.get_ticks()
     
-    # Crear estrellas para el fondo
-    loading_stars = [Star() for _ in range(200)]
-    
-    # Partículas arcade
-    loading_particles = []
-    for _ in range(50):
-        loading_particles.append({
-            'x': random.randint(0, WIDTH),
-            'y': random.randint(0, HEIGHT),
-            'vx': random.uniform(-3, 3),
-            'vy': random.uniform(-3, 3),
-            'size': random.randint(3, 8),
-            'color': random.choice([CYAN, YELLOW, GREEN, PURPLE, ORANGE, RED]),
-            'life': random.randint(40, 80),
-            'glow': random.uniform(0.5, 1.5)
-        })
-    
-    # Partículas de energía que orbitan
-    energy_particles = []
-    for _ in range(20):
-        angle = random.uniform(0, 2 * math.pi)
-        energy_particles.append({
-            'angle': angle,
-            'radius': random.uniform(100, 200),
-            'speed': random.uniform(0.02, 0.05),
-            'size': random.randint(2, 4),
-            'color': random.choice([CYAN, YELLOW])
-        })
-    
-    # Efectos de scanlines
-    scanline_offset = 0
+    # Fondo con imagen, estrellas y partículas (arcade y orbitales)
+    background = ArcadeBackground(**SPLASH_BACKGROUND)
+    title = ArcadeTitle(arcade_font_large, title_text, 5, 50, 10)
+    loading_bar = LoadingBar()
     
-    # Intentar cargar imagen de fondo
-    background_image = None
-    try:
-        bg_path = os.path.join(BASE_DIR, "images", "astrominer.png")
-        if os.path.exists(bg_path):
-            bg_img = pygame.image.load(bg_path)
-            background_image = pygame.transform.scale(bg_img, (WIDTH, HEIGHT))
-    except:
-        pass
+    # Sombras del texto de carga (una por cada número de puntos)
+    loading_shadows = {}
+    
+    # Efectos de scanlines (líneas de escaneo retro) y viñeta
+    scanline_offset = 0
+    crt_overlay = ScanlineOverlay(line_alpha=30, vignette_alpha=50)
     
     running = True
     while running:
         current_time = pygame.time.get_ticks()
         elapsed = current_time - start_time
         
-        if elapsed >= loading_duration:
+        if loader is not None:
+            loader.update()
+            progress = loader.progress()
+            if loader.done():
+                mark_startup("recursos cargados")
+            finished = loader.done() and elapsed >= duration
+        else:
+            progress = min(elapsed / duration, 1.0)
+            finished = elapsed >= duration
+        if finished:
             running = False
             break
         
@@ -800,213 +2571,78 @@ def show_loading_screen():
                 running = False
                 break
         
-        # Actualizar estrellas
-        for star in loading_stars:
-            star.update(3)
-        
-        # Actualizar partículas arcade
-        for particle in loading_particles[:]:
-            particle['x'] += particle['vx']
-            particle['y'] += particle['vy']
-            particle['life'] -= 1
-            particle['glow'] += 0.1
-            if particle['life'] <= 0:
-                particle['x'] = random.randint(0, WIDTH)
-                particle['y'] = random.randint(0, HEIGHT)
-                particle['life'] = random.randint(40, 80)
-                particle['vx'] = random.uniform(-3, 3)
-                particle['vy'] = random.uniform(-3, 3)
-        
-        # Actualizar partículas de energía orbitales
-        center_x, center_y = WIDTH // 2, HEIGHT // 2
-        for particle in energy_particles:
-            particle['angle'] += particle['speed']
-            particle['radius'] += math.sin(elapsed / 500) * 0.5
+        # Actualizar estrellas y partículas
+        background.update(elapsed)
         
         # Actualizar scanlines
         scanline_offset = (scanline_offset + 2) % 4
         
-        # Dibujar fondo
-        screen.fill(BLACK)
-        
-        # Dibujar imagen de fondo si existe
-        if background_image:
-            pulse = 0.3 + 0.2 * math.sin(elapsed / 300)
-            alpha = int(40 * pulse)
-            bg_surface = background_image.copy()
-            bg_surface.set_alpha(alpha)
-            zoom = 1.0 + 0.05 * math.sin(elapsed / 400)
-            zoomed = pygame.transform.scale(bg_surface, 
-                                          (int(WIDTH * zoom), int(HEIGHT * zoom)))
-            offset_x = (zoomed.get_width() - WIDTH) // 2
-            offset_y = (zoomed.get_height() - HEIGHT) // 2
-            screen.blit(zoomed, (-offset_x, -offset_y))
+        # Dibujar fondo, estrellas, partículas y partículas orbitales
+        background.draw(screen, elapsed)
+        background.draw_orbits(screen, (WIDTH // 2, HEIGHT // 2), elapsed)
         
-        # Dibujar estrellas
-        for star in loading_stars:
-            star.draw(screen)
-        
-        # Dibujar partículas arcade
-        for particle in loading_particles:
-            if particle['life'] > 0:
-                size = int(particle['size'] * (1 + 0.3 * math.sin(particle['glow'])))
-                glow_size = size + 2
-                glow_surface = pygame.Surface((glow_size * 2, glow_size * 2), pygame.SRCALPHA)
-                glow_alpha = int(100 * (particle['life'] / 80))
-                glow_color = (*particle['color'], glow_alpha)
-                pygame.draw.circle(glow_surface, glow_color, (glow_size, glow_size), glow_size)
-                screen.blit(glow_surface, (int(particle['x']) - glow_size, int(particle['y']) - glow_size))
-                pygame.draw.circle(screen, particle['color'], 
-                                 (int(particle['x']), int(particle['y'])), size)
-        
-        # Dibujar partículas de energía orbitales
-        for particle in energy_particles:
-            x = center_x + particle['radius'] * math.cos(particle['angle'])
-            y = center_y + particle['radius'] * math.sin(particle['angle'])
-            size = particle['size'] + int(2 * math.sin(elapsed / 200 + particle['angle']))
-            glow_surface = pygame.Surface((size * 3, size * 3), pygame.SRCALPHA)
-            pygame.draw.circle(glow_surface, (*particle['color'], 100), 
-                             (size * 1.5, size * 1.5), size * 1.5)
-            screen.blit(glow_surface, (int(x) - size * 1.5, int(y) - size * 1.5))
-            pygame.draw.circle(screen, particle['color'], (int(x), int(y)), size)
-        
-        # Efecto de parpadeo arcade
+        # Efecto de parpadeo arcade mejorado
         blink = int(255 * (0.8 + 0.2 * math.sin(elapsed / 100)))
         blink_fast = int(255 * (0.7 + 0.3 * math.sin(elapsed / 50)))
         
-        # Título principal "PREPARANDO PARTIDA"
-        title_text = "PREPARANDO PARTIDA"
-        title_y = HEIGHT // 3
-        
-        # Efecto de distorsión/ondulación
-        wave_offset = int(5 * math.sin(elapsed / 200))
+        # Título principal con efecto de distorsión/ondulación
+        title_y = HEIGHT // 3 + int(5 * math.sin(elapsed / 200))
         
-        # Múltiples capas de sombra
-        for layer in range(5, 0, -1):
-            shadow_alpha = 50 + layer * 10
-            for offset_x in range(-layer, layer + 1):
-                for offset_y in range(-layer, layer + 1):
-                    if offset_x != 0 or offset_y != 0:
-                        shadow = arcade_font_large.render(title_text, True, (0, 0, 0))
-                        shadow_surface = pygame.Surface(shadow.get_size(), pygame.SRCALPHA)
-                        shadow_surface.set_alpha(shadow_alpha)
-                        shadow_surface.blit(shadow, (0, 0))
-                        screen.blit(shadow_surface, 
-                                  (WIDTH // 2 - shadow.get_width() // 2 + offset_x, 
-                                   title_y + offset_y + wave_offset))
+        # Múltiples capas de sombra para profundidad
+        title.draw_shadow(screen, title_y)
         
         # Capa exterior con múltiples colores neón
         colors = [
-            (blink, 0, 255),
-            (0, blink, 255),
-            (blink, blink, 255),
+            (blink, 0, 255),      # Magenta
+            (0, blink, 255),      # Cyan
+            (blink, blink, 255),   # Azul brillante
         ]
         color_index = int((elapsed / 200) % len(colors))
         outer_color = colors[color_index]
         
         # Brillo exterior pulsante
-        for i in range(3):
-            glow_alpha = int((100 - i * 30) * (0.5 + 0.5 * math.sin(elapsed / 150)))
-            outer_glow = arcade_font_large.render(title_text, True, outer_color)
-            glow_surface = pygame.Surface(outer_glow.get_size(), pygame.SRCALPHA)
-            glow_surface.set_alpha(glow_alpha)
-            glow_surface.blit(outer_glow, (0, 0))
-            offset = i * 2
-            screen.blit(glow_surface, 
-                      (WIDTH // 2 - outer_glow.get_width() // 2 - offset, 
-                       title_y - offset + wave_offset))
-        
-        # Capa principal con efecto de arcoíris
+        glow_pulse = 0.5 + 0.5 * math.sin(elapsed / 150)
+        title.draw_glow(screen, title_y, outer_color, [int((100 - i * 30) * glow_pulse) for i in range(3)])
+        
+        # Capa principal con efecto de arcoíris y capa interior con brillo intenso
         hue = (elapsed / 50) % 360
         r = int(255 * (0.5 + 0.5 * math.sin(math.radians(hue))))
         g = int(255 * (0.5 + 0.5 * math.sin(math.radians(hue + 120))))
         b = int(255 * (0.5 + 0.5 * math.sin(math.radians(hue + 240))))
-        neon_color = (r, g, b)
+        title.draw_text(screen, title_y, (r, g, b), int(blink_fast * 0.6))
         
-        main_text = arcade_font_large.render(title_text, True, neon_color)
-        screen.blit(main_text, (WIDTH // 2 - main_text.get_width() // 2, 
-                               title_y + wave_offset))
-        
-        # Capa interior con brillo intenso
-        inner_glow = arcade_font_large.render(title_text, True, (255, 255, 255))
-        inner_surface = pygame.Surface(inner_glow.get_size(), pygame.SRCALPHA)
-        inner_alpha = int(blink_fast * 0.6)
-        inner_surface.set_alpha(inner_alpha)
-        inner_surface.blit(inner_glow, (0, 0))
-        screen.blit(inner_surface, (WIDTH // 2 - main_text.get_width() // 2, 
-                                   title_y + wave_offset))
-        
-        # Efecto de "carga" animado
-        loading_text = "CARGANDO"
-        dots = "." * (int(elapsed / 250) % 4)
-        loading_full = loading_text + dots
+        # Efecto de "carga" animado mejorado
+        loading_full = "CARGANDO" + "." * (int(elapsed / 250) % 4)
         
         # Sombra múltiple para texto de carga
-        for i in range(3):
-            shadow_alpha = 100 - i * 30
-            loading_shadow = small_font.render(loading_full, True, (0, 0, 0))
-            shadow_surf = pygame.Surface(loading_shadow.get_size(), pygame.SRCALPHA)
-            shadow_surf.set_alpha(shadow_alpha)
-            shadow_surf.blit(loading_shadow, (0, 0))
-            screen.blit(shadow_surf, 
-                      (WIDTH // 2 - loading_shadow.get_width() // 2 + i, 
-                       HEIGHT // 2 + 100 + i))
+        loading_shadow = loading_shadows.get(loading_full)
+        if loading_shadow is None:
+            shadow_text = small_font.render(loading_full, True, BLACK)
+            loading_shadow = pygame.Surface((shadow_text.get_width() + 2, shadow_text.get_height() + 2), pygame.SRCALPHA)
+            loading_shadow.fill((0, 0, 0, 0))
+            for i in range(3):
+                shadow_text.set_alpha(100 - i * 30)
+                loading_shadow.blit(shadow_text, (i, i))
+            loading_shadows[loading_full] = loading_shadow
+        screen.blit(loading_shadow, (WIDTH // 2 - (loading_shadow.get_width() - 2) // 2, HEIGHT // 2 + 100))
         
         # Texto de carga con efecto neón
         loading_alpha = int(150 + 105 * math.sin(elapsed / 150))
-        loading_alpha = max(0, min(255, loading_alpha))
+        loading_alpha = max(0, min(255, loading_alpha))  # Asegurar que esté entre 0 y 255
         loading_color = (0, loading_alpha, 255)
         loading_surface = small_font.render(loading_full, True, loading_color)
         screen.blit(loading_surface, (WIDTH // 2 - loading_surface.get_width() // 2, 
                                      HEIGHT // 2 + 100))
         
-        # Barra de carga mejorada
-        bar_width = 400
-        bar_height = 30
-        bar_x = WIDTH // 2 - bar_width // 2
-        bar_y = HEIGHT // 2 + 150
-        
-        # Fondo de la barra con borde neón
-        pygame.draw.rect(screen, (20, 20, 20), (bar_x - 2, bar_y - 2, bar_width + 4, bar_height + 4))
-        pygame.draw.rect(screen, (50, 50, 50), (bar_x, bar_y, bar_width, bar_height))
-        # Borde neón pulsante
-        border_glow = int(100 + 155 * math.sin(elapsed / 100))
-        border_glow = max(0, min(255, border_glow))
-        pygame.draw.rect(screen, (0, border_glow, 255), (bar_x, bar_y, bar_width, bar_height), 3)
-        
-        # Barra de progreso
-        progress = min(elapsed / loading_duration, 1.0)
-        progress_width = int(bar_width * progress)
-        
-        # Gradiente animado en la barra
-        for i in range(progress_width):
-            hue_offset = (i + elapsed / 10) % 360
-            r = int(255 * (0.5 + 0.5 * math.sin(math.radians(hue_offset))))
-            g = int(255 * (0.5 + 0.5 * math.sin(math.radians(hue_offset + 120))))
-            b = int(255 * (0.5 + 0.5 * math.sin(math.radians(hue_offset + 240))))
-            color = (r, g, b)
-            pygame.draw.line(screen, color, 
-                           (bar_x + i, bar_y), 
-                           (bar_x + i, bar_y + bar_height))
+        # Barra de carga con gradiente arcoíris y brillo deslizante
+        loading_bar.draw(screen, WIDTH // 2 - loading_bar.width // 2, HEIGHT // 2 + 150, progress, elapsed)
         
-        # Brillo deslizante en la barra
-        if progress_width > 0:
-            glow_pos = int(progress_width - 30 + 30 * math.sin(elapsed / 100))
-            glow_pos = max(0, min(progress_width, glow_pos))
-            glow_width = 40
-            for i in range(glow_width):
-                if glow_pos - i >= 0:
-                    alpha = int(255 * (1 - i / glow_width))
-                    glow_surface = pygame.Surface((1, bar_height), pygame.SRCALPHA)
-                    glow_surface.fill((255, 255, 255, alpha))
-                    screen.blit(glow_surface, (bar_x + glow_pos - i, bar_y))
-        
-        # Efectos de líneas arcade en los bordes
+        # Efectos de líneas arcade mejorados en los bordes
         line_thickness = 4
         line_length = 80
         line_speed = elapsed / 8
         
-        # Líneas superiores e inferiores
+        # Líneas superiores e inferiores con efecto de brillo
         for i in range(0, WIDTH, 120):
             x = (i + line_speed) % (WIDTH + line_length) - line_length
             line_alpha = int(150 + 105 * math.sin((elapsed + i) / 200))
@@ -1022,27 +2658,14 @@ def show_loading_screen():
             pygame.draw.line(screen, line_color, (0, y), (0, y + line_length), line_thickness)
             pygame.draw.line(screen, line_color, (WIDTH - 1, y), (WIDTH - 1, y + line_length), line_thickness)
         
-        # Efecto de scanlines retro
-        scanline_surface = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        for y in range(scanline_offset, HEIGHT, 4):
-            scanline_surface.fill((0, 0, 0, 30), (0, y, WIDTH, 1))
-        screen.blit(scanline_surface, (0, 0))
-        
-        # Efecto de viñeta
-        vignette = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        center_x_v, center_y_v = WIDTH // 2, HEIGHT // 2
-        max_dist = math.sqrt(center_x_v**2 + center_y_v**2)
-        for x in range(0, WIDTH, 2):
-            for y in range(0, HEIGHT, 2):
-                dist = math.sqrt((x - center_x_v)**2 + (y - center_y_v)**2)
-                alpha = int(50 * (dist / max_dist))
-                if alpha > 0:
-                    vignette.fill((0, 0, 0, alpha), (x, y, 2, 2))
-        screen.blit(vignette, (0, 0))
+        # Efecto de scanlines retro (líneas horizontales) y viñeta
+        # (oscurecimiento en los bordes)
+        crt_overlay.apply(screen, scanline_offset)
         
         pygame.display.flip()
+        mark_startup("primer frame")
     
-    # Fade out
+    # Fade out mejorado con efecto de desvanecimiento
     fade_surface = pygame.Surface((WIDTH, HEIGHT))
     for alpha in range(0, 255, 8):
         fade_surface.set_alpha(alpha)
@@ -1060,101 +2683,44 @@ def show_main_menu():
     except:
         pass  # Si no existe el archivo, continuar sin música
     
-    # Estrellas para el fondo del menú (más estrellas)
-    menu_stars = [Star() for _ in range(150)]
-    
-    # Partículas flotantes para efecto arcade
-    menu_particles = []
-    for _ in range(40):
-        menu_particles.append({
-            'x': random.randint(0, WIDTH),
-            'y': random.randint(0, HEIGHT),
-            'vx': random.uniform(-1.5, 1.5),
-            'vy': random.uniform(-1.5, 1.5),
-            'size': random.randint(2, 5),
-            'color': random.choice([CYAN, YELLOW, GREEN, PURPLE, ORANGE]),
-            'life': random.randint(50, 100),
-            'glow': random.uniform(0, 2 * math.pi)
-        })
-    
-    # Partículas de energía orbitales alrededor del título
-    title_particles = []
-    for _ in range(15):
-        angle = random.uniform(0, 2 * math.pi)
-        title_particles.append({
-            'angle': angle,
-            'radius': random.uniform(80, 120),
-            'speed': random.uniform(0.01, 0.03),
-            'size': random.randint(2, 4),
-            'color': random.choice([CYAN, YELLOW])
-        })
+    # Estrellas, partículas flotantes y partículas orbitales del título
+    menu_background = ArcadeBackground(**MENU_BACKGROUND)
+    menu_title = ArcadeTitle(arcade_font_medium, "SPACE SHOOTERS", 4, 60, 15)
     
     # Variables para animación
     menu_time = 0
-    selected_option = 0  # 0 = jugar, 1 = comandos, 2 = registro, 3 = salir
-    option_animations = [0.0, 0.0, 0.0, 0.0]  # Animación para cada opción
+    scanline_overlay = ScanlineOverlay(line_alpha=15)
+    # Botones: 0 = jugar, 1 = comandos, 2 = registro, 3 = salir
+    buttons = ButtonGroup([
+        MenuButton("JUGAR", (WIDTH // 2 - 125, HEIGHT // 2 - 85, 250, 50),
+                   ((15, 15, 25), (20, 20, 40)), lambda i: (0, i, 255), lambda i: (0, i, 255, i // 2),
+                   (255, 255, 0), idle_color=(200, 200, 200)),
+        MenuButton("COMANDOS", (WIDTH // 2 - 125, HEIGHT // 2 - 45, 250, 50),
+                   ((25, 20, 15), (40, 30, 20)), lambda i: (255, i // 2, 0), lambda i: (255, 165, 0, i // 2),
+                   (255, 200, 100)),
+        MenuButton("REGISTRO", (WIDTH // 2 - 125, HEIGHT // 2 - 5, 250, 50),
+                   ((15, 20, 25), (20, 30, 40)), lambda i: (100, i // 2, 255), lambda i: (100, 200, 255, i // 2),
+                   (150, 200, 255)),
+        MenuButton("SALIR", (WIDTH // 2 - 125, HEIGHT // 2 + 35, 250, 50),
+                   ((25, 15, 15), (40, 20, 20)), lambda i: (255, i // 2, 0), lambda i: (255, 0, 0, i // 2),
+                   (255, 100, 100)),
+    ], anim_step=0.15, anim_decay=0.1)
     
     while True:
         clock.tick(60)
         menu_time += 1
+        sound_manager.end_frame()
         
-        # Actualizar estrellas (más rápido)
-        for star in menu_stars:
-            star.update(2)
-        
-        # Actualizar partículas flotantes
-        for particle in menu_particles:
-            particle['x'] += particle['vx']
-            particle['y'] += particle['vy']
-            particle['life'] -= 0.5
-            particle['glow'] += 0.05
-            # Rebotar en los bordes
-            if particle['x'] < 0 or particle['x'] > WIDTH:
-                particle['vx'] *= -1
-            if particle['y'] < 0 or particle['y'] > HEIGHT:
-                particle['vy'] *= -1
-            if particle['life'] <= 0:
-                particle['x'] = random.randint(0, WIDTH)
-                particle['y'] = random.randint(0, HEIGHT)
-                particle['life'] = random.randint(50, 100)
-        
-        # Actualizar partículas orbitales del título
-        title_center_x, title_center_y = WIDTH // 2, HEIGHT // 6 + 30
-        for particle in title_particles:
-            particle['angle'] += particle['speed']
-            particle['radius'] += math.sin(menu_time / 100 + particle['angle']) * 0.3
+        # Actualizar estrellas y partículas
+        menu_background.update(menu_time)
         
         # Actualizar animaciones de opciones
-        for i in range(len(option_animations)):
-            if i == selected_option:
-                option_animations[i] += 0.15
-            else:
-                option_animations[i] = max(0, option_animations[i] - 0.1)
-        
-        # Dibujar fondo
-        screen.fill(BLACK)
+        buttons.update()
         
-        # Dibujar estrellas
-        for star in menu_stars:
-            star.draw(screen)
-        
-        # Dibujar partículas flotantes con brillo
-        for particle in menu_particles:
-            if particle['life'] > 0:
-                size = int(particle['size'] * (1 + 0.2 * math.sin(particle['glow'])))
-                # Brillo exterior
-                glow_size = size + 3
-                glow_surface = pygame.Surface((glow_size * 2, glow_size * 2), pygame.SRCALPHA)
-                glow_alpha = int(80 * (particle['life'] / 100))
-                glow_color = (*particle['color'], glow_alpha)
-                pygame.draw.circle(glow_surface, glow_color, (glow_size, glow_size), glow_size)
-                screen.blit(glow_surface, (int(particle['x']) - glow_size, int(particle['y']) - glow_size))
-                # Partícula principal
-                pygame.draw.circle(screen, particle['color'], 
-                                 (int(particle['x']), int(particle['y'])), size)
+        # Dibujar fondo, estrellas y partículas flotantes con brillo
+        menu_background.draw(screen)
         
         # Título del menú con efectos épicos
-        title_text = "SPACE SHOOTERS"
         title_y = HEIGHT // 6
         
         # Efecto de parpadeo mejorado
@@ -1162,33 +2728,13 @@ def show_main_menu():
         blink_fast = int(255 * (0.7 + 0.3 * math.sin(menu_time / 15)))
         
         # Efecto de distorsión sutil
-        wave_offset = int(3 * math.sin(menu_time / 60))
+        wave_y = title_y + int(3 * math.sin(menu_time / 60))
         
         # Múltiples capas de sombra para profundidad
-        for layer in range(4, 0, -1):
-            shadow_alpha = 60 + layer * 15
-            for offset_x in range(-layer, layer + 1):
-                for offset_y in range(-layer, layer + 1):
-                    if offset_x != 0 or offset_y != 0:
-                        shadow = arcade_font_medium.render(title_text, True, (0, 0, 0))
-                        shadow_surf = pygame.Surface(shadow.get_size(), pygame.SRCALPHA)
-                        shadow_surf.set_alpha(shadow_alpha)
-                        shadow_surf.blit(shadow, (0, 0))
-                        screen.blit(shadow_surf, 
-                                  (WIDTH // 2 - shadow.get_width() // 2 + offset_x, 
-                                   title_y + offset_y + wave_offset))
+        menu_title.draw_shadow(screen, wave_y)
         
         # Dibujar partículas orbitales alrededor del título
-        for particle in title_particles:
-            x = title_center_x + particle['radius'] * math.cos(particle['angle'])
-            y = title_center_y + particle['radius'] * math.sin(particle['angle'])
-            size = particle['size'] + int(2 * math.sin(menu_time / 30 + particle['angle']))
-            # Brillo
-            glow_surface = pygame.Surface((size * 3, size * 3), pygame.SRCALPHA)
-            pygame.draw.circle(glow_surface, (*particle['color'], 120), 
-                             (size * 1.5, size * 1.5), size * 1.5)
-            screen.blit(glow_surface, (int(x) - size * 1.5, int(y) - size * 1.5))
-            pygame.draw.circle(screen, particle['color'], (int(x), int(y)), size)
+        menu_background.draw_orbits(screen, (WIDTH // 2, HEIGHT // 6 + 30), menu_time)
         
         # Capa exterior con efecto arcoíris
         hue = (menu_time / 3) % 360
@@ -1198,255 +2744,19 @@ def show_main_menu():
         neon_color = (r, g, b)
         
         # Brillo exterior pulsante
-        for i in range(2):
-            glow_alpha = int((80 - i * 30) * (0.5 + 0.5 * math.sin(menu_time / 30)))
-            outer_glow = arcade_font_medium.render(title_text, True, neon_color)
-            glow_surf = pygame.Surface(outer_glow.get_size(), pygame.SRCALPHA)
-            glow_surf.set_alpha(glow_alpha)
-            glow_surf.blit(outer_glow, (0, 0))
-            offset = i * 2
-            screen.blit(glow_surf, 
-                      (WIDTH // 2 - outer_glow.get_width() // 2 - offset, 
-                       title_y - offset + wave_offset))
-        
-        # Título principal
-        title_surface = arcade_font_medium.render(title_text, True, neon_color)
-        screen.blit(title_surface, (WIDTH // 2 - title_surface.get_width() // 2, 
-                                   title_y + wave_offset))
-        
-        # Brillo interior intenso
-        inner_glow = arcade_font_medium.render(title_text, True, (255, 255, 255))
-        glow_surface = pygame.Surface(inner_glow.get_size(), pygame.SRCALPHA)
-        glow_surface.set_alpha(int(blink_fast * 0.4))
-        glow_surface.blit(inner_glow, (0, 0))
-        screen.blit(glow_surface, (WIDTH // 2 - title_surface.get_width() // 2, 
-                                   title_y + wave_offset))
+        glow_pulse = 0.5 + 0.5 * math.sin(menu_time / 30)
+        menu_title.draw_glow(screen, wave_y, neon_color, [int((80 - i * 30) * glow_pulse) for i in range(2)])
+        
+        # Título principal y brillo interior intenso
+        menu_title.draw_text(screen, wave_y, neon_color, int(blink_fast * 0.4))
         
         # Opciones del menú con botones estilizados
-        play_y = HEIGHT // 2 - 60
-        commands_y = HEIGHT // 2 - 20
-        records_y = HEIGHT // 2 + 20
-        exit_y = HEIGHT // 2 + 60
-        
-        # Dibujar botones con efectos
-        button_width = 250
-        button_height = 50
-        button_spacing = 70
-        
-        # Botón JUGAR
-        play_button_x = WIDTH // 2 - button_width // 2
-        play_button_y = play_y - button_height // 2
-        
-        # Efecto de hover/selected
-        play_scale = 1.0 + 0.1 * math.sin(option_animations[0])
-        play_glow_intensity = int(100 + 155 * math.sin(option_animations[0] * 2)) if selected_option == 0 else 50
-        play_glow_intensity = max(0, min(255, play_glow_intensity))
-        
-        # Fondo del botón con efecto neón
-        button_glow_size = int(button_width * play_scale), int(button_height * play_scale)
-        glow_offset_x = (button_glow_size[0] - button_width) // 2
-        glow_offset_y = (button_glow_size[1] - button_height) // 2
-        
-        # Brillo del botón
-        if selected_option == 0:
-            glow_surf = pygame.Surface(button_glow_size, pygame.SRCALPHA)
-            glow_color = (0, play_glow_intensity, 255, play_glow_intensity // 2)
-            pygame.draw.rect(glow_surf, glow_color, (0, 0, button_glow_size[0], button_glow_size[1]))
-            screen.blit(glow_surf, (play_button_x - glow_offset_x, play_button_y - glow_offset_y))
-        
-        # Fondo del botón (sin border_radius para compatibilidad)
-        button_bg_color = (20, 20, 40) if selected_option == 0 else (15, 15, 25)
-        pygame.draw.rect(screen, button_bg_color, 
-                        (play_button_x, play_button_y, button_width, button_height))
-        pygame.draw.rect(screen, (0, play_glow_intensity, 255), 
-                        (play_button_x, play_button_y, button_width, button_height), 3)
-        
-        # Texto del botón
-        play_text = "> JUGAR <" if selected_option == 0 else "  JUGAR  "
-        play_color = (255, 255, 0) if selected_option == 0 else (200, 200, 200)
-        play_color = (int(play_color[0] * (0.9 + 0.1 * math.sin(option_animations[0] * 3))),
-                      int(play_color[1] * (0.9 + 0.1 * math.sin(option_animations[0] * 3))),
-                      int(play_color[2] * (0.9 + 0.1 * math.sin(option_animations[0] * 3))))
-        
-        # Sombra del texto (centrada en el botón)
-        for i in range(3):
-            play_shadow = small_font.render(play_text, True, (0, 0, 0))
-            shadow_surf = pygame.Surface(play_shadow.get_size(), pygame.SRCALPHA)
-            shadow_surf.set_alpha(100 - i * 30)
-            shadow_surf.blit(play_shadow, (0, 0))
-            shadow_x = play_button_x + (button_width - play_shadow.get_width()) // 2 + i
-            shadow_y = play_button_y + (button_height - play_shadow.get_height()) // 2 + i
-            screen.blit(shadow_surf, (shadow_x, shadow_y))
-        
-        play_surface = small_font.render(play_text, True, play_color)
-        # Centrar texto dentro del botón (vertical y horizontal)
-        text_x = play_button_x + (button_width - play_surface.get_width()) // 2
-        text_y = play_button_y + (button_height - play_surface.get_height()) // 2
-        screen.blit(play_surface, (text_x, text_y))
-        
-        # Botón SALIR
-        exit_button_x = WIDTH // 2 - button_width // 2
-        exit_button_y = exit_y - button_height // 2
-        
-        # Botón COMANDOS
-        commands_button_x = WIDTH // 2 - button_width // 2
-        commands_button_y = commands_y - button_height // 2
-        
-        commands_glow_intensity = int(100 + 155 * math.sin(option_animations[1] * 2)) if selected_option == 1 else 50
-        commands_glow_intensity = max(0, min(255, commands_glow_intensity))
-        
-        # Brillo del botón
-        if selected_option == 1:
-            commands_glow_size = int(button_width * (1.0 + 0.1 * math.sin(option_animations[1]))), int(button_height * (1.0 + 0.1 * math.sin(option_animations[1])))
-            commands_glow_offset_x = (commands_glow_size[0] - button_width) // 2
-            commands_glow_offset_y = (commands_glow_size[1] - button_height) // 2
-            commands_glow_surf = pygame.Surface(commands_glow_size, pygame.SRCALPHA)
-            commands_glow_color = (255, 165, 0, commands_glow_intensity // 2)
-            pygame.draw.rect(commands_glow_surf, commands_glow_color, 
-                           (0, 0, commands_glow_size[0], commands_glow_size[1]))
-            screen.blit(commands_glow_surf, (commands_button_x - commands_glow_offset_x, commands_button_y - commands_glow_offset_y))
-        
-        # Fondo del botón
-        commands_bg_color = (40, 30, 20) if selected_option == 1 else (25, 20, 15)
-        pygame.draw.rect(screen, commands_bg_color, 
-                        (commands_button_x, commands_button_y, button_width, button_height))
-        pygame.draw.rect(screen, (255, commands_glow_intensity // 2, 0), 
-                        (commands_button_x, commands_button_y, button_width, button_height), 3)
-        
-        # Texto del botón
-        commands_text_str = "> COMANDOS <" if selected_option == 1 else "  COMANDOS  "
-        commands_color = (255, 200, 100) if selected_option == 1 else (180, 180, 180)
-        commands_color = (int(commands_color[0] * (0.9 + 0.1 * math.sin(option_animations[1] * 3))),
-                         int(commands_color[1] * (0.9 + 0.1 * math.sin(option_animations[1] * 3))),
-                         int(commands_color[2] * (0.9 + 0.1 * math.sin(option_animations[1] * 3))))
-        
-        # Sombra del texto (centrada en el botón)
-        for i in range(3):
-            commands_shadow = small_font.render(commands_text_str, True, (0, 0, 0))
-            shadow_surf = pygame.Surface(commands_shadow.get_size(), pygame.SRCALPHA)
-            shadow_surf.set_alpha(100 - i * 30)
-            shadow_surf.blit(commands_shadow, (0, 0))
-            commands_shadow_x = commands_button_x + (button_width - commands_shadow.get_width()) // 2 + i
-            commands_shadow_y = commands_button_y + (button_height - commands_shadow.get_height()) // 2 + i
-            screen.blit(shadow_surf, (commands_shadow_x, commands_shadow_y))
-        
-        commands_surface = small_font.render(commands_text_str, True, commands_color)
-        commands_text_x = commands_button_x + (button_width - commands_surface.get_width()) // 2
-        commands_text_y = commands_button_y + (button_height - commands_surface.get_height()) // 2
-        screen.blit(commands_surface, (commands_text_x, commands_text_y))
-        
-        # Botón SALIR
-        exit_button_x = WIDTH // 2 - button_width // 2
-        exit_button_y = exit_y - button_height // 2
-        
-        # Botón REGISTRO
-        records_button_x = WIDTH // 2 - button_width // 2
-        records_button_y = records_y - button_height // 2
-        
-        records_glow_intensity = int(100 + 155 * math.sin(option_animations[2] * 2)) if selected_option == 2 else 50
-        records_glow_intensity = max(0, min(255, records_glow_intensity))
-        
-        # Brillo del botón
-        if selected_option == 2:
-            records_glow_size = int(button_width * (1.0 + 0.1 * math.sin(option_animations[2]))), int(button_height * (1.0 + 0.1 * math.sin(option_animations[2])))
-            records_glow_offset_x = (records_glow_size[0] - button_width) // 2
-            records_glow_offset_y = (records_glow_size[1] - button_height) // 2
-            records_glow_surf = pygame.Surface(records_glow_size, pygame.SRCALPHA)
-            records_glow_color = (100, 200, 255, records_glow_intensity // 2)
-            pygame.draw.rect(records_glow_surf, records_glow_color, 
-                           (0, 0, records_glow_size[0], records_glow_size[1]))
-            screen.blit(records_glow_surf, (records_button_x - records_glow_offset_x, records_button_y - records_glow_offset_y))
-        
-        # Fondo del botón
-        records_bg_color = (20, 30, 40) if selected_option == 2 else (15, 20, 25)
-        pygame.draw.rect(screen, records_bg_color, 
-                        (records_button_x, records_button_y, button_width, button_height))
-        pygame.draw.rect(screen, (100, records_glow_intensity // 2, 255), 
-                        (records_button_x, records_button_y, button_width, button_height), 3)
-        
-        # Texto del botón
-        records_text_str = "> REGISTRO <" if selected_option == 2 else "  REGISTRO  "
-        records_color = (150, 200, 255) if selected_option == 2 else (180, 180, 180)
-        records_color = (int(records_color[0] * (0.9 + 0.1 * math.sin(option_animations[2] * 3))),
-                        int(records_color[1] * (0.9 + 0.1 * math.sin(option_animations[2] * 3))),
-                        int(records_color[2] * (0.9 + 0.1 * math.sin(option_animations[2] * 3))))
-        
-        # Sombra del texto (centrada en el botón)
-        for i in range(3):
-            records_shadow = small_font.render(records_text_str, True, (0, 0, 0))
-            shadow_surf = pygame.Surface(records_shadow.get_size(), pygame.SRCALPHA)
-            shadow_surf.set_alpha(100 - i * 30)
-            shadow_surf.blit(records_shadow, (0, 0))
-            records_shadow_x = records_button_x + (button_width - records_shadow.get_width()) // 2 + i
-            records_shadow_y = records_button_y + (button_height - records_shadow.get_height()) // 2 + i
-            screen.blit(shadow_surf, (records_shadow_x, records_shadow_y))
-        
-        records_surface = small_font.render(records_text_str, True, records_color)
-        records_text_x = records_button_x + (button_width - records_surface.get_width()) // 2
-        records_text_y = records_button_y + (button_height - records_surface.get_height()) // 2
-        screen.blit(records_surface, (records_text_x, records_text_y))
-        
-        # Botón SALIR
-        exit_button_x = WIDTH // 2 - button_width // 2
-        exit_button_y = exit_y - button_height // 2
-        
-        exit_glow_intensity = int(100 + 155 * math.sin(option_animations[3] * 2)) if selected_option == 3 else 50
-        exit_glow_intensity = max(0, min(255, exit_glow_intensity))
-        
-        # Brillo del botón
-        if selected_option == 3:
-            exit_glow_size = int(button_width * (1.0 + 0.1 * math.sin(option_animations[3]))), int(button_height * (1.0 + 0.1 * math.sin(option_animations[3])))
-            exit_glow_offset_x = (exit_glow_size[0] - button_width) // 2
-            exit_glow_offset_y = (exit_glow_size[1] - button_height) // 2
-            exit_glow_surf = pygame.Surface(exit_glow_size, pygame.SRCALPHA)
-            exit_glow_color = (255, 0, 0, exit_glow_intensity // 2)
-            pygame.draw.rect(exit_glow_surf, exit_glow_color, 
-                           (0, 0, exit_glow_size[0], exit_glow_size[1]))
-            screen.blit(exit_glow_surf, (exit_button_x - exit_glow_offset_x, exit_button_y - exit_glow_offset_y))
-        
-        # Fondo del botón (sin border_radius para compatibilidad)
-        exit_bg_color = (40, 20, 20) if selected_option == 3 else (25, 15, 15)
-        pygame.draw.rect(screen, exit_bg_color, 
-                        (exit_button_x, exit_button_y, button_width, button_height))
-        pygame.draw.rect(screen, (255, exit_glow_intensity // 2, 0), 
-                        (exit_button_x, exit_button_y, button_width, button_height), 3)
-        
-        # Texto del botón
-        exit_text_str = "> SALIR <" if selected_option == 3 else "  SALIR  "
-        exit_color = (255, 100, 100) if selected_option == 3 else (180, 180, 180)
-        exit_color = (int(exit_color[0] * (0.9 + 0.1 * math.sin(option_animations[3] * 3))),
-                     int(exit_color[1] * (0.9 + 0.1 * math.sin(option_animations[3] * 3))),
-                     int(exit_color[2] * (0.9 + 0.1 * math.sin(option_animations[3] * 3))))
-        
-        # Sombra del texto (centrada en el botón)
-        for i in range(3):
-            exit_shadow = small_font.render(exit_text_str, True, (0, 0, 0))
-            shadow_surf = pygame.Surface(exit_shadow.get_size(), pygame.SRCALPHA)
-            shadow_surf.set_alpha(100 - i * 30)
-            shadow_surf.blit(exit_shadow, (0, 0))
-            exit_shadow_x = exit_button_x + (button_width - exit_shadow.get_width()) // 2 + i
-            exit_shadow_y = exit_button_y + (button_height - exit_shadow.get_height()) // 2 + i
-            screen.blit(shadow_surf, (exit_shadow_x, exit_shadow_y))
-        
-        exit_surface = small_font.render(exit_text_str, True, exit_color)
-        # Centrar texto dentro del botón (vertical y horizontal)
-        exit_text_x = exit_button_x + (button_width - exit_surface.get_width()) // 2
-        exit_text_y = exit_button_y + (button_height - exit_surface.get_height()) // 2
-        screen.blit(exit_surface, (exit_text_x, exit_text_y))
+        buttons.draw(screen)
         
         # Efectos de borde arcade mejorados
-        border_thickness = 3
+        draw_arcade_border(screen, menu_time, lambda glow: (0, glow, 255))
         border_glow = int(80 + 100 * math.sin(menu_time / 25))
         border_glow = max(0, min(255, border_glow))
-        border_glow_color = (0, border_glow, 255)
-        
-        # Bordes superiores e inferiores con efecto de brillo
-        pygame.draw.rect(screen, border_glow_color, (0, 0, WIDTH, border_thickness))
-        pygame.draw.rect(screen, border_glow_color, (0, HEIGHT - border_thickness, WIDTH, border_thickness))
-        
-        # Bordes laterales
-        pygame.draw.rect(screen, border_glow_color, (0, 0, border_thickness, HEIGHT))
-        pygame.draw.rect(screen, border_glow_color, (WIDTH - border_thickness, 0, border_thickness, HEIGHT))
         
         # Líneas decorativas en las esquinas
         corner_length = 30
@@ -1466,11 +2776,7 @@ def show_main_menu():
         pygame.draw.line(screen, corner_color, (WIDTH, HEIGHT), (WIDTH, HEIGHT - corner_length), corner_thickness)
         
         # Efecto de scanlines sutil
-        scanline_surface = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        scanline_offset = (menu_time // 2) % 4
-        for y in range(scanline_offset, HEIGHT, 4):
-            scanline_surface.fill((0, 0, 0, 15), (0, y, WIDTH, 1))
-        screen.blit(scanline_surface, (0, 0))
+        scanline_overlay.apply(screen, menu_time // 2)
         
         pygame.display.flip()
         
@@ -1481,20 +2787,17 @@ def show_main_menu():
                 exit()
             if event.type == KEYDOWN:
                 if event.key == K_UP or event.key == K_w:
-                    selected_option = (selected_option - 1) % 4
-                    option_animations[selected_option] = 0
+                    buttons.move(-1)
                 elif event.key == K_DOWN or event.key == K_s:
-                    selected_option = (selected_option + 1) % 4
-                    option_animations[selected_option] = 0
+                    buttons.move(1)
                 elif event.key == K_RETURN:
                     pygame.mixer.music.stop()
-                    if start_sound:
-                        start_sound.play()
-                    if selected_option == 0:
+                    sound_manager.play("start")
+                    if buttons.selected == 0:
                         return True
-                    elif selected_option == 1:
+                    elif buttons.selected == 1:
                         show_commands_menu()
-                    elif selected_option == 2:
+                    elif buttons.selected == 2:
                         show_records_menu()
                     else:
                         pygame.quit()
@@ -1504,256 +2807,151 @@ def show_main_menu():
                     pygame.quit()
                     exit()
                     
+game_records = None
+records_writer = None
+score_ranks = None
+records_view = None
+
+def records_store():
+    """Abre la base de datos de registros la primera vez que se necesita.
+    Antes de devolverla espera a que se guarden los registros pendientes,
+    para que las consultas los incluyan."""
+    global game_records
+    if records_writer is not None:
+        records_writer.flush()
+    if game_records is None:
+        try:
+            game_records = RecordsStore()
+        except sqlite3.Error as e:
+            # Sin acceso al archivo: registros solo en memoria durante esta sesión
+            print(f"Error abriendo registros: {e}")
+            game_records = RecordsStore(":memory:", legacy_json=None)
+            # El hilo de escritura también fallaría con el archivo: se para para
+            # que save_game_record guarde en la base de datos en memoria (lo que
+            # ya estaba en el diario se muestra y se queda ahí para la próxima sesión)
+            if records_writer is not None:
+                records_writer.close()
+                game_records.add_entries(read_journal(records_writer.journal_path))
+    return game_records
+
+def start_records_writer():
+    """Arranca el hilo de escritura de registros, repasa el diario y se asegura
+    de vaciar la cola al salir (también si se sale con exit() desde un menú)"""
+    global records_writer
+    if records_writer is None:
+        records_writer = RecordsWriter()
+        records_writer.replay_journal()
+        atexit.register(records_writer.close)
+    return records_writer
+
 def save_game_record(score, wave, enemies_killed, combo_max):
-    """Guarda un registro de partida en un archivo JSON"""
-    records_file = os.path.join(BASE_DIR, "Juego Space Shooters", "game_records.json")
-    
-    # Cargar registros existentes
-    records = load_game_records()
-    
-    # Crear nuevo registro
-    new_record = {
-        "score": score,
-        "wave": wave,
-        "enemies_killed": enemies_killed,
-        "combo_max": combo_max,
-        "date": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    }
-    
-    # Añadir al inicio de la lista
-    records.insert(0, new_record)
-    
-    # Mantener solo las últimas 50 partidas
-    records = records[:50]
-    
-    # Guardar en archivo
+    """Guarda un registro de partida (en segundo plano si el hilo de escritura
+    está en marcha; si no, directamente)"""
+    entry = new_record_entry(score, wave, enemies_killed, combo_max)
+    if score_ranks is not None:
+        score_ranks.add(score)
+    if records_writer is not None and records_writer.submit(entry):
+        return
     try:
-        with open(records_file, 'w', encoding='utf-8') as f:
-            json.dump(records, f, indent=2, ensure_ascii=False)
-    except Exception as e:
+        records_store().add_entries([entry])
+    except sqlite3.Error as e:
         print(f"Error guardando registro: {e}")
 
-def load_game_records():
-    """Carga los registros de partidas desde un archivo JSON"""
-    records_file = os.path.join(BASE_DIR, "Juego Space Shooters", "game_records.json")
-    
+def score_rank_index():
+    """Índice de posiciones por puntuación; se carga de la base de datos la
+    primera vez que se consulta y después lo mantiene save_game_record"""
+    global score_ranks
+    if score_ranks is None:
+        try:
+            score_ranks = ScoreRankIndex(records_store().scores())
+        except (sqlite3.Error, ValueError) as e:
+            print(f"Error cargando registros: {e}")
+            score_ranks = ScoreRankIndex()
+    return score_ranks
+
+def load_game_records(limit=None):
+    """Carga los registros de partidas, del más reciente al más antiguo"""
     try:
-        if os.path.exists(records_file):
-            with open(records_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-    except Exception as e:
+        return records_store().recent(limit)
+    except sqlite3.Error as e:
         print(f"Error cargando registros: {e}")
     
     return []
 
 def show_records_menu():
     """Pantalla de registro de partidas"""
-    menu_stars = [Star() for _ in range(100)]
+    global records_view
+    menu_stars = Starfield(100)
     menu_time = 0
     back_selected = False
-    scroll_offset = 0
+    # El desplazamiento se acerca suavemente al objetivo que fijan las teclas
+    scroll_offset = 0.0
+    scroll_target = 0
     scroll_speed = 3
     
-    # Cargar registros
-    all_records = load_game_records()
-    
-    # Últimas 8 partidas
-    last_8 = all_records[:8] if len(all_records) >= 8 else all_records
-    
-    # Top 5 mejores partidas (por puntuación)
-    top_5 = sorted(all_records, key=lambda x: x.get('score', 0), reverse=True)[:5]
-    
-    # Calcular altura total del contenido
-    line_height = 25
-    section_spacing = 10
-    header_height = 30
+    # Caja de información
+    box_x = 40
+    box_y = 110
+    box_width = WIDTH - 80
+    box_height = HEIGHT - 250
+    box_padding = 30
+    visible_height = box_height - box_padding * 2
+    panel = MenuPanel((box_x, box_y, box_width, box_height), lambda glow: (100, glow // 2, 255))
+    title = MenuLabel(arcade_font_medium, "REGISTRO DE PARTIDAS", (100, 200, 255), outline=2)
+    back = back_button()
     
-    # Calcular altura: título + últimas 8 + título top 5 + top 5 + botón
-    total_lines = 1 + len(last_8) + 1 + len(top_5) + 2  # +2 para espaciado
-    total_content_height = total_lines * line_height + section_spacing * 3 + header_height * 2
+    # Contenido (se reutiliza entre visitas mientras no haya partidas nuevas)
+    try:
+        if records_view is None:
+            records_view = RecordsView(records_store(), box_width - box_padding * 2)
+        else:
+            records_view.store = records_store()
+            records_view.refresh()
+    except sqlite3.Error as e:
+        print(f"Error cargando registros: {e}")
+        records_view = None
+        return
+    view = records_view
+    max_scroll = max(0, view.height - visible_height)
     
     while True:
         clock.tick(60)
         menu_time += 1
         
         # Actualizar estrellas
-        for star in menu_stars:
-            star.update(1)
+        menu_stars.update(1)
+        
+        # Acercar el desplazamiento al objetivo
+        scroll_offset += (scroll_target - scroll_offset) * 0.25
+        if abs(scroll_target - scroll_offset) < 0.5:
+            scroll_offset = scroll_target
         
         # Dibujar fondo
         screen.fill(BLACK)
         
         # Dibujar estrellas
-        for star in menu_stars:
-            star.draw(screen)
+        menu_stars.draw(screen)
         
         # Título
-        title_text = "REGISTRO DE PARTIDAS"
-        title_y = 50
-        
-        # Sombra del título
-        for offset_x in range(-2, 3):
-            for offset_y in range(-2, 3):
-                if offset_x != 0 or offset_y != 0:
-                    shadow = arcade_font_medium.render(title_text, True, (0, 0, 0))
-                    screen.blit(shadow, (WIDTH // 2 - shadow.get_width() // 2 + offset_x, 
-                                       title_y + offset_y))
-        
-        # Título principal
-        title_color = (100, 200, 255)
-        title_surface = arcade_font_medium.render(title_text, True, title_color)
-        screen.blit(title_surface, (WIDTH // 2 - title_surface.get_width() // 2, title_y))
-        
-        # Caja de información
-        box_x = 40
-        box_y = 110
-        box_width = WIDTH - 80
-        box_height = HEIGHT - 250
-        box_padding = 30
-        
-        # Crear superficie para el contenido scrolleable
-        content_surface = pygame.Surface((box_width - box_padding * 2, total_content_height))
-        content_surface.fill((15, 15, 25))
-        
-        y_offset = 0
-        
-        # Título "Últimas 8 Partidas"
-        last_title = small_font.render("ULTIMAS 8 PARTIDAS:", True, (255, 200, 100))
-        content_surface.blit(last_title, (0, y_offset))
-        y_offset += header_height + section_spacing
-        
-        # Mostrar últimas 8 partidas
-        if last_8:
-            for i, record in enumerate(last_8, 1):
-                score = record.get('score', 0)
-                wave = record.get('wave', 0)
-                enemies = record.get('enemies_killed', 0)
-                combo = record.get('combo_max', 0)
-                date = record.get('date', 'N/A')
-                
-                # Formatear fecha (solo fecha y hora)
-                date_short = date.split()[0] if ' ' in date else date
-                
-                line_text = f"{i}. Puntuacion: {score:,} | Onda: {wave} | Enemigos: {enemies} | Combo: {combo} | {date_short}"
-                text_surface = tiny_font.render(line_text, True, (220, 220, 220))
-                content_surface.blit(text_surface, (10, y_offset))
-                y_offset += line_height
-        else:
-            no_records = tiny_font.render("No hay partidas registradas aun", True, (150, 150, 150))
-            content_surface.blit(no_records, (10, y_offset))
-            y_offset += line_height
-        
-        y_offset += section_spacing
-        
-        # Título "Top 5 Mejores Partidas"
-        top_title = small_font.render("TOP 5 MEJORES PARTIDAS:", True, (255, 200, 100))
-        content_surface.blit(top_title, (0, y_offset))
-        y_offset += header_height + section_spacing
-        
-        # Mostrar top 5
-        if top_5:
-            for i, record in enumerate(top_5, 1):
-                score = record.get('score', 0)
-                wave = record.get('wave', 0)
-                enemies = record.get('enemies_killed', 0)
-                combo = record.get('combo_max', 0)
-                date = record.get('date', 'N/A')
-                
-                # Formatear fecha
-                date_short = date.split()[0] if ' ' in date else date
-                
-                # Color especial para el top 3
-                if i == 1:
-                    color = (255, 215, 0)  # Oro
-                elif i == 2:
-                    color = (192, 192, 192)  # Plata
-                elif i == 3:
-                    color = (205, 127, 50)  # Bronce
-                else:
-                    color = (220, 220, 220)
-                
-                line_text = f"{i}. Puntuacion: {score:,} | Onda: {wave} | Enemigos: {enemies} | Combo: {combo} | {date_short}"
-                text_surface = tiny_font.render(line_text, True, color)
-                content_surface.blit(text_surface, (10, y_offset))
-                y_offset += line_height
-        else:
-            no_records = tiny_font.render("No hay partidas registradas aun", True, (150, 150, 150))
-            content_surface.blit(no_records, (10, y_offset))
-            y_offset += line_height
-        
-        # Fondo de la caja con efecto de profundidad
-        shadow_offset = 5
-        pygame.draw.rect(screen, (0, 0, 0), (box_x + shadow_offset, box_y + shadow_offset, box_width, box_height))
-        pygame.draw.rect(screen, (15, 15, 25), (box_x, box_y, box_width, box_height))
-        pygame.draw.rect(screen, (30, 30, 40), (box_x + 2, box_y + 2, box_width - 4, box_height - 4), 1)
-        box_glow = int(100 + 100 * math.sin(menu_time / 40))
-        box_glow = max(0, min(255, box_glow))
-        pygame.draw.rect(screen, (100, box_glow // 2, 255), (box_x, box_y, box_width, box_height), 4)
+        title.draw_centered(screen, 50)
         
-        # Calcular área visible del contenido
-        visible_height = box_height - box_padding * 2
-        max_scroll = max(0, total_content_height - visible_height)
-        scroll_offset = max(0, min(scroll_offset, max_scroll))
+        # Caja con efecto de profundidad
+        panel.draw(screen, menu_time)
         
-        # Dibujar contenido scrolleable
+        # Dibujar solo las filas visibles del contenido
         clip_rect = pygame.Rect(box_x + box_padding, box_y + box_padding, box_width - box_padding * 2, visible_height)
         screen.set_clip(clip_rect)
-        screen.blit(content_surface, (box_x + box_padding, box_y + box_padding - scroll_offset))
+        view.draw(screen, box_x + box_padding, box_y + box_padding, int(scroll_offset), visible_height)
         screen.set_clip(None)
         
         # Indicadores de scroll (flechas)
-        if scroll_offset > 0:
-            arrow_y = box_y + 10
-            arrow_points = [(WIDTH // 2, arrow_y), (WIDTH // 2 - 10, arrow_y + 10), (WIDTH // 2 + 10, arrow_y + 10)]
-            pygame.draw.polygon(screen, (100, 200, 255), arrow_points)
-        
-        if scroll_offset < max_scroll:
-            arrow_y = box_y + box_height - 20
-            arrow_points = [(WIDTH // 2, arrow_y + 10), (WIDTH // 2 - 10, arrow_y), (WIDTH // 2 + 10, arrow_y)]
-            pygame.draw.polygon(screen, (100, 200, 255), arrow_points)
+        draw_scroll_arrows(screen, panel.rect, (100, 200, 255), scroll_offset > 0, scroll_offset < max_scroll)
         
         # Botón Volver al Menú Principal
-        back_button_width = 350
-        back_button_height = 50
-        back_button_x = WIDTH // 2 - back_button_width // 2
-        back_button_y = HEIGHT - 90
-        
-        back_glow_intensity = int(100 + 155 * math.sin(menu_time / 20)) if back_selected else 50
-        back_glow_intensity = max(0, min(255, back_glow_intensity))
-        
-        if back_selected:
-            back_glow_size = int(back_button_width * 1.1), int(back_button_height * 1.1)
-            back_glow_offset_x = (back_glow_size[0] - back_button_width) // 2
-            back_glow_offset_y = (back_glow_size[1] - back_button_height) // 2
-            back_glow_surf = pygame.Surface(back_glow_size, pygame.SRCALPHA)
-            back_glow_color = (0, back_glow_intensity, 255, back_glow_intensity // 2)
-            pygame.draw.rect(back_glow_surf, back_glow_color, 
-                           (0, 0, back_glow_size[0], back_glow_size[1]))
-            screen.blit(back_glow_surf, (back_button_x - back_glow_offset_x, back_button_y - back_glow_offset_y))
-        
-        back_bg_color = (20, 20, 40) if back_selected else (15, 15, 25)
-        pygame.draw.rect(screen, back_bg_color, 
-                        (back_button_x, back_button_y, back_button_width, back_button_height))
-        pygame.draw.rect(screen, (0, back_glow_intensity, 255), 
-                        (back_button_x, back_button_y, back_button_width, back_button_height), 3)
-        
-        back_text = "> VOLVER AL MENU PRINCIPAL <" if back_selected else "  VOLVER AL MENU PRINCIPAL  "
-        back_color = (255, 255, 0) if back_selected else (200, 200, 200)
-        back_surface = small_font.render(back_text, True, back_color)
-        back_text_x = back_button_x + (back_button_width - back_surface.get_width()) // 2
-        back_text_y = back_button_y + (back_button_height - back_surface.get_height()) // 2
-        screen.blit(back_surface, (back_text_x, back_text_y))
+        back.draw(screen, back_selected, menu_time / 40)
         
         # Bordes arcade
-        border_thickness = 3
-        border_glow = int(80 + 100 * math.sin(menu_time / 25))
-        border_glow = max(0, min(255, border_glow))
-        border_glow_color = (0, border_glow, 255)
-        
-        pygame.draw.rect(screen, border_glow_color, (0, 0, WIDTH, border_thickness))
-        pygame.draw.rect(screen, border_glow_color, (0, HEIGHT - border_thickness, WIDTH, border_thickness))
-        pygame.draw.rect(screen, border_glow_color, (0, 0, border_thickness, HEIGHT))
-        pygame.draw.rect(screen, border_glow_color, (WIDTH - border_thickness, 0, border_thickness, HEIGHT))
+        draw_arcade_border(screen, menu_time, lambda glow: (0, glow, 255))
         
         pygame.display.flip()
         
@@ -1768,29 +2966,34 @@ def show_records_menu():
                 elif event.key == K_ESCAPE:
                     return
                 elif event.key == K_UP or event.key == K_w:
-                    if scroll_offset > 0:
-                        scroll_offset = max(0, scroll_offset - scroll_speed * 5)
+                    if scroll_target > 0:
+                        scroll_target = max(0, scroll_target - view.LINE_HEIGHT)
                     else:
                         back_selected = True
                 elif event.key == K_DOWN or event.key == K_s:
-                    if scroll_offset < max_scroll:
-                        scroll_offset = min(max_scroll, scroll_offset + scroll_speed * 5)
+                    if scroll_target < max_scroll:
+                        scroll_target = min(max_scroll, scroll_target + view.LINE_HEIGHT)
                     else:
                         back_selected = True
+                elif event.key == K_PAGEUP:
+                    scroll_target = max(0, scroll_target - visible_height)
+                elif event.key == K_PAGEDOWN:
+                    scroll_target = min(max_scroll, scroll_target + visible_height)
+                elif event.key == K_HOME:
+                    scroll_target = 0
+                elif event.key == K_END:
+                    scroll_target = max_scroll
             if event.type == MOUSEBUTTONDOWN:
-                mouse_x, mouse_y = pygame.mouse.get_pos()
-                if (back_button_x <= mouse_x <= back_button_x + back_button_width and
-                    back_button_y <= mouse_y <= back_button_y + back_button_height):
+                if back.rect.collidepoint(pygame.mouse.get_pos()):
                     return
             if event.type == pygame.MOUSEWHEEL:
-                scroll_offset = max(0, min(max_scroll, scroll_offset - event.y * scroll_speed * 10))
+                scroll_target = max(0, min(max_scroll, scroll_target - event.y * scroll_speed * 10))
 
 def show_commands_menu():
     """Pantalla de comandos con toda la informacion de controles y scroll"""
-    menu_stars = [Star() for _ in range(100)]
+    menu_stars = Starfield(100)
     menu_time = 0
     back_selected = False
-    scroll_offset = 0
     scroll_speed = 3
     
     # Informacion de comandos mejorada
@@ -1826,154 +3029,36 @@ def show_commands_menu():
         ("Sobrevive el mayor tiempo posible!", False, (255, 255, 150))
     ]
     
-    # Calcular altura total del contenido
-    line_height = 28
-    total_content_height = len(commands_info) * line_height
+    # Título, caja con las líneas ya renderizadas y botón
+    title = MenuLabel(arcade_font_medium, "COMANDOS", (255, 165, 0), outline=2)
+    panel = MenuPanel((40, 110, WIDTH - 80, HEIGHT - 250), lambda glow: (255, glow // 2, 0))
+    content = ScrollList(panel, commands_info)
+    back = back_button()
     
     while True:
         clock.tick(60)
         menu_time += 1
         
         # Actualizar estrellas
-        for star in menu_stars:
-            star.update(1)
+        menu_stars.update(1)
         
         # Dibujar fondo
         screen.fill(BLACK)
         
         # Dibujar estrellas
-        for star in menu_stars:
-            star.draw(screen)
+        menu_stars.draw(screen)
         
         # Titulo
-        title_text = "COMANDOS"
-        title_y = 50
-        blink = int(255 * (0.8 + 0.2 * math.sin(menu_time / 30)))
-        
-        # Sombra del titulo
-        for offset_x in range(-2, 3):
-            for offset_y in range(-2, 3):
-                if offset_x != 0 or offset_y != 0:
-                    shadow = arcade_font_medium.render(title_text, True, (0, 0, 0))
-                    screen.blit(shadow, (WIDTH // 2 - shadow.get_width() // 2 + offset_x, 
-                                       title_y + offset_y))
-        
-        # Titulo principal
-        title_color = (255, 165, 0)
-        title_surface = arcade_font_medium.render(title_text, True, title_color)
-        screen.blit(title_surface, (WIDTH // 2 - title_surface.get_width() // 2, title_y))
-        
-        # Caja de informacion mejorada
-        box_x = 40
-        box_y = 110
-        box_width = WIDTH - 80
-        box_height = HEIGHT - 250
-        box_padding = 30
-        
-        # Crear superficie para el contenido scrolleable
-        content_surface = pygame.Surface((box_width - box_padding * 2, total_content_height))
-        content_surface.fill((15, 15, 25))
-        
-        # Dibujar texto en la superficie de contenido
-        y_offset = 0
-        for line_data in commands_info:
-            line_text, is_title, color = line_data
-            if line_text:
-                if is_title:
-                    # Titulos en tamaño más grande
-                    text_surface = small_font.render(line_text, True, color)
-                    # Sombra para títulos
-                    shadow = small_font.render(line_text, True, (0, 0, 0))
-                    content_surface.blit(shadow, (2, y_offset + 2))
-                    content_surface.blit(text_surface, (0, y_offset))
-                else:
-                    # Texto normal
-                    text_surface = tiny_font.render(line_text, True, color)
-                    content_surface.blit(text_surface, (0, y_offset))
-            y_offset += line_height
-        
-        # Fondo de la caja con efecto de profundidad
-        # Sombra
-        shadow_offset = 5
-        pygame.draw.rect(screen, (0, 0, 0), (box_x + shadow_offset, box_y + shadow_offset, box_width, box_height))
-        # Fondo principal
-        pygame.draw.rect(screen, (15, 15, 25), (box_x, box_y, box_width, box_height))
-        # Borde interior
-        pygame.draw.rect(screen, (30, 30, 40), (box_x + 2, box_y + 2, box_width - 4, box_height - 4), 1)
-        # Borde neón pulsante
-        box_glow = int(100 + 100 * math.sin(menu_time / 40))
-        box_glow = max(0, min(255, box_glow))
-        pygame.draw.rect(screen, (255, box_glow // 2, 0), (box_x, box_y, box_width, box_height), 4)
-        
-        # Calcular área visible del contenido
-        visible_height = box_height - box_padding * 2
-        max_scroll = max(0, total_content_height - visible_height)
-        scroll_offset = max(0, min(scroll_offset, max_scroll))
-        
-        # Dibujar contenido scrolleable
-        clip_rect = pygame.Rect(box_x + box_padding, box_y + box_padding, box_width - box_padding * 2, visible_height)
-        screen.set_clip(clip_rect)
-        screen.blit(content_surface, (box_x + box_padding, box_y + box_padding - scroll_offset))
-        screen.set_clip(None)
+        title.draw_centered(screen, 50)
         
-        # Indicadores de scroll (flechas)
-        if scroll_offset > 0:
-            # Flecha arriba
-            arrow_y = box_y + 10
-            arrow_points = [(WIDTH // 2, arrow_y), (WIDTH // 2 - 10, arrow_y + 10), (WIDTH // 2 + 10, arrow_y + 10)]
-            pygame.draw.polygon(screen, (255, 200, 100), arrow_points)
-        
-        if scroll_offset < max_scroll:
-            # Flecha abajo
-            arrow_y = box_y + box_height - 20
-            arrow_points = [(WIDTH // 2, arrow_y + 10), (WIDTH // 2 - 10, arrow_y), (WIDTH // 2 + 10, arrow_y)]
-            pygame.draw.polygon(screen, (255, 200, 100), arrow_points)
+        # Caja de informacion con el contenido scrolleable
+        content.draw(screen, menu_time)
         
         # Boton Volver al Menu Principal
-        back_button_width = 350
-        back_button_height = 50
-        back_button_x = WIDTH // 2 - back_button_width // 2
-        back_button_y = HEIGHT - 90
-        
-        back_glow_intensity = int(100 + 155 * math.sin(menu_time / 20)) if back_selected else 50
-        back_glow_intensity = max(0, min(255, back_glow_intensity))
-        
-        # Brillo del boton
-        if back_selected:
-            back_glow_size = int(back_button_width * 1.1), int(back_button_height * 1.1)
-            back_glow_offset_x = (back_glow_size[0] - back_button_width) // 2
-            back_glow_offset_y = (back_glow_size[1] - back_button_height) // 2
-            back_glow_surf = pygame.Surface(back_glow_size, pygame.SRCALPHA)
-            back_glow_color = (0, back_glow_intensity, 255, back_glow_intensity // 2)
-            pygame.draw.rect(back_glow_surf, back_glow_color, 
-                           (0, 0, back_glow_size[0], back_glow_size[1]))
-            screen.blit(back_glow_surf, (back_button_x - back_glow_offset_x, back_button_y - back_glow_offset_y))
-        
-        # Fondo del boton
-        back_bg_color = (20, 20, 40) if back_selected else (15, 15, 25)
-        pygame.draw.rect(screen, back_bg_color, 
-                        (back_button_x, back_button_y, back_button_width, back_button_height))
-        pygame.draw.rect(screen, (0, back_glow_intensity, 255), 
-                        (back_button_x, back_button_y, back_button_width, back_button_height), 3)
-        
-        # Texto del boton
-        back_text = "> VOLVER AL MENU PRINCIPAL <" if back_selected else "  VOLVER AL MENU PRINCIPAL  "
-        back_color = (255, 255, 0) if back_selected else (200, 200, 200)
-        back_surface = small_font.render(back_text, True, back_color)
-        back_text_x = back_button_x + (back_button_width - back_surface.get_width()) // 2
-        back_text_y = back_button_y + (back_button_height - back_surface.get_height()) // 2
-        screen.blit(back_surface, (back_text_x, back_text_y))
+        back.draw(screen, back_selected, menu_time / 40)
         
         # Bordes arcade
-        border_thickness = 3
-        border_glow = int(80 + 100 * math.sin(menu_time / 25))
-        border_glow = max(0, min(255, border_glow))
-        border_glow_color = (0, border_glow, 255)
-        
-        pygame.draw.rect(screen, border_glow_color, (0, 0, WIDTH, border_thickness))
-        pygame.draw.rect(screen, border_glow_color, (0, HEIGHT - border_thickness, WIDTH, border_thickness))
-        pygame.draw.rect(screen, border_glow_color, (0, 0, border_thickness, HEIGHT))
-        pygame.draw.rect(screen, border_glow_color, (WIDTH - border_thickness, 0, border_thickness, HEIGHT))
+        draw_arcade_border(screen, menu_time, lambda glow: (0, glow, 255))
         
         pygame.display.flip()
         
@@ -1988,259 +3073,66 @@ def show_commands_menu():
                 elif event.key == K_ESCAPE:
                     return
                 elif event.key == K_UP or event.key == K_w:
-                    if scroll_offset > 0:
-                        scroll_offset = max(0, scroll_offset - scroll_speed * 5)
+                    if content.scroll > 0:
+                        content.scroll_by(-scroll_speed * 5)
                     else:
                         back_selected = True
                 elif event.key == K_DOWN or event.key == K_s:
-                    if scroll_offset < max_scroll:
-                        scroll_offset = min(max_scroll, scroll_offset + scroll_speed * 5)
+                    if content.scroll < content.max_scroll:
+                        content.scroll_by(scroll_speed * 5)
                     else:
                         back_selected = True
             if event.type == MOUSEBUTTONDOWN:
                 # Detectar clic en el boton
-                mouse_x, mouse_y = pygame.mouse.get_pos()
-                if (back_button_x <= mouse_x <= back_button_x + back_button_width and
-                    back_button_y <= mouse_y <= back_button_y + back_button_height):
+                if back.rect.collidepoint(pygame.mouse.get_pos()):
                     return
             # Scroll con rueda del mouse
             if event.type == pygame.MOUSEWHEEL:
-                scroll_offset = max(0, min(max_scroll, scroll_offset - event.y * scroll_speed * 10))
+                content.scroll_by(-event.y * scroll_speed * 10)
                     
 def show_pause_menu(game_surface):
     """Menu de pausa durante la partida"""
     menu_time = 0
-    selected_option = 0  # 0 = reanudar, 1 = reiniciar, 2 = comandos, 3 = menu principal
-    option_animations = [0.0, 0.0, 0.0, 0.0]
     
-    # Crear superficie semitransparente para oscurecer el fondo
+    # Estado del juego oscurecido con una superficie semitransparente, una vez
+    background = game_surface.copy()
     overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
     overlay.fill((0, 0, 0, 180))
+    background.blit(overlay, (0, 0))
+    title = MenuLabel(arcade_font_large, "PAUSA", (255, 200, 0), outline=3)
+    
+    # Botones: 0 = reanudar, 1 = reiniciar, 2 = comandos, 3 = menu principal
+    buttons = ButtonGroup([
+        MenuButton("REANUDAR", (WIDTH // 2 - 175, HEIGHT // 2 - 85, 350, 50),
+                   ((15, 25, 15), (20, 40, 20)), lambda i: (0, i, 255), lambda i: (0, i, 255, i // 2),
+                   (100, 255, 100)),
+        MenuButton("REINICIAR", (WIDTH // 2 - 175, HEIGHT // 2 - 35, 350, 50),
+                   ((25, 20, 15), (40, 30, 20)), lambda i: (255, i, 0), lambda i: (255, i, 0, i // 2),
+                   (255, 200, 100)),
+        MenuButton("COMANDOS", (WIDTH // 2 - 175, HEIGHT // 2 + 15, 350, 50),
+                   ((25, 20, 15), (40, 30, 20)), lambda i: (255, i, 0), lambda i: (255, i, 0, i // 2),
+                   (255, 200, 100)),
+        MenuButton("MENU PRINCIPAL", (WIDTH // 2 - 175, HEIGHT // 2 + 65, 350, 50),
+                   ((25, 15, 15), (40, 20, 20)), lambda i: (255, i // 2, 0), lambda i: (255, i // 2, 0, i // 2),
+                   (255, 100, 100)),
+    ])
     
     while True:
         clock.tick(60)
         menu_time += 1
         
         # Dibujar el estado del juego de fondo
-        screen.blit(game_surface, (0, 0))
-        screen.blit(overlay, (0, 0))
+        screen.blit(background, (0, 0))
         
         # Título "PAUSA"
-        title_text = "PAUSA"
-        title_y = 80
-        blink = int(255 * (0.8 + 0.2 * math.sin(menu_time / 30)))
-        
-        # Sombra del título
-        for offset_x in range(-3, 4):
-            for offset_y in range(-3, 4):
-                if offset_x != 0 or offset_y != 0:
-                    shadow = arcade_font_large.render(title_text, True, (0, 0, 0))
-                    screen.blit(shadow, (WIDTH // 2 - shadow.get_width() // 2 + offset_x, 
-                                       title_y + offset_y))
-        
-        # Título principal con efecto neón
-        title_color = (255, 200, 0)
-        title_surface = arcade_font_large.render(title_text, True, title_color)
-        screen.blit(title_surface, (WIDTH // 2 - title_surface.get_width() // 2, title_y))
+        title.draw_centered(screen, 80)
         
         # Opciones del menú
-        resume_y = HEIGHT // 2 - 60
-        restart_y = HEIGHT // 2 - 10
-        commands_y = HEIGHT // 2 + 40
-        main_menu_y = HEIGHT // 2 + 90
-        
-        button_width = 350
-        button_height = 50
-        
-        # Actualizar animaciones
-        for i in range(4):
-            if i == selected_option:
-                option_animations[i] += 0.1
-            else:
-                option_animations[i] = 0
-        
-        # Botón REANUDAR
-        resume_button_x = WIDTH // 2 - button_width // 2
-        resume_button_y = resume_y - button_height // 2
-        
-        resume_glow_intensity = int(100 + 155 * math.sin(option_animations[0] * 2)) if selected_option == 0 else 50
-        resume_glow_intensity = max(0, min(255, resume_glow_intensity))
-        
-        if selected_option == 0:
-            resume_glow_size = int(button_width * (1.0 + 0.1 * math.sin(option_animations[0]))), int(button_height * (1.0 + 0.1 * math.sin(option_animations[0])))
-            resume_glow_offset_x = (resume_glow_size[0] - button_width) // 2
-            resume_glow_offset_y = (resume_glow_size[1] - button_height) // 2
-            resume_glow_surf = pygame.Surface(resume_glow_size, pygame.SRCALPHA)
-            resume_glow_color = (0, resume_glow_intensity, 255, resume_glow_intensity // 2)
-            pygame.draw.rect(resume_glow_surf, resume_glow_color, 
-                           (0, 0, resume_glow_size[0], resume_glow_size[1]))
-            screen.blit(resume_glow_surf, (resume_button_x - resume_glow_offset_x, resume_button_y - resume_glow_offset_y))
-        
-        resume_bg_color = (20, 40, 20) if selected_option == 0 else (15, 25, 15)
-        pygame.draw.rect(screen, resume_bg_color, 
-                        (resume_button_x, resume_button_y, button_width, button_height))
-        pygame.draw.rect(screen, (0, resume_glow_intensity, 255), 
-                        (resume_button_x, resume_button_y, button_width, button_height), 3)
-        
-        resume_text_str = "> REANUDAR <" if selected_option == 0 else "  REANUDAR  "
-        resume_color = (100, 255, 100) if selected_option == 0 else (180, 180, 180)
-        resume_color = (int(resume_color[0] * (0.9 + 0.1 * math.sin(option_animations[0] * 3))),
-                        int(resume_color[1] * (0.9 + 0.1 * math.sin(option_animations[0] * 3))),
-                        int(resume_color[2] * (0.9 + 0.1 * math.sin(option_animations[0] * 3))))
-        
-        for i in range(3):
-            resume_shadow = small_font.render(resume_text_str, True, (0, 0, 0))
-            shadow_surf = pygame.Surface(resume_shadow.get_size(), pygame.SRCALPHA)
-            shadow_surf.set_alpha(100 - i * 30)
-            shadow_surf.blit(resume_shadow, (0, 0))
-            resume_shadow_x = resume_button_x + (button_width - resume_shadow.get_width()) // 2 + i
-            resume_shadow_y = resume_button_y + (button_height - resume_shadow.get_height()) // 2 + i
-            screen.blit(shadow_surf, (resume_shadow_x, resume_shadow_y))
-        
-        resume_surface = small_font.render(resume_text_str, True, resume_color)
-        resume_text_x = resume_button_x + (button_width - resume_surface.get_width()) // 2
-        resume_text_y = resume_button_y + (button_height - resume_surface.get_height()) // 2
-        screen.blit(resume_surface, (resume_text_x, resume_text_y))
-        
-        # Botón REINICIAR
-        restart_button_x = WIDTH // 2 - button_width // 2
-        restart_button_y = restart_y - button_height // 2
-        
-        restart_glow_intensity = int(100 + 155 * math.sin(option_animations[1] * 2)) if selected_option == 1 else 50
-        restart_glow_intensity = max(0, min(255, restart_glow_intensity))
-        
-        if selected_option == 1:
-            restart_glow_size = int(button_width * (1.0 + 0.1 * math.sin(option_animations[1]))), int(button_height * (1.0 + 0.1 * math.sin(option_animations[1])))
-            restart_glow_offset_x = (restart_glow_size[0] - button_width) // 2
-            restart_glow_offset_y = (restart_glow_size[1] - button_height) // 2
-            restart_glow_surf = pygame.Surface(restart_glow_size, pygame.SRCALPHA)
-            restart_glow_color = (255, restart_glow_intensity, 0, restart_glow_intensity // 2)
-            pygame.draw.rect(restart_glow_surf, restart_glow_color, 
-                           (0, 0, restart_glow_size[0], restart_glow_size[1]))
-            screen.blit(restart_glow_surf, (restart_button_x - restart_glow_offset_x, restart_button_y - restart_glow_offset_y))
-        
-        restart_bg_color = (40, 30, 20) if selected_option == 1 else (25, 20, 15)
-        pygame.draw.rect(screen, restart_bg_color, 
-                        (restart_button_x, restart_button_y, button_width, button_height))
-        pygame.draw.rect(screen, (255, restart_glow_intensity, 0), 
-                        (restart_button_x, restart_button_y, button_width, button_height), 3)
-        
-        restart_text_str = "> REINICIAR <" if selected_option == 1 else "  REINICIAR  "
-        restart_color = (255, 200, 100) if selected_option == 1 else (180, 180, 180)
-        restart_color = (int(restart_color[0] * (0.9 + 0.1 * math.sin(option_animations[1] * 3))),
-                        int(restart_color[1] * (0.9 + 0.1 * math.sin(option_animations[1] * 3))),
-                        int(restart_color[2] * (0.9 + 0.1 * math.sin(option_animations[1] * 3))))
-        
-        for i in range(3):
-            restart_shadow = small_font.render(restart_text_str, True, (0, 0, 0))
-            shadow_surf = pygame.Surface(restart_shadow.get_size(), pygame.SRCALPHA)
-            shadow_surf.set_alpha(100 - i * 30)
-            shadow_surf.blit(restart_shadow, (0, 0))
-            restart_shadow_x = restart_button_x + (button_width - restart_shadow.get_width()) // 2 + i
-            restart_shadow_y = restart_button_y + (button_height - restart_shadow.get_height()) // 2 + i
-            screen.blit(shadow_surf, (restart_shadow_x, restart_shadow_y))
-        
-        restart_surface = small_font.render(restart_text_str, True, restart_color)
-        restart_text_x = restart_button_x + (button_width - restart_surface.get_width()) // 2
-        restart_text_y = restart_button_y + (button_height - restart_surface.get_height()) // 2
-        screen.blit(restart_surface, (restart_text_x, restart_text_y))
-        
-        # Botón COMANDOS
-        commands_button_x = WIDTH // 2 - button_width // 2
-        commands_button_y = commands_y - button_height // 2
-        
-        commands_glow_intensity = int(100 + 155 * math.sin(option_animations[2] * 2)) if selected_option == 2 else 50
-        commands_glow_intensity = max(0, min(255, commands_glow_intensity))
-        
-        if selected_option == 2:
-            commands_glow_size = int(button_width * (1.0 + 0.1 * math.sin(option_animations[2]))), int(button_height * (1.0 + 0.1 * math.sin(option_animations[2])))
-            commands_glow_offset_x = (commands_glow_size[0] - button_width) // 2
-            commands_glow_offset_y = (commands_glow_size[1] - button_height) // 2
-            commands_glow_surf = pygame.Surface(commands_glow_size, pygame.SRCALPHA)
-            commands_glow_color = (255, commands_glow_intensity, 0, commands_glow_intensity // 2)
-            pygame.draw.rect(commands_glow_surf, commands_glow_color, 
-                           (0, 0, commands_glow_size[0], commands_glow_size[1]))
-            screen.blit(commands_glow_surf, (commands_button_x - commands_glow_offset_x, commands_button_y - commands_glow_offset_y))
-        
-        commands_bg_color = (40, 30, 20) if selected_option == 2 else (25, 20, 15)
-        pygame.draw.rect(screen, commands_bg_color, 
-                        (commands_button_x, commands_button_y, button_width, button_height))
-        pygame.draw.rect(screen, (255, commands_glow_intensity, 0), 
-                        (commands_button_x, commands_button_y, button_width, button_height), 3)
-        
-        commands_text_str = "> COMANDOS <" if selected_option == 2 else "  COMANDOS  "
-        commands_color = (255, 200, 100) if selected_option == 2 else (180, 180, 180)
-        commands_color = (int(commands_color[0] * (0.9 + 0.1 * math.sin(option_animations[2] * 3))),
-                         int(commands_color[1] * (0.9 + 0.1 * math.sin(option_animations[2] * 3))),
-                         int(commands_color[2] * (0.9 + 0.1 * math.sin(option_animations[2] * 3))))
-        
-        for i in range(3):
-            commands_shadow = small_font.render(commands_text_str, True, (0, 0, 0))
-            shadow_surf = pygame.Surface(commands_shadow.get_size(), pygame.SRCALPHA)
-            shadow_surf.set_alpha(100 - i * 30)
-            shadow_surf.blit(commands_shadow, (0, 0))
-            commands_shadow_x = commands_button_x + (button_width - commands_shadow.get_width()) // 2 + i
-            commands_shadow_y = commands_button_y + (button_height - commands_shadow.get_height()) // 2 + i
-            screen.blit(shadow_surf, (commands_shadow_x, commands_shadow_y))
-        
-        commands_surface = small_font.render(commands_text_str, True, commands_color)
-        commands_text_x = commands_button_x + (button_width - commands_surface.get_width()) // 2
-        commands_text_y = commands_button_y + (button_height - commands_surface.get_height()) // 2
-        screen.blit(commands_surface, (commands_text_x, commands_text_y))
-        
-        # Botón MENÚ PRINCIPAL
-        main_menu_button_x = WIDTH // 2 - button_width // 2
-        main_menu_button_y = main_menu_y - button_height // 2
-        
-        main_menu_glow_intensity = int(100 + 155 * math.sin(option_animations[3] * 2)) if selected_option == 3 else 50
-        main_menu_glow_intensity = max(0, min(255, main_menu_glow_intensity))
-        
-        if selected_option == 3:
-            main_menu_glow_size = int(button_width * (1.0 + 0.1 * math.sin(option_animations[3]))), int(button_height * (1.0 + 0.1 * math.sin(option_animations[3])))
-            main_menu_glow_offset_x = (main_menu_glow_size[0] - button_width) // 2
-            main_menu_glow_offset_y = (main_menu_glow_size[1] - button_height) // 2
-            main_menu_glow_surf = pygame.Surface(main_menu_glow_size, pygame.SRCALPHA)
-            main_menu_glow_color = (255, main_menu_glow_intensity // 2, 0, main_menu_glow_intensity // 2)
-            pygame.draw.rect(main_menu_glow_surf, main_menu_glow_color, 
-                           (0, 0, main_menu_glow_size[0], main_menu_glow_size[1]))
-            screen.blit(main_menu_glow_surf, (main_menu_button_x - main_menu_glow_offset_x, main_menu_button_y - main_menu_glow_offset_y))
-        
-        main_menu_bg_color = (40, 20, 20) if selected_option == 3 else (25, 15, 15)
-        pygame.draw.rect(screen, main_menu_bg_color, 
-                        (main_menu_button_x, main_menu_button_y, button_width, button_height))
-        pygame.draw.rect(screen, (255, main_menu_glow_intensity // 2, 0), 
-                        (main_menu_button_x, main_menu_button_y, button_width, button_height), 3)
-        
-        main_menu_text_str = "> MENU PRINCIPAL <" if selected_option == 3 else "  MENU PRINCIPAL  "
-        main_menu_color = (255, 100, 100) if selected_option == 3 else (180, 180, 180)
-        main_menu_color = (int(main_menu_color[0] * (0.9 + 0.1 * math.sin(option_animations[3] * 3))),
-                           int(main_menu_color[1] * (0.9 + 0.1 * math.sin(option_animations[3] * 3))),
-                           int(main_menu_color[2] * (0.9 + 0.1 * math.sin(option_animations[3] * 3))))
-        
-        for i in range(3):
-            main_menu_shadow = small_font.render(main_menu_text_str, True, (0, 0, 0))
-            shadow_surf = pygame.Surface(main_menu_shadow.get_size(), pygame.SRCALPHA)
-            shadow_surf.set_alpha(100 - i * 30)
-            shadow_surf.blit(main_menu_shadow, (0, 0))
-            main_menu_shadow_x = main_menu_button_x + (button_width - main_menu_shadow.get_width()) // 2 + i
-            main_menu_shadow_y = main_menu_button_y + (button_height - main_menu_shadow.get_height()) // 2 + i
-            screen.blit(shadow_surf, (main_menu_shadow_x, main_menu_shadow_y))
-        
-        main_menu_surface = small_font.render(main_menu_text_str, True, main_menu_color)
-        main_menu_text_x = main_menu_button_x + (button_width - main_menu_surface.get_width()) // 2
-        main_menu_text_y = main_menu_button_y + (button_height - main_menu_surface.get_height()) // 2
-        screen.blit(main_menu_surface, (main_menu_text_x, main_menu_text_y))
+        buttons.update()
+        buttons.draw(screen)
         
         # Bordes arcade
-        border_thickness = 3
-        border_glow = int(80 + 100 * math.sin(menu_time / 25))
-        border_glow = max(0, min(255, border_glow))
-        border_glow_color = (255, border_glow, 0)
-        
-        pygame.draw.rect(screen, border_glow_color, (0, 0, WIDTH, border_thickness))
-        pygame.draw.rect(screen, border_glow_color, (0, HEIGHT - border_thickness, WIDTH, border_thickness))
-        pygame.draw.rect(screen, border_glow_color, (0, 0, border_thickness, HEIGHT))
-        pygame.draw.rect(screen, border_glow_color, (WIDTH - border_thickness, 0, border_thickness, HEIGHT))
+        draw_arcade_border(screen, menu_time, lambda glow: (255, glow, 0))
         
         pygame.display.flip()
         
@@ -2250,17 +3142,15 @@ def show_pause_menu(game_surface):
                 exit()
             if event.type == KEYDOWN:
                 if event.key == K_UP or event.key == K_w:
-                    selected_option = (selected_option - 1) % 4
-                    option_animations[selected_option] = 0
+                    buttons.move(-1)
                 elif event.key == K_DOWN or event.key == K_s:
-                    selected_option = (selected_option + 1) % 4
-                    option_animations[selected_option] = 0
+                    buttons.move(1)
                 elif event.key == K_RETURN:
-                    if selected_option == 0:
+                    if buttons.selected == 0:
                         return "resume"
-                    elif selected_option == 1:
+                    elif buttons.selected == 1:
                         return "restart"
-                    elif selected_option == 2:
+                    elif buttons.selected == 2:
                         show_commands_menu()
                         # Volver a capturar el estado del juego después de ver comandos
                         return "resume"
@@ -2275,22 +3165,9 @@ def show_game_over_screen():
     gameover_duration = 3000  # 3 segundos
     start_time = pygame.time.get_ticks()
     
-    # Crear estrellas para el fondo
-    gameover_stars = [Star() for _ in range(200)]
-    
-    # Partículas de explosión
-    explosion_particles = []
-    for _ in range(100):
-        explosion_particles.append({
-            'x': random.randint(0, WIDTH),
-            'y': random.randint(0, HEIGHT),
-            'vx': random.uniform(-5, 5),
-            'vy': random.uniform(-5, 5),
-            'size': random.randint(2, 6),
-            'color': random.choice([RED, ORANGE, YELLOW]),
-            'life': random.randint(30, 60),
-            'glow': random.uniform(0, 2 * math.pi)
-        })
+    # Estrellas y partículas de explosión para el fondo
+    gameover_background = ArcadeBackground(**GAME_OVER_BACKGROUND)
+    title = ArcadeTitle(arcade_font_large, "GAME OVER", 5, 50, 10)
     
     running = True
     while running:
@@ -2311,45 +3188,13 @@ def show_game_over_screen():
                 running = False
                 break
         
-        # Actualizar estrellas
-        for star in gameover_stars:
-            star.update(2)
-        
-        # Actualizar partículas
-        for particle in explosion_particles[:]:
-            particle['x'] += particle['vx']
-            particle['y'] += particle['vy']
-            particle['life'] -= 1
-            particle['glow'] += 0.1
-            if particle['life'] <= 0:
-                particle['x'] = random.randint(0, WIDTH)
-                particle['y'] = random.randint(0, HEIGHT)
-                particle['life'] = random.randint(30, 60)
-                particle['vx'] = random.uniform(-5, 5)
-                particle['vy'] = random.uniform(-5, 5)
-        
-        # Dibujar fondo
-        screen.fill(BLACK)
+        # Actualizar estrellas y partículas
+        gameover_background.update(elapsed)
         
-        # Dibujar estrellas
-        for star in gameover_stars:
-            star.draw(screen)
-        
-        # Dibujar partículas de explosión
-        for particle in explosion_particles:
-            if particle['life'] > 0:
-                size = int(particle['size'] * (1 + 0.3 * math.sin(particle['glow'])))
-                glow_size = size + 2
-                glow_surface = pygame.Surface((glow_size * 2, glow_size * 2), pygame.SRCALPHA)
-                glow_alpha = int(150 * (particle['life'] / 60))
-                glow_color = (*particle['color'], glow_alpha)
-                pygame.draw.circle(glow_surface, glow_color, (glow_size, glow_size), glow_size)
-                screen.blit(glow_surface, (int(particle['x']) - glow_size, int(particle['y']) - glow_size))
-                pygame.draw.circle(screen, particle['color'], 
-                                 (int(particle['x']), int(particle['y'])), size)
+        # Dibujar fondo, estrellas y partículas de explosión
+        gameover_background.draw(screen)
         
         # Título "GAME OVER"
-        title_text = "GAME OVER"
         title_y = HEIGHT // 2 - 50
         
         # Efecto de parpadeo
@@ -2357,53 +3202,17 @@ def show_game_over_screen():
         blink_fast = int(255 * (0.6 + 0.4 * math.sin(elapsed / 50)))
         
         # Múltiples capas de sombra
-        for layer in range(5, 0, -1):
-            shadow_alpha = 50 + layer * 10
-            for offset_x in range(-layer, layer + 1):
-                for offset_y in range(-layer, layer + 1):
-                    if offset_x != 0 or offset_y != 0:
-                        shadow = arcade_font_large.render(title_text, True, (0, 0, 0))
-                        shadow_surface = pygame.Surface(shadow.get_size(), pygame.SRCALPHA)
-                        shadow_surface.set_alpha(shadow_alpha)
-                        shadow_surface.blit(shadow, (0, 0))
-                        screen.blit(shadow_surface, 
-                                  (WIDTH // 2 - shadow.get_width() // 2 + offset_x, 
-                                   title_y + offset_y))
+        title.draw_shadow(screen, title_y)
         
         # Capa exterior roja pulsante
-        for i in range(3):
-            glow_alpha = int((100 - i * 30) * (0.5 + 0.5 * math.sin(elapsed / 150)))
-            outer_glow = arcade_font_large.render(title_text, True, (blink, 0, 0))
-            glow_surface = pygame.Surface(outer_glow.get_size(), pygame.SRCALPHA)
-            glow_surface.set_alpha(glow_alpha)
-            glow_surface.blit(outer_glow, (0, 0))
-            offset = i * 2
-            screen.blit(glow_surface, 
-                      (WIDTH // 2 - outer_glow.get_width() // 2 - offset, 
-                       title_y - offset))
-        
-        # Capa principal roja
-        main_text = arcade_font_large.render(title_text, True, (blink, 0, 0))
-        screen.blit(main_text, (WIDTH // 2 - main_text.get_width() // 2, title_y))
-        
-        # Capa interior blanca pulsante
-        inner_glow = arcade_font_large.render(title_text, True, (255, 255, 255))
-        inner_surface = pygame.Surface(inner_glow.get_size(), pygame.SRCALPHA)
-        inner_alpha = int(blink_fast * 0.5)
-        inner_surface.set_alpha(inner_alpha)
-        inner_surface.blit(inner_glow, (0, 0))
-        screen.blit(inner_surface, (WIDTH // 2 - main_text.get_width() // 2, title_y))
+        glow_pulse = 0.5 + 0.5 * math.sin(elapsed / 150)
+        title.draw_glow(screen, title_y, (blink, 0, 0), [int((100 - i * 30) * glow_pulse) for i in range(3)])
         
-        # Bordes arcade
-        border_thickness = 3
-        border_glow = int(80 + 100 * math.sin(elapsed / 25))
-        border_glow = max(0, min(255, border_glow))
-        border_glow_color = (border_glow, 0, 0)
+        # Capa principal roja y capa interior blanca pulsante
+        title.draw_text(screen, title_y, (blink, 0, 0), int(blink_fast * 0.5))
         
-        pygame.draw.rect(screen, border_glow_color, (0, 0, WIDTH, border_thickness))
-        pygame.draw.rect(screen, border_glow_color, (0, HEIGHT - border_thickness, WIDTH, border_thickness))
-        pygame.draw.rect(screen, border_glow_color, (0, 0, border_thickness, HEIGHT))
-        pygame.draw.rect(screen, border_glow_color, (WIDTH - border_thickness, 0, border_thickness, HEIGHT))
+        # Bordes arcade
+        draw_arcade_border(screen, elapsed, lambda glow: (glow, 0, 0))
         
         pygame.display.flip()
     
@@ -2418,191 +3227,81 @@ def show_game_over_screen():
 
 def show_game_stats_screen(score, wave, enemies_killed, combo_max):
     """Pantalla de estadísticas finales con opciones"""
-    menu_stars = [Star() for _ in range(150)]
+    menu_stars = Starfield(150)
+    
+    # Posición de la partida entre todas las guardadas
+    ranks = score_rank_index()
+    if ranks.total:
+        rank_text = f"{ranks.rank(score):,} de {ranks.total:,} (top {ranks.top_percent(score)}%)"
+    else:
+        rank_text = "-"
     menu_time = 0
-    selected_option = 0  # 0 = volver a jugar, 1 = menu principal
-    option_animations = [0.0, 0.0]
+    
+    # Título, caja y líneas de estadísticas, renderizados una vez
+    title = MenuLabel(arcade_font_medium, "ESTADISTICAS FINALES", (100, 200, 255), outline=2)
+    box_x = 100
+    box_y = 120
+    box_width = WIDTH - 200
+    box_height = 300
+    box_padding = 30
+    panel = MenuPanel((box_x, box_y, box_width, box_height), lambda glow: (100, glow // 2, 255))
+    
+    stats = [
+        ("PUNTUACION FINAL", f"{score:,}", (255, 255, 100)),
+        ("ONDA ALCANZADA", f"{wave}", (100, 255, 255)),
+        ("ENEMIGOS ELIMINADOS", f"{enemies_killed:,}", (255, 200, 100)),
+        ("COMBO MAXIMO", f"{combo_max}", (255, 100, 255)),
+        ("POSICION", rank_text, (100, 255, 100)),
+    ]
+    stat_lines = [(MenuLabel(small_font, label + ":", (200, 200, 200)), MenuLabel(small_font, value, color))
+                  for label, value, color in stats]
+    
+    # Botones: 0 = volver a jugar, 1 = menu principal
+    button_width = 300
+    button_spacing = 20
+    buttons_y = box_y + box_height + 40
+    buttons = ButtonGroup([
+        MenuButton("VOLVER A JUGAR", (WIDTH // 2 - button_width - button_spacing // 2, buttons_y, button_width, 50),
+                   ((15, 25, 15), (20, 40, 20)), lambda i: (0, i, 255), lambda i: (0, i, 255, i // 2),
+                   (100, 255, 100)),
+        MenuButton("MENU PRINCIPAL", (WIDTH // 2 + button_spacing // 2, buttons_y, button_width, 50),
+                   ((25, 15, 15), (40, 20, 20)), lambda i: (255, i // 2, 0), lambda i: (255, i // 2, 0, i // 2),
+                   (255, 100, 100)),
+    ])
     
     while True:
         clock.tick(60)
         menu_time += 1
         
         # Actualizar estrellas
-        for star in menu_stars:
-            star.update(1)
+        menu_stars.update(1)
         
         # Dibujar fondo
         screen.fill(BLACK)
         
         # Dibujar estrellas
-        for star in menu_stars:
-            star.draw(screen)
+        menu_stars.draw(screen)
         
         # Título "ESTADISTICAS FINALES"
-        title_text = "ESTADISTICAS FINALES"
-        title_y = 50
-        blink = int(255 * (0.8 + 0.2 * math.sin(menu_time / 30)))
-        
-        # Sombra del título
-        for offset_x in range(-2, 3):
-            for offset_y in range(-2, 3):
-                if offset_x != 0 or offset_y != 0:
-                    shadow = arcade_font_medium.render(title_text, True, (0, 0, 0))
-                    screen.blit(shadow, (WIDTH // 2 - shadow.get_width() // 2 + offset_x, 
-                                       title_y + offset_y))
-        
-        # Título principal
-        title_color = (100, 200, 255)
-        title_surface = arcade_font_medium.render(title_text, True, title_color)
-        screen.blit(title_surface, (WIDTH // 2 - title_surface.get_width() // 2, title_y))
+        title.draw_centered(screen, 50)
         
         # Caja de estadísticas
-        box_x = 100
-        box_y = 120
-        box_width = WIDTH - 200
-        box_height = 300
-        box_padding = 30
-        
-        # Fondo de la caja
-        shadow_offset = 5
-        pygame.draw.rect(screen, (0, 0, 0), (box_x + shadow_offset, box_y + shadow_offset, box_width, box_height))
-        pygame.draw.rect(screen, (15, 15, 25), (box_x, box_y, box_width, box_height))
-        pygame.draw.rect(screen, (30, 30, 40), (box_x + 2, box_y + 2, box_width - 4, box_height - 4), 1)
-        box_glow = int(100 + 100 * math.sin(menu_time / 40))
-        box_glow = max(0, min(255, box_glow))
-        pygame.draw.rect(screen, (100, box_glow // 2, 255), (box_x, box_y, box_width, box_height), 4)
+        panel.draw(screen, menu_time)
         
-        # Estadísticas
+        # Estadísticas: etiqueta a la izquierda y valor a la derecha
         stats_y = box_y + box_padding
         line_height = 40
-        
-        stats = [
-            ("PUNTUACION FINAL", f"{score:,}", (255, 255, 100)),
-            ("ONDA ALCANZADA", f"{wave}", (100, 255, 255)),
-            ("ENEMIGOS ELIMINADOS", f"{enemies_killed:,}", (255, 200, 100)),
-            ("COMBO MAXIMO", f"{combo_max}", (255, 100, 255)),
-        ]
-        
-        for label, value, color in stats:
-            # Etiqueta
-            label_surface = small_font.render(label + ":", True, (200, 200, 200))
-            screen.blit(label_surface, (box_x + box_padding, stats_y))
-            
-            # Valor
-            value_surface = small_font.render(value, True, color)
-            screen.blit(value_surface, (box_x + box_width - box_padding - value_surface.get_width(), stats_y))
-            
+        for label, value in stat_lines:
+            label.draw(screen, box_x + box_padding, stats_y)
+            value.draw(screen, box_x + box_width - box_padding - value.width, stats_y)
             stats_y += line_height
         
-        # Actualizar animaciones
-        for i in range(2):
-            if i == selected_option:
-                option_animations[i] += 0.1
-            else:
-                option_animations[i] = 0
-        
         # Botones
-        button_width = 300
-        button_height = 50
-        button_spacing = 20
-        buttons_y = box_y + box_height + 40
-        
-        # Botón VOLVER A JUGAR
-        play_again_x = WIDTH // 2 - button_width - button_spacing // 2
-        play_again_y = buttons_y
-        
-        play_again_glow_intensity = int(100 + 155 * math.sin(option_animations[0] * 2)) if selected_option == 0 else 50
-        play_again_glow_intensity = max(0, min(255, play_again_glow_intensity))
-        
-        if selected_option == 0:
-            play_again_glow_size = int(button_width * (1.0 + 0.1 * math.sin(option_animations[0]))), int(button_height * (1.0 + 0.1 * math.sin(option_animations[0])))
-            play_again_glow_offset_x = (play_again_glow_size[0] - button_width) // 2
-            play_again_glow_offset_y = (play_again_glow_size[1] - button_height) // 2
-            play_again_glow_surf = pygame.Surface(play_again_glow_size, pygame.SRCALPHA)
-            play_again_glow_color = (0, play_again_glow_intensity, 255, play_again_glow_intensity // 2)
-            pygame.draw.rect(play_again_glow_surf, play_again_glow_color, 
-                           (0, 0, play_again_glow_size[0], play_again_glow_size[1]))
-            screen.blit(play_again_glow_surf, (play_again_x - play_again_glow_offset_x, play_again_y - play_again_glow_offset_y))
-        
-        play_again_bg_color = (20, 40, 20) if selected_option == 0 else (15, 25, 15)
-        pygame.draw.rect(screen, play_again_bg_color, 
-                        (play_again_x, play_again_y, button_width, button_height))
-        pygame.draw.rect(screen, (0, play_again_glow_intensity, 255), 
-                        (play_again_x, play_again_y, button_width, button_height), 3)
-        
-        play_again_text_str = "> VOLVER A JUGAR <" if selected_option == 0 else "  VOLVER A JUGAR  "
-        play_again_color = (100, 255, 100) if selected_option == 0 else (180, 180, 180)
-        play_again_color = (int(play_again_color[0] * (0.9 + 0.1 * math.sin(option_animations[0] * 3))),
-                           int(play_again_color[1] * (0.9 + 0.1 * math.sin(option_animations[0] * 3))),
-                           int(play_again_color[2] * (0.9 + 0.1 * math.sin(option_animations[0] * 3))))
-        
-        for i in range(3):
-            play_again_shadow = small_font.render(play_again_text_str, True, (0, 0, 0))
-            shadow_surf = pygame.Surface(play_again_shadow.get_size(), pygame.SRCALPHA)
-            shadow_surf.set_alpha(100 - i * 30)
-            shadow_surf.blit(play_again_shadow, (0, 0))
-            play_again_shadow_x = play_again_x + (button_width - play_again_shadow.get_width()) // 2 + i
-            play_again_shadow_y = play_again_y + (button_height - play_again_shadow.get_height()) // 2 + i
-            screen.blit(shadow_surf, (play_again_shadow_x, play_again_shadow_y))
-        
-        play_again_surface = small_font.render(play_again_text_str, True, play_again_color)
-        play_again_text_x = play_again_x + (button_width - play_again_surface.get_width()) // 2
-        play_again_text_y = play_again_y + (button_height - play_again_surface.get_height()) // 2
-        screen.blit(play_again_surface, (play_again_text_x, play_again_text_y))
-        
-        # Botón MENÚ PRINCIPAL
-        main_menu_x = WIDTH // 2 + button_spacing // 2
-        main_menu_y = buttons_y
-        
-        main_menu_glow_intensity = int(100 + 155 * math.sin(option_animations[1] * 2)) if selected_option == 1 else 50
-        main_menu_glow_intensity = max(0, min(255, main_menu_glow_intensity))
-        
-        if selected_option == 1:
-            main_menu_glow_size = int(button_width * (1.0 + 0.1 * math.sin(option_animations[1]))), int(button_height * (1.0 + 0.1 * math.sin(option_animations[1])))
-            main_menu_glow_offset_x = (main_menu_glow_size[0] - button_width) // 2
-            main_menu_glow_offset_y = (main_menu_glow_size[1] - button_height) // 2
-            main_menu_glow_surf = pygame.Surface(main_menu_glow_size, pygame.SRCALPHA)
-            main_menu_glow_color = (255, main_menu_glow_intensity // 2, 0, main_menu_glow_intensity // 2)
-            pygame.draw.rect(main_menu_glow_surf, main_menu_glow_color, 
-                           (0, 0, main_menu_glow_size[0], main_menu_glow_size[1]))
-            screen.blit(main_menu_glow_surf, (main_menu_x - main_menu_glow_offset_x, main_menu_y - main_menu_glow_offset_y))
-        
-        main_menu_bg_color = (40, 20, 20) if selected_option == 1 else (25, 15, 15)
-        pygame.draw.rect(screen, main_menu_bg_color, 
-                        (main_menu_x, main_menu_y, button_width, button_height))
-        pygame.draw.rect(screen, (255, main_menu_glow_intensity // 2, 0), 
-                        (main_menu_x, main_menu_y, button_width, button_height), 3)
-        
-        main_menu_text_str = "> MENU PRINCIPAL <" if selected_option == 1 else "  MENU PRINCIPAL  "
-        main_menu_color = (255, 100, 100) if selected_option == 1 else (180, 180, 180)
-        main_menu_color = (int(main_menu_color[0] * (0.9 + 0.1 * math.sin(option_animations[1] * 3))),
-                           int(main_menu_color[1] * (0.9 + 0.1 * math.sin(option_animations[1] * 3))),
-                           int(main_menu_color[2] * (0.9 + 0.1 * math.sin(option_animations[1] * 3))))
-        
-        for i in range(3):
-            main_menu_shadow = small_font.render(main_menu_text_str, True, (0, 0, 0))
-            shadow_surf = pygame.Surface(main_menu_shadow.get_size(), pygame.SRCALPHA)
-            shadow_surf.set_alpha(100 - i * 30)
-            shadow_surf.blit(main_menu_shadow, (0, 0))
-            main_menu_shadow_x = main_menu_x + (button_width - main_menu_shadow.get_width()) // 2 + i
-            main_menu_shadow_y = main_menu_y + (button_height - main_menu_shadow.get_height()) // 2 + i
-            screen.blit(shadow_surf, (main_menu_shadow_x, main_menu_shadow_y))
-        
-        main_menu_surface = small_font.render(main_menu_text_str, True, main_menu_color)
-        main_menu_text_x = main_menu_x + (button_width - main_menu_surface.get_width()) // 2
-        main_menu_text_y = main_menu_y + (button_height - main_menu_surface.get_height()) // 2
-        screen.blit(main_menu_surface, (main_menu_text_x, main_menu_text_y))
+        buttons.update()
+        buttons.draw(screen)
         
         # Bordes arcade
-        border_thickness = 3
-        border_glow = int(80 + 100 * math.sin(menu_time / 25))
-        border_glow = max(0, min(255, border_glow))
-        border_glow_color = (100, border_glow, 255)
-        
-        pygame.draw.rect(screen, border_glow_color, (0, 0, WIDTH, border_thickness))
-        pygame.draw.rect(screen, border_glow_color, (0, HEIGHT - border_thickness, WIDTH, border_thickness))
-        pygame.draw.rect(screen, border_glow_color, (0, 0, border_thickness, HEIGHT))
-        pygame.draw.rect(screen, border_glow_color, (WIDTH - border_thickness, 0, border_thickness, HEIGHT))
+        draw_arcade_border(screen, menu_time, lambda glow: (100, glow, 255))
         
         pygame.display.flip()
         
@@ -2612,13 +3311,11 @@ def show_game_stats_screen(score, wave, enemies_killed, combo_max):
                 exit()
             if event.type == KEYDOWN:
                 if event.key == K_LEFT or event.key == K_a:
-                    selected_option = 0
-                    option_animations[selected_option] = 0
+                    buttons.select(0)
                 elif event.key == K_RIGHT or event.key == K_d:
-                    selected_option = 1
-                    option_animations[selected_option] = 0
+                    buttons.select(1)
                 elif event.key == K_RETURN:
-                    if selected_option == 0:
+                    if buttons.selected == 0:
                         return "restart"
                     else:
                         return "main_menu"
@@ -2631,6 +3328,254 @@ def show_controls_message():
     pygame.display.flip()
     pygame.time.wait(2000)
 
+def step_game(state, command):
+    """Avanza la partida un frame con la entrada 'command'.
+    Devuelve los eventos del paso ("shoot", "missile", "explosion", "shield",
+    "powerup", "wave_complete", "game_over") para que quien dibuja reproduzca
+    los sonidos. No toca la pantalla, así que puede ejecutarse sin ventana."""
+    events = []
+    if state.game_over:
+        return events
+    state.frame += 1
+    player = state.player
+    bullets = state.bullets
+    missiles = state.missiles
+    enemies = state.enemies
+    powerups = state.powerups
+    particles = state.particles
+    
+    # Disparo
+    if command.fire and player.shoot_cooldown <= 0:
+        bullet_speed = -5 - (state.score // 150)
+        
+        if player.weapon_type == "normal":
+            bullets.spawn(player.rect.centerx, player.rect.top, bullet_speed)
+            player.shoot_cooldown = 15
+            
+        elif player.weapon_type == "rapid":
+            bullets.spawn(player.rect.centerx, player.rect.top, bullet_speed)
+            player.shoot_cooldown = 5
+            
+        elif player.weapon_type == "spread":
+            for angle in [-20, -10, 0, 10, 20]:
+                bullets.spawn(player.rect.centerx, player.rect.top, bullet_speed, BULLET_SPREAD, angle)
+            player.shoot_cooldown = 20
+            
+        elif player.weapon_type == "laser":
+            bullets.spawn(player.rect.centerx, player.rect.top, bullet_speed * 2, BULLET_LASER)
+            player.shoot_cooldown = 10
+        events.append("shoot")
+    
+    if command.missile and player.missiles_available > 0 and player.missile_cooldown <= 0:
+        missiles.add(state.missile_pool.acquire(player.rect.centerx, player.rect.top))
+        player.missiles_available -= 1
+        player.missile_cooldown = 30
+        events.append("missile")
+    
+    # Sistema de ondas
+    if state.enemies_killed_this_wave >= state.enemies_per_wave and len(enemies) == 0:
+        state.wave += 1
+        state.enemies_killed_this_wave = 0
+        state.enemies_per_wave = 10 + (state.wave - 1) * 5
+        state.wave_complete = True
+        state.wave_message_timer = 180  # 3 segundos
+        # Añadir bonus de puntos por completar onda
+        state.score += state.wave * 50
+        events.append("wave_complete")
+    
+    # Spawn de enemigos basado en la onda
+    if not state.wave_complete:
+        state.enemy_spawn_timer += 1
+        # Spawn rate más balanceado: reduce más gradualmente
+        # Fórmula más suave: empieza en 70 frames y reduce 2.5 por onda
+        # Esto hace que sea más gradual y jugable
+        base_spawn_rate = max(70 - int(state.wave * 2.5), 25)
+        # Límite mínimo: nunca más rápido que 25 frames entre spawns
+        # Esto asegura que el juego siga siendo jugable incluso en ondas altas
+        base_spawn_rate = max(base_spawn_rate, 25)
+        if state.enemy_spawn_timer >= base_spawn_rate:
+            enemies.add(state.enemy_pool.acquire(state.rng))
+            state.enemy_spawn_timer = 0
+    elif state.wave_message_timer > 0:
+        state.wave_message_timer -= 1
+        if state.wave_message_timer == 0:
+            state.wave_complete = False
+    
+    # Spawn de power-ups
+    state.powerup_spawn_timer += 1
+    if state.powerup_spawn_timer >= 600:  # Cada 10 segundos aproximadamente
+        power_types = ["shield", "speed", "rapid", "spread", "laser", "missile"]
+        powerups.add(state.powerup_pool.acquire(state.rng.choice(power_types), state.rng))
+        state.powerup_spawn_timer = 0
+    
+    player.update(state.score, command)
+    bullets.update()
+    missiles.update()
+    enemies.update()
+    powerups.update()
+    
+    # Colisiones balas-enemigos
+    hits = bullets.collide(enemies)
+    for enemy in hits:
+        enemy.kill()
+        state.combo += 1
+        state.combo_max = max(state.combo_max, state.combo)
+        state.combo_timer = 180  # 3 segundos para mantener combo
+        base_points = 10
+        combo_bonus = min(state.combo * 2, 50)  # Bonus máximo de 50
+        points = base_points + combo_bonus
+        state.score += points
+        state.enemies_killed_this_wave += 1
+        state.total_enemies_killed += 1
+        events.append("explosion")
+        # Crear partículas al destruir enemigo
+        particles.emit_burst(enemy.rect.centerx, enemy.rect.centery, 5, [YELLOW])
+        if not state.wave_complete:
+            enemies.add(state.enemy_pool.acquire(state.rng))
+    
+    # Actualizar combo timer
+    if state.combo_timer > 0:
+        state.combo_timer -= 1
+    else:
+        state.combo = 0
+    
+    # Colisiones misiles-enemigos (explosión)
+    enemy_grid = None
+    if state.enemy_grid is not None and len(missiles) >= SPATIAL_HASH_MIN_QUERIES:
+        enemy_grid = state.enemy_grid
+        enemy_grid.rebuild(enemies)
+    missile_hits = {}
+    for missile in missiles:
+        touched = grid_spritecollide(missile, enemies, False, enemy_grid)
+        if touched:
+            missile_hits[missile] = touched
+            missile.kill()
+    blasts = []
+    for missile in missile_hits:
+        explosion_radius = missile.explode()
+        blasts.append((missile.rect.centerx, missile.rect.centery, explosion_radius))
+        state.explosions.append(Explosion(missile.rect.centerx, missile.rect.centery, explosion_radius, particles))
+        events.append("explosion")
+    # Destruir enemigos en el radio de todas las explosiones del frame a la vez
+    for enemy in sprites_in_blasts(enemies, blasts):
+        state.score += 10
+        state.enemies_killed_this_wave += 1
+        state.total_enemies_killed += 1
+        # Crear partículas
+        particles.emit_burst(enemy.rect.centerx, enemy.rect.centery, 8, [ORANGE])
+        enemy.kill()
+    
+    # Actualizar explosiones y partículas
+    state.explosions = [e for e in state.explosions if e.update()]
+    particles.update()
+    
+    # Colisiones jugador-powerups
+    powerup_hits = pygame.sprite.spritecollide(player, powerups, True)
+    for powerup in powerup_hits:
+        if powerup.power_type == "shield":
+            player.activate_shield(600)
+            events.append("shield")
+        elif powerup.power_type == "speed":
+            player.activate_speed_boost(600)
+            events.append("powerup")
+        elif powerup.power_type == "rapid":
+            player.activate_weapon("rapid", 600)
+            events.append("powerup")
+        elif powerup.power_type == "spread":
+            player.activate_weapon("spread", 600)
+            events.append("powerup")
+        elif powerup.power_type == "laser":
+            player.activate_weapon("laser", 600)
+            events.append("powerup")
+        elif powerup.power_type == "missile":
+            player.add_missiles(3)
+            events.append("powerup")
+    
+    # Colisiones jugador-enemigos
+    hits_player = pygame.sprite.spritecollide(player, enemies, True)
+    if hits_player:
+        # Solo procesar daño si no está invencible
+        if not player.invincible:
+            if player.shield_active:
+                player.shield_active = False
+                player.shield_time = 0
+                events.append("explosion")
+            else:
+                player.lives -= 1
+                # Activar invencibilidad después de recibir daño (3 segundos = 180 frames)
+                player.activate_invincibility(180)
+                events.append("explosion")
+                if player.lives == 0:
+                    state.game_over = True
+                    events.append("game_over")
+    
+    # Los objetos liberados en este paso ya pueden reutilizarse
+    for pool in state.object_pools:
+        pool.flush()
+    return events
+
+def play_game_sounds(events):
+    """Reproduce los sonidos de los eventos devueltos por step_game"""
+    for event in events:
+        if event in SOUND_CATEGORIES:
+            sound_manager.play(event)
+
+def draw_game(surface, state, hud, overlays=False, interp=1.0):
+    """Dibuja la partida (sin el fondo) y devuelve las zonas modificadas.
+    overlays añade el mensaje de onda completada y la ayuda de controles;
+    interp interpola las posiciones entre el paso anterior (0) y el actual (1)"""
+    player = state.player
+    dirty_rects = []
+    
+    # Dibujar jugador con efecto de invencibilidad
+    dirty_rects.append(player.draw(surface, interp))
+    dirty_rects.append(player.draw_shield(surface, interp))
+    dirty_rects.extend(state.bullets.draw(surface, interp))
+    for group in (state.missiles, state.enemies):
+        dirty_rects.extend(surface.blits([(sprite.image, sprite.interpolated_rect(interp)) for sprite in group]))
+    
+    # Dibujar power-ups con efecto personalizado
+    for powerup in state.powerups:
+        dirty_rects.append(powerup.draw(surface, interp))
+    
+    # Dibujar explosiones y partículas
+    for explosion in state.explosions:
+        dirty_rects.append(explosion.draw(surface))
+    dirty_rects.extend(state.particles.draw(surface))
+    
+    # UI
+    if overlays:
+        dirty_rects.extend(hud.draw(surface, player, state.score, state.wave, state.enemies_killed_this_wave,
+                                    state.enemies_per_wave, state.combo, state.wave_message_timer,
+                                    show_controls=True))
+    else:
+        dirty_rects.extend(hud.draw(surface, player, state.score, state.wave, state.enemies_killed_this_wave,
+                                    state.enemies_per_wave, state.combo))
+    return dirty_rects
+
+def replay_game(replay):
+    """Vuelve a simular una repetición sin pantalla, tan rápido como se pueda,
+    y devuelve el GameState final"""
+    state = GameState(replay.seed)
+    for command, paused in replay.commands():
+        step_game(state, command)
+    return state
+
+def verify_replay(path):
+    """Repite la partida grabada en 'path' y comprueba que score, wave y
+    total_enemies_killed coinciden con los grabados"""
+    replay = Replay.load(path)
+    start = time.perf_counter()
+    state = replay_game(replay)
+    elapsed = max(time.perf_counter() - start, 1e-9)
+    result = (state.score, state.wave, state.total_enemies_killed)
+    print(f"Repetición: {replay.frames} frames en {elapsed:.2f} s ({replay.frames / elapsed:.0f} frames/s)")
+    print(f"Esperado (score, wave, enemigos): {replay.result}")
+    print(f"Obtenido (score, wave, enemigos): {result}")
+    ok = result == replay.result
+    print("OK" if ok else "DIFERENCIA")
+    return ok
+
 def main_game():
     # Reproducir música de juego si existe
     try:
@@ -2640,145 +3585,53 @@ def main_game():
     except:
         pass  # Si no existe el archivo, continuar sin música
     
-    player = Player()
-    player_group = pygame.sprite.Group()
-    player_group.add(player)
+    state = GameState(GAME_SEED)
+    stars = Starfield(100, state.seed)
+    hud = Hud()
+    renderer = DirtyRectRenderer(screen)
+    overlay = ScanlineOverlay(line_alpha=15) if GAMEPLAY_SCANLINES else None
+    replay = Replay(state.seed) if REPLAY_RECORD_PATH else None
+    try:
+        return _run_game_loop(state, stars, hud, renderer, overlay, replay)
+    finally:
+        if replay is not None:
+            replay.finish(state)
+            replay.save(REPLAY_RECORD_PATH)
 
-    bullets = pygame.sprite.Group()
-    missiles = pygame.sprite.Group()
-    enemies = pygame.sprite.Group()
-    powerups = pygame.sprite.Group()
-    explosions = []
-    particles = []
-    stars = [Star() for _ in range(100)]
-    
-    score = 0
+def _run_game_loop(state, stars, hud, renderer, overlay, replay):
     running = True
-    powerup_spawn_timer = 0
-    enemy_spawn_timer = 0
-    combo = 0
-    combo_max = 0
-    combo_timer = 0
-    wave = 1
-    enemies_killed_this_wave = 0
-    total_enemies_killed = 0
-    enemies_per_wave = 10
-    wave_complete = False
-    wave_message_timer = 0
-
+    accumulator = 0.0
+    # Pulsaciones pendientes hasta el siguiente paso de simulación
+    fire = False
+    launch_missile = False
+    paused = False
+    clock.tick()
     while running:
-        clock.tick(FPS)
-        dt = clock.get_time()
+        accumulator += clock.tick(GAME_RENDER_FPS)
         
         for event in pygame.event.get():
             if event.type == QUIT:
                 running = False
             if event.type == KEYDOWN:
                 if event.key == K_SPACE:
-                    if player.shoot_cooldown <= 0:
-                        bullet_speed = -5 - (score // 150)
-                        
-                        if player.weapon_type == "normal":
-                            bullets.add(Bullet(player.rect.centerx, player.rect.top, bullet_speed))
-                            player.shoot_cooldown = 15
-                            if shoot_sound:
-                                shoot_sound.play()
-                            
-                        elif player.weapon_type == "rapid":
-                            bullets.add(Bullet(player.rect.centerx, player.rect.top, bullet_speed))
-                            player.shoot_cooldown = 5
-                            if shoot_sound:
-                                shoot_sound.play()
-                            
-                        elif player.weapon_type == "spread":
-                            for angle in [-20, -10, 0, 10, 20]:
-                                bullets.add(Bullet(player.rect.centerx, player.rect.top, bullet_speed, YELLOW, (6, 12), angle))
-                            player.shoot_cooldown = 20
-                            if shoot_sound:
-                                shoot_sound.play()
-                            
-                        elif player.weapon_type == "laser":
-                            bullets.add(Bullet(player.rect.centerx, player.rect.top, bullet_speed * 2, RED, (8, 20)))
-                            player.shoot_cooldown = 10
-                            if shoot_sound:
-                                shoot_sound.play()
-                
-                if event.key == K_m and player.missiles_available > 0 and player.missile_cooldown <= 0:
-                    missiles.add(Missile(player.rect.centerx, player.rect.top))
-                    player.missiles_available -= 1
-                    player.missile_cooldown = 30
-                    if missile_sound:
-                        missile_sound.play()
-                    elif shoot_sound:
-                        shoot_sound.play()
+                    fire = True
+                if event.key == K_m:
+                    launch_missile = True
                     
                 if event.key == K_ESCAPE:
+                    paused = True
                     # Capturar el estado actual del juego
                     game_surface = pygame.Surface((WIDTH, HEIGHT))
                     game_surface.fill(BLACK)
-                    
-                    # Dibujar estrellas de fondo
-                    for star in stars:
-                        star.draw(game_surface)
-                    
-                    # Dibujar jugador con efecto de invencibilidad
-                    player.draw(game_surface)
-                    player.draw_shield(game_surface)
-                    bullets.draw(game_surface)
-                    missiles.draw(game_surface)
-                    enemies.draw(game_surface)
-                    
-                    # Dibujar power-ups
-                    for powerup in powerups:
-                        powerup.draw(game_surface)
-                    
-                    # Dibujar explosiones y partículas
-                    for explosion in explosions:
-                        explosion.draw(game_surface)
-                    for particle in particles:
-                        particle.draw(game_surface)
-                    
-                    # UI
-                    lives_text = font.render(f"Vidas: {player.lives}", True, WHITE)
-                    game_surface.blit(lives_text, (10, 50))
-                    score_text = font.render(f"Puntuacion: {score}", True, WHITE)
-                    game_surface.blit(score_text, (10, 10))
-                    
-                    # Wave indicator
-                    wave_text = small_font.render(f"ONDA {wave}", True, CYAN)
-                    game_surface.blit(wave_text, (WIDTH - wave_text.get_width() - 10, 10))
-                    progress_text = tiny_font.render(f"{enemies_killed_this_wave}/{enemies_per_wave}", True, WHITE)
-                    game_surface.blit(progress_text, (WIDTH - progress_text.get_width() - 10, 40))
-                    
-                    # Combo indicator
-                    if combo > 1:
-                        combo_text = small_font.render(f"COMBO x{combo}!", True, YELLOW)
-                        game_surface.blit(combo_text, (WIDTH // 2 - combo_text.get_width() // 2, 50))
-                    
-                    # Indicadores de power-ups
-                    y_offset = 100
-                    if player.shield_active:
-                        shield_text = tiny_font.render(f"ESCUDO: {player.shield_time // 60}s", True, CYAN)
-                        game_surface.blit(shield_text, (10, y_offset))
-                        y_offset += 20
-                    
-                    if player.speed_boost_active:
-                        speed_text = tiny_font.render(f"VELOCIDAD: {player.speed_boost_time // 60}s", True, GREEN)
-                        game_surface.blit(speed_text, (10, y_offset))
-                        y_offset += 20
-                    
-                    if player.weapon_type != "normal":
-                        weapon_names = {"rapid": "RAPIDO", "spread": "DISPERSION", "laser": "LASER"}
-                        weapon_text = tiny_font.render(f"ARMA: {weapon_names[player.weapon_type]} ({player.weapon_time // 60}s)", True, YELLOW)
-                        game_surface.blit(weapon_text, (10, y_offset))
-                        y_offset += 20
-                    
-                    if player.missiles_available > 0:
-                        missile_text = tiny_font.render(f"MISILES: {player.missiles_available} (M)", True, ORANGE)
-                        game_surface.blit(missile_text, (10, y_offset))
+                    stars.draw(game_surface)
+                    draw_game(game_surface, state, hud)
                     
                     # Mostrar menú de pausa
                     pause_action = show_pause_menu(game_surface)
+                    renderer.invalidate()
+                    # El tiempo en el menú no cuenta para la simulación
+                    clock.tick()
+                    accumulator = 0.0
                     
                     if pause_action == "restart":
                         # Reiniciar la partida
@@ -2790,262 +3643,116 @@ def main_game():
                     running = False
                     # Si es "resume", simplemente continúa el juego
         
-        # Sistema de ondas
-        if enemies_killed_this_wave >= enemies_per_wave and len(enemies) == 0:
-            wave += 1
-            enemies_killed_this_wave = 0
-            enemies_per_wave = 10 + (wave - 1) * 5
-            wave_complete = True
-            wave_message_timer = 180  # 3 segundos
-            # Añadir bonus de puntos por completar onda
-            score += wave * 50
-            # Sonido de onda completada
-            if wave_complete_sound:
-                wave_complete_sound.play()
-        
-        # Spawn de enemigos basado en la onda
-        if not wave_complete:
-            enemy_spawn_timer += 1
-            # Spawn rate más balanceado: reduce más gradualmente
-            # Fórmula más suave: empieza en 70 frames y reduce 2.5 por onda
-            # Esto hace que sea más gradual y jugable
-            base_spawn_rate = max(70 - int(wave * 2.5), 25)
-            # Límite mínimo: nunca más rápido que 25 frames entre spawns
-            # Esto asegura que el juego siga siendo jugable incluso en ondas altas
-            base_spawn_rate = max(base_spawn_rate, 25)
-            if enemy_spawn_timer >= base_spawn_rate:
-                enemies.add(Enemy())
-                enemy_spawn_timer = 0
-        elif wave_message_timer > 0:
-            wave_message_timer -= 1
-            if wave_message_timer == 0:
-                wave_complete = False
-        
-        # Spawn de power-ups
-        powerup_spawn_timer += 1
-        if powerup_spawn_timer >= 600:  # Cada 10 segundos aproximadamente
-            power_types = ["shield", "speed", "rapid", "spread", "laser", "missile"]
-            powerups.add(PowerUp(random.choice(power_types)))
-            powerup_spawn_timer = 0
-        
-        player_group.update(score)
-        bullets.update()
-        missiles.update()
-        enemies.update()
-        powerups.update()
-        
-        # Colisiones balas-enemigos
-        hits = pygame.sprite.groupcollide(enemies, bullets, True, True)
-        for enemy in hits:
-            combo += 1
-            combo_max = max(combo_max, combo)
-            combo_timer = 180  # 3 segundos para mantener combo
-            base_points = 10
-            combo_bonus = min(combo * 2, 50)  # Bonus máximo de 50
-            points = base_points + combo_bonus
-            score += points
-            enemies_killed_this_wave += 1
-            total_enemies_killed += 1
-            # Sonido de explosión (volumen reducido)
-            if explosion_sound:
-                explosion_sound.set_volume(0.3)  # Reducir volumen al 30%
-                explosion_sound.play()
-            # Crear partículas al destruir enemigo
-            for _ in range(5):
-                particles.append(Particle(enemy.rect.centerx, enemy.rect.centery, YELLOW))
-            if not wave_complete:
-                enemies.add(Enemy())
-        
-        # Actualizar combo timer
-        if combo_timer > 0:
-            combo_timer -= 1
-        else:
-            combo = 0
-        
-        # Colisiones misiles-enemigos (explosión)
-        missile_hits = pygame.sprite.groupcollide(missiles, enemies, True, False)
-        for missile in missile_hits:
-            explosion_radius = missile.explode()
-            explosions.append(Explosion(missile.rect.centerx, missile.rect.centery, explosion_radius))
-            # Sonido de explosión grande (volumen reducido)
-            if explosion_sound:
-                explosion_sound.set_volume(0.3)  # Reducir volumen al 30%
-                explosion_sound.play()
-            # Destruir enemigos en el radio de explosión
-            for enemy in enemies:
-                dx = enemy.rect.centerx - missile.rect.centerx
-                dy = enemy.rect.centery - missile.rect.centery
-                distance = math.sqrt(dx*dx + dy*dy)
-                if distance <= explosion_radius:
-                    score += 10
-                    enemies_killed_this_wave += 1
-                    total_enemies_killed += 1
-                    # Crear partículas
-                    for _ in range(8):
-                        particles.append(Particle(enemy.rect.centerx, enemy.rect.centery, ORANGE))
-                    enemy.kill()
-        
-        # Actualizar explosiones y partículas
-        explosions = [e for e in explosions if e.update()]
-        particles = [p for p in particles if p.update()]
+        # Pasos fijos de simulación para el tiempo transcurrido; si el frame
+        # ha sido muy lento se descarta el resto en lugar de acumular retraso
+        keys = pygame.key.get_pressed()
+        substeps = 0
+        while accumulator >= SIM_STEP_MS and not state.game_over:
+            if substeps == MAX_SUBSTEPS:
+                accumulator = 0.0
+                break
+            command = InputCommand.from_keys(keys, fire, launch_missile)
+            if replay is not None:
+                replay.record(command, paused)
+            fire = launch_missile = paused = False
+            play_game_sounds(step_game(state, command))
+            
+            # Actualizar estrellas
+            player = state.player
+            player_speed_factor = player.speed if player.speed_boost_active else player.base_speed
+            stars.update(player_speed_factor)
+            accumulator -= SIM_STEP_MS
+            substeps += 1
+        sound_manager.end_frame()
+        
+        if state.game_over:
+            pygame.mixer.music.stop()
+            # Guardar registro de la partida
+            save_game_record(state.score, state.wave, state.total_enemies_killed, state.combo_max)
+            # Mostrar pantalla de Game Over
+            show_game_over_screen()
+            # Mostrar pantalla de estadísticas y obtener acción del usuario
+            stats_action = show_game_stats_screen(state.score, state.wave, state.total_enemies_killed,
+                                                  state.combo_max)
+            if stats_action == "restart":
+                return "restart"
+            break
         
-        # Actualizar estrellas
-        player_speed_factor = player.speed if player.speed_boost_active else player.base_speed
-        for star in stars:
-            star.update(player_speed_factor)
-        
-        # Colisiones jugador-powerups
-        powerup_hits = pygame.sprite.spritecollide(player, powerups, True)
-        for powerup in powerup_hits:
-            if powerup.power_type == "shield":
-                player.activate_shield(600)
-                if shield_sound:
-                    shield_sound.play()
-                elif powerup_sound:
-                    powerup_sound.play()
-            elif powerup.power_type == "speed":
-                player.activate_speed_boost(600)
-                if powerup_sound:
-                    powerup_sound.play()
-            elif powerup.power_type == "rapid":
-                player.activate_weapon("rapid", 600)
-                if powerup_sound:
-                    powerup_sound.play()
-            elif powerup.power_type == "spread":
-                player.activate_weapon("spread", 600)
-                if powerup_sound:
-                    powerup_sound.play()
-            elif powerup.power_type == "laser":
-                player.activate_weapon("laser", 600)
-                if powerup_sound:
-                    powerup_sound.play()
-            elif powerup.power_type == "missile":
-                player.add_missiles(3)
-                if powerup_sound:
-                    powerup_sound.play()
-        
-        # Colisiones jugador-enemigos
-        hits_player = pygame.sprite.spritecollide(player, enemies, True)
-        if hits_player:
-            # Solo procesar daño si no está invencible
-            if not player.invincible:
-                if player.shield_active:
-                    player.shield_active = False
-                    player.shield_time = 0
-                    if explosion_sound:
-                        explosion_sound.set_volume(0.3)  # Reducir volumen al 30%
-                        explosion_sound.play()
-                else:
-                    player.lives -= 1
-                    # Activar invencibilidad después de recibir daño (3 segundos = 180 frames)
-                    player.activate_invincibility(180)
-                    if explosion_sound:
-                        explosion_sound.set_volume(0.3)  # Reducir volumen al 30%
-                        explosion_sound.play()
-                    if player.lives == 0:
-                        pygame.mixer.music.stop()
-                        # Guardar registro de la partida
-                        save_game_record(score, wave, total_enemies_killed, combo_max)
-                        # Mostrar pantalla de Game Over
-                        show_game_over_screen()
-                        # Mostrar pantalla de estadísticas y obtener acción del usuario
-                        stats_action = show_game_stats_screen(score, wave, total_enemies_killed, combo_max)
-                        if stats_action == "restart":
-                            return "restart"
-                        else:
-                            running = False
-        
-        # Dibujado
-        screen.fill(BLACK)
+        # Dibujado (se guardan las zonas modificadas para el modo de rects sucios)
+        renderer.begin_frame()
+        dirty_rects = []
         
         # Dibujar estrellas de fondo
-        for star in stars:
-            star.draw(screen)
-        
-        # Dibujar jugador con efecto de invencibilidad
-        player.draw(screen)
-        player.draw_shield(screen)
-        bullets.draw(screen)
-        missiles.draw(screen)
-        enemies.draw(screen)
-        
-        # Dibujar power-ups con efecto personalizado
-        for powerup in powerups:
-            powerup.draw(screen)
-        
-        # Dibujar explosiones y partículas
-        for explosion in explosions:
-            explosion.draw(screen)
-        for particle in particles:
-            particle.draw(screen)
-        
-        # UI
-        lives_text = font.render(f"Vidas: {player.lives}", True, WHITE)
-        screen.blit(lives_text, (10, 50))
-        score_text = font.render(f"Puntuacion: {score}", True, WHITE)
-        screen.blit(score_text, (10, 10))
-        
-        # Wave indicator
-        wave_text = small_font.render(f"ONDA {wave}", True, CYAN)
-        screen.blit(wave_text, (WIDTH - wave_text.get_width() - 10, 10))
-        progress_text = tiny_font.render(f"{enemies_killed_this_wave}/{enemies_per_wave}", True, WHITE)
-        screen.blit(progress_text, (WIDTH - progress_text.get_width() - 10, 40))
-        
-        # Wave complete message
-        if wave_message_timer > 0:
-            wave_complete_text = font.render(f"ONDA {wave - 1} COMPLETADA!", True, YELLOW)
-            text_rect = wave_complete_text.get_rect(center=(WIDTH // 2, HEIGHT // 2))
-            screen.blit(wave_complete_text, text_rect)
-        
-        # Combo indicator
-        if combo > 1:
-            combo_text = small_font.render(f"COMBO x{combo}!", True, YELLOW)
-            screen.blit(combo_text, (WIDTH // 2 - combo_text.get_width() // 2, 50))
-        
-        # Indicadores de power-ups
-        y_offset = 100
-        if player.shield_active:
-            shield_text = tiny_font.render(f"ESCUDO: {player.shield_time // 60}s", True, CYAN)
-            screen.blit(shield_text, (10, y_offset))
-            y_offset += 20
-        
-        if player.speed_boost_active:
-            speed_text = tiny_font.render(f"VELOCIDAD: {player.speed_boost_time // 60}s", True, GREEN)
-            screen.blit(speed_text, (10, y_offset))
-            y_offset += 20
-        
-        if player.weapon_type != "normal":
-            weapon_names = {"rapid": "RAPIDO", "spread": "DISPERSION", "laser": "LASER"}
-            weapon_text = tiny_font.render(f"ARMA: {weapon_names[player.weapon_type]} ({player.weapon_time // 60}s)", True, YELLOW)
-            screen.blit(weapon_text, (10, y_offset))
-            y_offset += 20
-        
-        if player.missiles_available > 0:
-            missile_text = tiny_font.render(f"MISILES: {player.missiles_available} (M)", True, ORANGE)
-            screen.blit(missile_text, (10, y_offset))
-        
-        # Instrucciones
-        controls_text = tiny_font.render("ESPACIO: Disparar | M: Misil", True, WHITE)
-        screen.blit(controls_text, (WIDTH - controls_text.get_width() - 10, HEIGHT - 40))
-        
-        pygame.display.flip()
+        dirty_rects.extend(stars.draw(screen))
+        # Fracción del siguiente paso ya transcurrida, para interpolar posiciones
+        interp = min(accumulator / SIM_STEP_MS, 1.0)
+        dirty_rects.extend(draw_game(screen, state, hud, overlays=True, interp=interp))
+        if overlay is not None:
+            dirty_rects.append(overlay.apply(screen, state.frame // 2))
+        
+        renderer.present(dirty_rects)
 
 def run_game():
-    # Mostrar pantalla de carga al iniciar
-    show_splash_screen()
+    init_game()
+    start_records_writer()
+    # Cargar los recursos en segundo plano mientras se muestra la pantalla de carga
+    loader = start_asset_loading()
+    show_splash_screen(loader)
+    if PROFILE_STARTUP:
+        print("\n".join(startup_report()))
     
     while True:
         if show_main_menu():
-            # Mostrar pantalla de carga antes de iniciar el juego
-            show_loading_screen()
+            # Mostrar pantalla de carga antes de iniciar el juego (termina en
+            # cuanto los recursos están listos, si se saltó la inicial)
+            show_loading_screen(loader)
             result = main_game()
             # Si se seleccionó reiniciar, volver a iniciar el juego sin pasar por el menú
             while result == "restart":
-                show_loading_screen()
+                show_loading_screen(loader)
                 result = main_game()
         else:
             break
+    loader.shutdown()
+    # Guardar los registros pendientes antes de salir
+    records_writer.close()
     pygame.quit()
     exit()
 
-run_game()
\ No newline at end of file
+def seed_arg(text):
+    """Semilla de --seed: las repeticiones la guardan en 64 bits sin signo y
+    GameState genera las aleatorias con 63, así que se admite 0 <= semilla < 2**63"""
+    try:
+        seed = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"semilla no válida: {text}")
+    if not 0 <= seed < 2 ** 63:
+        raise argparse.ArgumentTypeError(f"la semilla debe estar entre 0 y {2 ** 63 - 1}")
+    return seed
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Space Shooter")
+    parser.add_argument("--seed", type=seed_arg, help="semilla fija para las partidas")
+    parser.add_argument("--record", metavar="FICHERO",
+                        help="graba la repetición de la última partida en FICHERO")
+    parser.add_argument("--replay", metavar="FICHERO",
+                        help="repite sin pantalla la partida grabada y comprueba el resultado")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="muestra cuánto tarda cada fase del arranque hasta el primer frame")
+    return parser.parse_args(argv)
+
+mark_startup("importación")
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.replay:
+        try:
+            ok = verify_replay(args.replay)
+        except (OSError, ValueError) as e:
+            print(f"Error leyendo repetición: {e}")
+            sys.exit(1)
+        sys.exit(0 if ok else 1)
+    GAME_SEED = args.seed
+    REPLAY_RECORD_PATH = args.record
+    PROFILE_STARTUP = args.profile_startup
+    run_game()
@@ -108,19 +108,19 @@ $version = & $python --version
 Write-Host "Versión: $version" -ForegroundColor Green
 Write-Host ""
 
-# Verificar e instalar pygame
-Write-Host "Verificando pygame..." -ForegroundColor Cyan
-$pygameCheck = & $python -c "import pygame; print(pygame.__version__)" 2>&1
+# Verificar e instalar pygame y numpy
+Write-Host "Verificando pygame y numpy..." -ForegroundColor Cyan
+$pygameCheck = & $python -c "import pygame, numpy; print(pygame.__version__)" 2>&1
 if ($LASTEXITCODE -ne 0) {
-    Write-Host "pygame no está instalado. Instalando..." -ForegroundColor Yellow
+    Write-Host "pygame o numpy no están instalados. Instalando..." -ForegroundColor Yellow
     & $python -m pip install --upgrade pip
-    & $python -m pip install pygame
+    & $python -m pip install pygame numpy
     if ($LASTEXITCODE -ne 0) {
-        Write-Host "ERROR: No se pudo instalar pygame." -ForegroundColor Red
+        Write-Host "ERROR: No se pudo instalar pygame o numpy." -ForegroundColor Red
         pause
         exit 1
     }
-    Write-Host "pygame instalado correctamente." -ForegroundColor Green
+    Write-Host "pygame y numpy instalados correctamente." -ForegroundColor Green
 } else {
     Write-Host "pygame ya está instalado (versión: $($pygameCheck.Trim()))" -ForegroundColor Green
 }